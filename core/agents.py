@@ -0,0 +1,73 @@
+# core/agents.py
+import random
+
+from core.game_logic import FLOOR, MIDDLE
+
+
+class Agent:
+    """Base class for computer players: pick a move for the current player."""
+    name = "agent"
+    # Optional progress(move, stats) callback for searches run in the
+    # background (see core.ai_worker): it is passed each best-so-far move,
+    # or None when there is nothing new, and returns False to stop early.
+    progress = None
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def seed(self, seed):
+        self.rng.seed(seed)
+
+    def new_game(self):
+        """Forget whatever earlier games left behind (search tables and the like)."""
+
+    def report(self, move=None, stats=None):
+        """Hand a best-so-far move to ``progress``; returns whether to keep searching."""
+        return self.progress is None or self.progress(move, stats) is not False
+
+    def choose_move(self, game):
+        raise NotImplementedError
+
+
+class RandomAgent(Agent):
+    name = "random"
+
+    def choose_move(self, game):
+        return self.rng.choice(game.legal_moves())
+
+
+class GreedyAgent(Agent):
+    """Fills pattern rows as much as possible while keeping the floor empty."""
+    name = "greedy"
+
+    def choose_move(self, game):
+        board = game.players[game.current_player].board
+        best, best_value = [], None
+        for move in game.legal_moves():
+            source, color, row = move
+            if source == MIDDLE:
+                count = game.middle.counts[color]
+                marker = 0 if game.middle.tile_first_taken else 1
+            else:
+                count = game.factories[source].counts[color]
+                marker = 0
+
+            if row == FLOOR:
+                placed = 0
+            else:
+                placed = min(count, row + 1 - len(board.rows[row]))
+            value = placed - 2 * (count - placed + marker)
+            if row != FLOOR and len(board.rows[row]) + placed == row + 1:
+                value += 1
+
+            if best_value is None or value > best_value:
+                best, best_value = [move], value
+            elif value == best_value:
+                best.append(move)
+        return self.rng.choice(best)
+
+
+AGENTS = {
+    "random": RandomAgent,
+    "greedy": GreedyAgent,
+}
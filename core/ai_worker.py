@@ -0,0 +1,125 @@
+# core/ai_worker.py
+import multiprocessing
+import queue
+
+from core.snapshot import restore, snapshot
+
+JOIN_TIMEOUT = 2.0  # seconds close() waits before killing the process
+
+
+def _serve(requests, results, cancelled):
+    """Worker process: run each job's search, streaming progress into ``results``."""
+    agents = {}
+    while True:
+        job = requests.get()
+        if job is None:
+            break
+        job_id, key, agent, data = job
+        if agent is not None:
+            agents[key] = agent
+        agent = agents[key]
+        if cancelled.value >= job_id:
+            continue
+
+        last = [None]
+
+        def progress(move, stats):
+            if cancelled.value >= job_id:
+                return False
+            if move is not None and move != last[0]:
+                last[0] = move
+                results.put(("progress", job_id, move, stats))
+            return True
+
+        agent.progress = progress
+        try:
+            move = agent.choose_move(restore(data))
+        except Exception as e:
+            results.put(("failed", job_id, None, repr(e)))
+            continue
+        finally:
+            agent.progress = None
+        if cancelled.value < job_id:
+            results.put(("done", job_id, move, getattr(agent, "last_stats", None)))
+
+    for agent in agents.values():
+        if hasattr(agent, "close"):
+            agent.close()
+
+
+class AIWorker:
+    """
+    Runs agents' move searches in a separate process so the caller never
+    blocks on them:
+
+        worker.submit(seat, agent, game)   # once per turn
+        move = worker.poll()               # every frame; None until done
+
+    Positions travel as core.snapshot bytes. Agents are sent the first time
+    a key is used and stay in the worker afterwards, with their tables and
+    random state. poll() also keeps ``best``, the search's best move so far.
+    cancel() drops the running job. Agents that search in stages stop at the
+    next progress check; a multi-process MCTS stops waiting for its workers.
+    """
+
+    def __init__(self):
+        # spawn, not fork: the parent may have SDL threads and a window open
+        context = multiprocessing.get_context("spawn")
+        self.requests = context.Queue()
+        self.results = context.Queue()
+        self.cancelled = context.Value("q", 0, lock=False)
+        self.process = context.Process(target=_serve, name="ai-worker",
+                                       args=(self.requests, self.results, self.cancelled))
+        self.process.start()
+        self.sent = set()
+        self.job = 0
+        self.busy = False
+        self.best = None
+        self.stats = None
+
+    def submit(self, key, agent, game):
+        """Start searching ``game`` with ``agent``; any running job is cancelled."""
+        if self.busy:
+            self.cancel()
+        self.job += 1
+        self.busy = True
+        self.best = None
+        send = agent if key not in self.sent else None
+        self.sent.add(key)
+        self.requests.put((self.job, key, send, snapshot(game)))
+        return self.job
+
+    def cancel(self):
+        if self.busy:
+            self.cancelled.value = self.job
+            self.busy = False
+            self.best = None
+
+    def poll(self):
+        """The finished job's move once it is ready, else None. Never blocks."""
+        while True:
+            try:
+                kind, job, move, stats = self.results.get_nowait()
+            except queue.Empty:
+                if self.busy and not self.process.is_alive():
+                    raise RuntimeError("AI worker process exited")
+                return None
+            if job != self.job or not self.busy:
+                continue  # left over from a cancelled job
+            self.busy = kind == "progress"
+            if kind == "failed":
+                raise RuntimeError(f"AI search failed: {stats}")
+            move = tuple(move)
+            if kind == "progress":
+                self.best = move
+                continue
+            self.stats = stats
+            return move
+
+    def close(self):
+        self.cancel()
+        self.requests.put(None)
+        self.process.join(JOIN_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
@@ -0,0 +1,332 @@
+# core/batch.py
+import numpy as np
+
+from core.board import (
+    COL_MASKS, COLOR_BITS, COLOR_COLS, COLOR_MASKS, FULL_LINE, ROW_MASKS, RUN_LENGTH,
+    SCORE_TABLE, SIZE, Board,
+)
+from core.tile import FIRST_PLAYER, TILE_COLORS, TILES_PER_COLOR
+
+COLORS = len(TILE_COLORS) + 1  # count vectors keep slot 0 unused, as in core.tile
+FACTORY_CAPACITY = 4
+# Destination slots in the action encoding: 0 = floor, 1..5 = pattern rows
+ROW_SLOTS = SIZE + 1
+
+# Array versions of the core.board lookup tables
+RUN_TABLE = np.array(RUN_LENGTH, dtype=np.int64)
+SCORES = np.array(SCORE_TABLE, dtype=np.int64)
+COL_OF = np.zeros((SIZE, COLORS), dtype=np.int64)
+for _r in range(SIZE):
+    for _color, _c in COLOR_COLS[_r].items():
+        COL_OF[_r, _color] = _c
+# WALL_BIT[row, color] -> wall bit for that colour in that row
+WALL_BIT = np.zeros((SIZE, COLORS), dtype=np.int64)
+for _r in range(SIZE):
+    for _color, _bit in COLOR_BITS[_r].items():
+        WALL_BIT[_r, _color] = _bit
+ROW_MASK = np.array(ROW_MASKS, dtype=np.int64)
+COL_MASK = np.array(COL_MASKS, dtype=np.int64)
+COLOR_MASK = np.array([COLOR_MASKS[c] for c in TILE_COLORS], dtype=np.int64)
+# FLOOR_PENALTY[floor length] -> total penalty, the running sum of Board.FLOOR_PENALTIES
+FLOOR_PENALTY = np.concatenate(([0], np.cumsum(Board.FLOOR_PENALTIES))).astype(np.int64)
+
+
+def _score_tiles(wall, row, col):
+    """Vectorized Board.score_tile: ``wall`` already has the new bits set."""
+    row_count = RUN_TABLE[wall >> (row * SIZE) & FULL_LINE, col]
+    column = np.zeros_like(wall)
+    for r in range(SIZE):
+        column |= (wall >> (r * SIZE + col) & 1) << r
+    col_count = RUN_TABLE[column, row]
+    return SCORES[row_count, col_count]
+
+
+class BatchGame:
+    """
+    Many games with the same number of players, stored as NumPy arrays and
+    advanced in lockstep: every step() plays one turn in every unfinished game.
+
+    Rules, the action encoding (see core.game_logic.encode_move) and scoring
+    follow AzulGame and Board exactly; only the random draws differ, since
+    the bag is drawn from a NumPy generator. Array layout, for N games and
+    P players (colour axes are indexed by colour, slot 0 unused):
+
+        factories   (N, F, 6)   tile counts per factory
+        middle      (N, 6)      tile counts in the middle
+        first_in_middle (N,)    first-player marker still in the middle
+        bag, discard (N, 6)
+        row_color   (N, P, 5)   colour on each pattern row, 0 when empty
+        row_count   (N, P, 5)   tiles on each pattern row
+        wall        (N, P)      25-bit wall masks
+        floor       (N, P)      floor length, marker included
+        floor_tiles (N, P, 6)   colour tiles on the floor
+        score       (N, P)
+    """
+
+    def __init__(self, games, players=2, seed=None):
+        self.n = games
+        self.num_players = players
+        self.num_factories = 1 + 2 * players
+        self.rng = np.random.default_rng(seed)
+
+        self.factories = np.zeros((games, self.num_factories, COLORS), dtype=np.int64)
+        self.middle = np.zeros((games, COLORS), dtype=np.int64)
+        self.first_in_middle = np.zeros(games, dtype=bool)
+        self.bag = np.zeros((games, COLORS), dtype=np.int64)
+        self.bag[:, 1:] = TILES_PER_COLOR
+        self.discard = np.zeros((games, COLORS), dtype=np.int64)
+
+        self.row_color = np.zeros((games, players, SIZE), dtype=np.int64)
+        self.row_count = np.zeros((games, players, SIZE), dtype=np.int64)
+        self.wall = np.zeros((games, players), dtype=np.int64)
+        self.floor = np.zeros((games, players), dtype=np.int64)
+        self.floor_tiles = np.zeros((games, players, COLORS), dtype=np.int64)
+        self.score = np.zeros((games, players), dtype=np.int64)
+
+        self.current = np.zeros(games, dtype=np.int64)
+        self.first_next = np.zeros(games, dtype=np.int64)
+        self.round = np.zeros(games, dtype=np.int64)
+        self.done = np.zeros(games, dtype=bool)
+        self.turns = 0
+
+    @classmethod
+    def from_games(cls, games, seed=None):
+        """Load scalar AzulGame positions (same player count, no pending selection)."""
+        batch = cls(len(games), len(games[0].players), seed)
+        for i, game in enumerate(games):
+            batch.load(i, game)
+        return batch
+
+    def load(self, i, game):
+        """Overwrite game ``i`` with the position of a scalar AzulGame."""
+        for f, factory in enumerate(game.factories):
+            self.factories[i, f] = factory.counts
+        self.middle[i] = game.middle.counts
+        self.first_in_middle[i] = not game.middle.tile_first_taken
+        self.bag[i] = game.bag
+        self.discard[i] = game.discard
+        for p, player in enumerate(game.players):
+            board = player.board
+            for r, row in enumerate(board.rows):
+                self.row_color[i, p, r] = row[0] if row else 0
+                self.row_count[i, p, r] = len(row)
+            self.wall[i, p] = board.wall_mask
+            self.floor[i, p] = len(board.floor)
+            self.floor_tiles[i, p] = 0
+            for color in board.floor:
+                if color != FIRST_PLAYER:
+                    self.floor_tiles[i, p, color] += 1
+            self.score[i, p] = board.score
+        self.current[i] = game.current_player
+        self.first_next[i] = game.first_player_next
+        self.round[i] = game.round
+        self.done[i] = game.game_over
+
+    def board(self, i, p):
+        """Player ``p``'s board in game ``i`` as a scalar Board (floor colours are not ordered)."""
+        board = Board()
+        for r in range(SIZE):
+            board.rows[r] = [int(self.row_color[i, p, r])] * int(self.row_count[i, p, r])
+        tiles = [c for c in TILE_COLORS for _ in range(self.floor_tiles[i, p, c])]
+        board.floor = [FIRST_PLAYER] * (int(self.floor[i, p]) - len(tiles)) + tiles
+        board.wall_mask = int(self.wall[i, p])
+        board.score = int(self.score[i, p])
+        return board
+
+    # ----------------------------
+    # Round flow
+    # ----------------------------
+    def start_round(self, games=None):
+        """Deal a new round in the given games (default: all unfinished ones)."""
+        idx = np.flatnonzero(~self.done) if games is None else np.asarray(games)
+        if not len(idx):
+            return
+        self._fill_factories(idx)
+        self.first_in_middle[idx] = True
+        self.round[idx] += 1
+        self.current[idx] = self.first_next[idx]
+        nothing = self.factories[idx].sum(axis=(1, 2)) == 0
+        if nothing.any():
+            self.first_in_middle[idx[nothing]] = False
+            self._finish_games(idx[nothing])
+
+    def _fill_factories(self, idx):
+        # Same order as AzulGame.fill_factories: factory by factory, refilling
+        # the bag from the discard whenever it runs dry
+        bag = self.bag
+        for f in range(self.num_factories):
+            for _ in range(FACTORY_CAPACITY):
+                empty = idx[bag[idx].sum(axis=1) == 0]
+                if len(empty):
+                    bag[empty] += self.discard[empty]
+                    self.discard[empty] = 0
+                counts = bag[idx]
+                total = counts.sum(axis=1)
+                has = total > 0
+                if not has.any():
+                    break
+                g = idx[has]
+                pick = (self.rng.random(len(g)) * total[has]).astype(np.int64)
+                color = (counts[has].cumsum(axis=1) > pick[:, None]).argmax(axis=1)
+                bag[g, color] -= 1
+                self.factories[g, f, color] += 1
+
+    def _end_round(self, idx, deal):
+        """Vectorized AzulGame.end_round + Board.end_round for games ``idx``."""
+        self.first_in_middle[idx] = False
+        for r in range(SIZE):
+            gi, p = np.nonzero(self.row_count[idx, :, r] == r + 1)
+            if not len(gi):
+                continue
+            g = idx[gi]
+            color = self.row_color[g, p, r]
+            col = COL_OF[r, color]
+            wall = self.wall[g, p] | 1 << (r * SIZE + col)
+            self.wall[g, p] = wall
+            # Board.end_round scores row by row, so later rows see earlier tiles
+            np.add.at(self.score, (g, p), _score_tiles(wall, r, col))
+            np.add.at(self.discard, (g, color), r)
+            self.row_count[g, p, r] = 0
+            self.row_color[g, p, r] = 0
+
+        score = self.score[idx] + FLOOR_PENALTY[self.floor[idx]]
+        self.score[idx] = np.maximum(score, 0)
+        self.discard[idx] += self.floor_tiles[idx].sum(axis=1)
+        self.floor_tiles[idx] = 0
+        self.floor[idx] = 0
+
+        rows = self.wall[idx][:, :, None] & ROW_MASK
+        over = (rows == ROW_MASK).any(axis=(1, 2))
+        self._finish_games(idx[over])
+        if deal:
+            self.start_round(idx[~over])
+
+    def _finish_games(self, idx):
+        """Vectorized Board.final_score for every player of games ``idx``."""
+        if not len(idx):
+            return
+        wall = self.wall[idx][:, :, None]
+        bonus = 2 * ((wall & ROW_MASK) == ROW_MASK).sum(axis=2)
+        bonus += 7 * ((wall & COL_MASK) == COL_MASK).sum(axis=2)
+        bonus += 10 * ((wall & COLOR_MASK) == COLOR_MASK).sum(axis=2)
+        self.score[idx] += bonus
+        self.done[idx] = True
+
+    # ----------------------------
+    # Moves
+    # ----------------------------
+    def legal_mask(self, games=None):
+        """
+        Boolean (len(games), 1 + F, 5, 6) array of legal actions: [source slot,
+        colour - 1, row slot], slots as in encode_move (source 0 is the middle,
+        row 0 the floor). ``games`` defaults to all; finished games have none.
+        """
+        n = np.arange(self.n) if games is None else np.asarray(games)
+        p = self.current[n]
+        sources = np.concatenate((self.middle[n, None, 1:], self.factories[n, :, 1:]), axis=1) > 0
+        sources &= ~self.done[n, None, None]
+
+        row_color = self.row_color[n, p]            # (n, row)
+        wall = self.wall[n, p]
+        colors = np.arange(1, COLORS)
+        has_room = (self.row_count[n, p] <= np.arange(SIZE))[:, :, None]
+        open_row = (row_color[:, :, None] == 0) | (row_color[:, :, None] == colors) & has_room
+        open_row &= (wall[:, None, None] & WALL_BIT[:, 1:]) == 0    # (n, row, colour)
+        targets = np.ones((len(n), len(TILE_COLORS), ROW_SLOTS), dtype=bool)
+        targets[:, :, 1:] = open_row.transpose(0, 2, 1)
+        return sources[:, :, :, None] & targets[:, None]
+
+    def random_actions(self):
+        """
+        A random legal encoded action per game (0 for finished games): a random
+        (source, colour) pair, then a random open destination for that colour.
+        Cheaper than sampling legal_mask() and just as good for rollouts.
+        """
+        live = np.flatnonzero(~self.done)
+        n = len(live)
+        sources = np.concatenate((self.middle[live, None, 1:], self.factories[live, :, 1:]), axis=1)
+        keys = self.rng.random((n, sources.shape[1] * len(TILE_COLORS)), dtype=np.float32)
+        pick = np.where(sources.reshape(n, -1) > 0, keys, -1.0).argmax(axis=1)
+        slot = pick // len(TILE_COLORS)
+        color = pick % len(TILE_COLORS) + 1
+
+        p = self.current[live]
+        row_color = self.row_color[live, p]
+        has_room = self.row_count[live, p] <= np.arange(SIZE)
+        open_row = (row_color == 0) | (row_color == color[:, None]) & has_room
+        open_row &= (self.wall[live, p][:, None] & WALL_BIT[:, color].T) == 0
+        keys = self.rng.random((n, ROW_SLOTS), dtype=np.float32)
+        keys[:, 1:][~open_row] = -1.0
+        row_slot = keys.argmax(axis=1)
+
+        actions = np.zeros(self.n, dtype=np.int64)
+        actions[live] = slot << 6 | color << 3 | row_slot
+        return actions
+
+    def step(self, actions, deal=True):
+        """
+        Play one encoded action in every unfinished game (entries for finished
+        games are ignored). Actions must be legal, as with AzulGame.apply_move.
+        With deal=False finished rounds are scored but left for start_round().
+        """
+        live = np.flatnonzero(~self.done)
+        if not len(live):
+            return
+        actions = np.asarray(actions, dtype=np.int64)[live]
+        slot = actions >> 6
+        color = actions >> 3 & 7
+        row = (actions & 7) - 1
+        p = self.current[live]
+
+        # Take: leftovers of a factory slide into the middle
+        count = np.zeros(len(live), dtype=np.int64)
+        took_first = np.zeros(len(live), dtype=bool)
+        from_factory = slot > 0
+        g, f, c = live[from_factory], slot[from_factory] - 1, color[from_factory]
+        taken = self.factories[g, f, c]
+        count[from_factory] = taken
+        self.middle[g] += self.factories[g, f]
+        self.middle[g, c] -= taken
+        self.factories[g, f] = 0
+
+        from_middle = ~from_factory
+        g, c = live[from_middle], color[from_middle]
+        count[from_middle] = self.middle[g, c]
+        self.middle[g, c] = 0
+        took_first[from_middle] = self.first_in_middle[g]
+        self.first_in_middle[g] = False
+        self.first_next[live[took_first]] = p[took_first]
+
+        # Place: the row takes what fits, the rest goes to the floor
+        to_row = row >= 0
+        r = np.where(to_row, row, 0)
+        free = np.where(to_row, r + 1 - self.row_count[live, p, r], 0)
+        placed = np.minimum(count, free)
+        self.row_count[live, p, r] += placed
+        g, q, rr = live[to_row], p[to_row], r[to_row]
+        self.row_color[g, q, rr] = color[to_row]
+
+        floor = np.minimum(self.floor[live, p] + took_first, Board.FLOOR_CAPACITY)
+        overflow = count - placed
+        on_floor = np.minimum(overflow, Board.FLOOR_CAPACITY - floor)
+        self.floor[live, p] = floor + on_floor
+        self.floor_tiles[live, p, color] += on_floor
+        self.discard[live, color] += overflow - on_floor
+
+        self.turns += len(live)
+        empty = (self.factories[live].sum(axis=(1, 2)) == 0) & (self.middle[live].sum(axis=1) == 0)
+        going = live[~empty]
+        self.current[going] = (self.current[going] + 1) % self.num_players
+        if empty.any():
+            self._end_round(live[empty], deal)
+
+    def play_out(self, policy=None):
+        """
+        Step every game to the end. ``policy(batch)`` returns one action per
+        game; the default plays uniformly random legal actions.
+        Returns the final (N, P) score array.
+        """
+        policy = policy or BatchGame.random_actions
+        while not self.done.all():
+            self.step(policy(self))
+        return self.score
@@ -1,34 +1,157 @@
+# core/board.py
+SIZE = 5
+PATTERN = [
+    [1, 2, 3, 4, 5],
+    [5, 1, 2, 3, 4],
+    [4, 5, 1, 2, 3],
+    [3, 4, 5, 1, 2],
+    [2, 3, 4, 5, 1],
+]
+
+# ----------------------------
+# Bitboard tables
+# ----------------------------
+# The wall is a 25-bit integer, bit (row * SIZE + col) set when the cell is
+# tiled. Everything below is computed once at import time.
+FULL_LINE = (1 << SIZE) - 1
+ROW_MASKS = [FULL_LINE << (r * SIZE) for r in range(SIZE)]
+COL_MASKS = [sum(1 << (r * SIZE + c) for r in range(SIZE)) for c in range(SIZE)]
+COLOR_MASKS = {
+    color: sum(1 << (r * SIZE + PATTERN[r].index(color)) for r in range(SIZE))
+    for color in range(1, SIZE + 1)
+}
+# COLOR_BITS[row][color] -> wall bit for that colour in that row
+COLOR_BITS = [
+    {color: 1 << (r * SIZE + c) for c, color in enumerate(PATTERN[r])}
+    for r in range(SIZE)
+]
+COLOR_COLS = [{color: c for c, color in enumerate(PATTERN[r])} for r in range(SIZE)]
+
+
+def _run_lengths(mask):
+    """Length of the contiguous run through each position of a 5-bit line."""
+    runs = []
+    for i in range(SIZE):
+        if not mask >> i & 1:
+            runs.append(0)
+            continue
+        lo = i
+        while lo > 0 and mask >> (lo - 1) & 1:
+            lo -= 1
+        hi = i
+        while hi < SIZE - 1 and mask >> (hi + 1) & 1:
+            hi += 1
+        runs.append(hi - lo + 1)
+    return runs
+
+
+# RUN_LENGTH[line_mask][i] -> tiles in the run through position i
+RUN_LENGTH = [_run_lengths(m) for m in range(1 << SIZE)]
+# Column bits sit at a stride of SIZE; COL_GATHER packs them into a 5-bit line.
+COL_GATHER = {
+    sum(1 << (r * SIZE) for r in range(SIZE) if m >> r & 1): m
+    for m in range(1 << SIZE)
+}
+COL_STRIDE = COL_MASKS[0]
+
+
+def placement_score(row_count, col_count):
+    if row_count > 1 and col_count > 1:
+        return row_count + col_count - 1
+    elif row_count > 1:
+        return row_count
+    elif col_count > 1:
+        return col_count
+    return 1
+
+
+# SCORE_TABLE[row_count][col_count] -> points for the placed tile
+SCORE_TABLE = [
+    [placement_score(h, v) for v in range(SIZE + 1)] for h in range(SIZE + 1)
+]
+
+
+class _WallRow:
+    __slots__ = ("board", "row")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __getitem__(self, col):
+        if self.board.wall_mask >> (self.row * SIZE + col) & 1:
+            return PATTERN[self.row][col]
+        return None
+
+    def __setitem__(self, col, color):
+        bit = 1 << (self.row * SIZE + col)
+        if color is None:
+            self.board.wall_mask &= ~bit
+        else:
+            self.board.wall_mask |= bit
+
+    def __iter__(self):
+        return (self[c] for c in range(SIZE))
+
+    def __len__(self):
+        return SIZE
+
+
+class _WallView:
+    """List-of-lists view over the wall bitmask (``wall[r][c]`` -> colour or None)."""
+    __slots__ = ("board",)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, row):
+        return _WallRow(self.board, row)
+
+    def __iter__(self):
+        return (_WallRow(self.board, r) for r in range(SIZE))
+
+    def __len__(self):
+        return SIZE
+
+
 class Board:
-    SIZE = 5
+    SIZE = SIZE
     FLOOR_CAPACITY = 7
     FLOOR_PENALTIES = [-1, -1, -2, -2, -2, -3, -3]
 
     def __init__(self):
         self.rows = [[] for _ in range(self.SIZE)]
         self.floor = []
-        self.wall = [[None for _ in range(self.SIZE)] for _ in range(self.SIZE)]
-        self.pattern = [
-            [1, 2, 3, 4, 5],
-            [5, 1, 2, 3, 4],
-            [4, 5, 1, 2, 3],
-            [3, 4, 5, 1, 2],
-            [2, 3, 4, 5, 1],
-        ]
+        self.wall_mask = 0
+        self.pattern = PATTERN
         self.score = 0
 
+    def copy(self):
+        board = Board.__new__(Board)
+        board.rows = [row[:] for row in self.rows]
+        board.floor = self.floor[:]
+        board.wall_mask = self.wall_mask
+        board.pattern = self.pattern
+        board.score = self.score
+        return board
+
+    @property
+    def wall(self):
+        return _WallView(self)
+
     def can_place(self, row_idx, color):
-        if self.rows[row_idx] and self.rows[row_idx][0] != color:
+        row = self.rows[row_idx]
+        if row and row[0] != color:
+            return False
+        bit = COLOR_BITS[row_idx].get(color)
+        if bit is not None and self.wall_mask & bit:
             return False
-        if color in self.pattern[row_idx]:
-            col_idx = self.pattern[row_idx].index(color)
-            if self.wall[row_idx][col_idx] == color:
-                return False
         return True
 
     def place_tiles(self, row_idx, color, count):
+        """Place tiles on a pattern row; returns how many fell off a full floor."""
         if row_idx == -1 or not self.can_place(row_idx, color):
-            self._place_to_floor([color] * count)
-            return
+            return self._place_to_floor([color] * count)
 
         capacity = row_idx + 1
         free_slots = capacity - len(self.rows[row_idx])
@@ -37,18 +160,19 @@ class Board:
 
         self.rows[row_idx].extend([color] * to_place)
         if overflow > 0:
-            self._place_to_floor([color] * overflow)
+            return self._place_to_floor([color] * overflow)
+        return 0
 
     def _place_to_floor(self, tiles):
         free_slots = self.FLOOR_CAPACITY - len(self.floor)
         self.floor.extend(tiles[:free_slots])
+        return max(0, len(tiles) - free_slots)
 
     def end_round(self):
         for r, row in enumerate(self.rows):
             if len(row) == r + 1:
-                color = row[0]
-                col = self.pattern[r].index(color)
-                self.wall[r][col] = color
+                col = COLOR_COLS[r][row[0]]
+                self.wall_mask |= 1 << (r * SIZE + col)
                 self.score += self.score_tile(r, col)
                 self.rows[r] = []
 
@@ -59,65 +183,30 @@ class Board:
         self.floor = []
 
     def score_tile(self, row, col):
-        base = 1
-        row_count = self._count_adj(row, col, axis="row")
-        col_count = self._count_adj(row, col, axis="col")
-
-        if row_count > 1 and col_count > 1:
-            return row_count + col_count - 1
-        elif row_count > 1:
-            return row_count
-        elif col_count > 1:
-            return col_count
-        return base
-
-    def _count_adj(self, row, col, axis="row"):
-        count = 1
-        if axis == "row":
-            c = col - 1
-            while c >= 0 and self.wall[row][c] is not None:
-                count += 1
-                c -= 1
-            c = col + 1
-            while c < self.SIZE and self.wall[row][c] is not None:
-                count += 1
-                c += 1
-        else:
-            r = row - 1
-            while r >= 0 and self.wall[r][col] is not None:
-                count += 1
-                r -= 1
-            r = row + 1
-            while r < self.SIZE and self.wall[r][col] is not None:
-                count += 1
-                r += 1
-        return count
+        wall = self.wall_mask | 1 << (row * SIZE + col)
+        row_count = RUN_LENGTH[wall >> (row * SIZE) & FULL_LINE][col]
+        col_count = RUN_LENGTH[COL_GATHER[wall >> col & COL_STRIDE]][row]
+        return SCORE_TABLE[row_count][col_count]
+
+    def has_full_row(self):
+        wall = self.wall_mask
+        return any(wall & m == m for m in ROW_MASKS)
 
     # ----------------------------
     # End Game Scoring
     # ----------------------------
     def final_score(self):
+        wall = self.wall_mask
         bonus = 0
 
         # Completed rows = +2 each
-        for r in range(self.SIZE):
-            if all(self.wall[r][c] is not None for c in range(self.SIZE)):
-                bonus += 2
+        bonus += 2 * sum(1 for m in ROW_MASKS if wall & m == m)
 
         # Completed columns = +7 each
-        for c in range(self.SIZE):
-            if all(self.wall[r][c] is not None for r in range(self.SIZE)):
-                bonus += 7
+        bonus += 7 * sum(1 for m in COL_MASKS if wall & m == m)
 
         # Completed color sets = +10 each
-        colors = {1, 2, 3, 4, 5}
-        for color in colors:
-            count = sum(
-                1 for r in range(self.SIZE) for c in range(self.SIZE)
-                if self.wall[r][c] == color
-            )
-            if count == self.SIZE:
-                bonus += 10
+        bonus += 10 * sum(1 for m in COLOR_MASKS.values() if wall & m == m)
 
         self.score += bonus
         return bonus
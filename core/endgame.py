@@ -0,0 +1,204 @@
+# core/endgame.py
+import time
+from collections import namedtuple
+
+from core.board import ROW_MASKS, SIZE
+
+# Tiles left on the table at which agents switch to solving, by player
+# count. Max-n has no pruning, so with 3+ players it must start later.
+ENDGAME_TILES = {2: 10, 3: 6, 4: 6}
+ENDGAME_SHARE = 0.5  # share of an agent's move budget the solver may use
+MAX_MEMO = 1 << 20  # positions kept between solves before the table is dropped
+INF = float("inf")
+
+# Bound kinds for the two-player table entries
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class SolveTimeout(Exception):
+    pass
+
+
+Solution = namedtuple("Solution", "move line scores margin exact nodes elapsed")
+Solution.__doc__ = """
+move: best move for the player to move; line: the rest of the round under
+best play; scores: every seat's score at its end; margin: the mover's score
+minus the best other; exact: whether the game is over there (otherwise the
+scores are those after the round's wall tiling and the game goes on).
+"""
+
+
+def margin(scores, player):
+    return scores[player] - max(s for p, s in enumerate(scores) if p != player)
+
+
+def remaining_tiles(game):
+    return sum(f.total for f in game.factories) + game.middle.total
+
+
+def is_final_round(game):
+    """
+    Whether this round is probably the last: the next deal would come up
+    empty, or some wall row is one tile from complete.
+    """
+    if not sum(game.bag) and not sum(game.discard):
+        return True
+    return any(bin(player.board.wall_mask & mask).count("1") == SIZE - 1
+               for player in game.players for mask in ROW_MASKS)
+
+
+def should_solve(game, max_tiles=None):
+    """``max_tiles`` defaults to ENDGAME_TILES for the game's player count."""
+    if max_tiles is None:
+        max_tiles = ENDGAME_TILES[len(game.players)]
+    return (not game.game_over and not game.is_selection()
+            and is_final_round(game) and remaining_tiles(game) <= max_tiles)
+
+
+class EndgameSolver:
+    """
+    Exact search of the rest of the round, with every position memoized by
+    its Zobrist hash.
+
+    Leaves are round ends, where Board.end_round() has tiled every wall and,
+    if that ends the game, Board.final_score() has added the bonuses. A round
+    end that leaves nothing to deal is dealt as well, since that ends the
+    game too. Each player maximises their margin over the best opponent:
+    alpha-beta negamax with two players, max-n with more. The table survives
+    between solves, so later turns of the same endgame are mostly found in it;
+    that includes what a solve cut short by its time limit had finished.
+    """
+
+    def __init__(self, max_memo=MAX_MEMO):
+        self.memo = {}
+        self.max_memo = max_memo
+        self.nodes = 0
+        self.deadline = None
+
+    def clear(self):
+        self.memo.clear()
+
+    def solve(self, game, time_budget=None):
+        """The Solution, or None if it takes longer than ``time_budget`` seconds."""
+        start = time.perf_counter()
+        if len(self.memo) > self.max_memo:
+            self.memo.clear()
+        self.nodes = 0
+        self.deadline = None if time_budget is None else start + time_budget
+        game = game.copy()
+        player = game.current_player
+
+        line = []
+        try:
+            while not (game.game_over or game.is_empty()):
+                action = self._best_action(game)
+                line.append(action)
+                game.apply_action(action, deal=False)
+        except SolveTimeout:
+            return None
+        scores = self._leaf(game)
+
+        return Solution(line[0], line, scores, margin(scores, player), game.game_over,
+                        self.nodes, time.perf_counter() - start)
+
+    def _best_action(self, game):
+        if len(game.players) == 2:
+            self._negamax(game, -INF, INF)
+            # A full window leaves an exact entry and its best action
+            return self.memo[game.zobrist_hash()][2]
+        return self._max_n(game)[1]
+
+    def _leaf(self, game):
+        """Scores at a round end; deals the next round if it is sure to be empty."""
+        if not game.game_over and not sum(game.bag) and not sum(game.discard):
+            game.start_round()
+        return tuple(game.scores())
+
+    def _count_node(self):
+        self.nodes += 1
+        if (self.deadline is not None and not self.nodes & 63
+                and time.perf_counter() >= self.deadline):
+            raise SolveTimeout
+
+    def _negamax(self, game, alpha, beta):
+        key = game.zobrist_hash()
+        entry = self.memo.get(key)
+        first = None
+        if entry is not None:
+            value, bound, first = entry
+            if (bound == EXACT or (bound == LOWER and value >= beta)
+                    or (bound == UPPER and value <= alpha)):
+                return value
+        self._count_node()
+
+        player = game.current_player
+        actions = game.legal_actions()
+        if first is not None:
+            actions.remove(first)
+            actions.insert(0, first)
+        start_alpha = alpha
+        best_value = -INF
+        best = None
+        for action in actions:
+            game.apply_action(action, deal=False)
+            try:
+                if game.game_over or game.is_empty():
+                    value = margin(self._leaf(game), player)
+                else:
+                    value = -self._negamax(game, -beta, -alpha)
+            finally:
+                game.revert_move()
+            if value > best_value:
+                best_value, best = value, action
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best_value <= start_alpha:
+            bound = UPPER
+        elif best_value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.memo[key] = (best_value, bound, best)
+        return best_value
+
+    def _max_n(self, game):
+        """(scores, best action) with every seat playing for its own margin."""
+        key = game.zobrist_hash()
+        entry = self.memo.get(key)
+        if entry is not None:
+            return entry
+        self._count_node()
+
+        player = game.current_player
+        best = None
+        best_margin = -INF
+        for action in game.legal_actions():
+            game.apply_action(action, deal=False)
+            try:
+                if game.game_over or game.is_empty():
+                    scores = self._leaf(game)
+                else:
+                    scores = self._max_n(game)[0]
+            finally:
+                game.revert_move()
+            value = margin(scores, player)
+            if value > best_margin:
+                best, best_margin = (scores, action), value
+
+        self.memo[key] = best
+        return best
+
+    def stats(self, solution):
+        """``last_stats`` in the shape the search agents report."""
+        return {
+            "endgame": True,
+            "margin": solution.margin,
+            "exact": solution.exact,
+            "depth": len(solution.line),
+            "nodes": solution.nodes,
+            "elapsed": solution.elapsed,
+            "nodes_per_sec": solution.nodes / solution.elapsed if solution.elapsed else 0.0,
+            "ebf": 0.0,
+        }
@@ -0,0 +1,190 @@
+# core/evaluation.py
+import numpy as np
+
+from core.batch import BatchGame
+from core.board import (
+    COL_GATHER, COL_MASKS, COL_STRIDE, COLOR_COLS, COLOR_MASKS, FULL_LINE, ROW_MASKS,
+    RUN_LENGTH, SCORE_TABLE, SIZE, Board,
+)
+from core.tile import TILE_COLORS
+
+# Feature order in weight vectors and feature arrays
+FEATURES = ("score", "pattern", "adjacency", "floor", "rows", "columns", "colors")
+DEFAULT_WEIGHTS = {
+    "score": 1.0,       # points banked so far
+    "pattern": 1.0,     # wall points of the pattern rows, scaled by how full they are
+    "adjacency": 0.25,  # empty wall cells next to tiled ones, counted per neighbour
+    "floor": 1.0,       # floor penalty if the round ended now
+    "rows": 1.0,        # row bonus (2) times squared progress on each row
+    "columns": 1.0,     # column bonus (7), likewise
+    "colors": 1.0,      # colour bonus (10), likewise
+}
+
+# ----------------------------
+# Tables
+# ----------------------------
+WALL_BITS = SIZE * SIZE
+FULL_WALL = (1 << WALL_BITS) - 1
+POP_BITS = 13
+POP_MASK = (1 << POP_BITS) - 1
+# POPCOUNT[x] for x below 2**13; a wall takes two lookups
+POPCOUNT = [bin(x).count("1") for x in range(1 << POP_BITS)]
+# LINE_RUN[line][i] -> run through position i once a tile is placed there
+LINE_RUN = [[RUN_LENGTH[m | 1 << i][i] for i in range(SIZE)] for m in range(1 << SIZE)]
+# FLOOR_PENALTY[floor length] -> penalty at round end
+FLOOR_PENALTY = [sum(Board.FLOOR_PENALTIES[:n]) for n in range(Board.FLOOR_CAPACITY + 1)]
+# PROGRESS[tiles] -> share of a bonus credited with that many of its 5 tiles
+PROGRESS = [(n / SIZE) ** 2 for n in range(SIZE + 1)]
+BONUS_MASKS = (
+    [(2, m) for m in ROW_MASKS]
+    + [(7, m) for m in COL_MASKS]
+    + [(10, COLOR_MASKS[c]) for c in TILE_COLORS]
+)
+NOT_FIRST_COL = FULL_WALL & ~COL_MASKS[0]
+NOT_LAST_COL = FULL_WALL & ~COL_MASKS[SIZE - 1]
+
+# Array versions for the batch path
+POPCOUNT_NP = np.array(POPCOUNT, dtype=np.int64)
+LINE_RUN_NP = np.array(LINE_RUN, dtype=np.int64)
+SCORES_NP = np.array(SCORE_TABLE, dtype=np.int64)
+FLOOR_PENALTY_NP = np.array(FLOOR_PENALTY, dtype=np.float64)
+PROGRESS_NP = np.array(PROGRESS, dtype=np.float64)
+COL_OF_NP = np.zeros((SIZE, len(TILE_COLORS) + 1), dtype=np.int64)
+for _r in range(SIZE):
+    for _color, _c in COLOR_COLS[_r].items():
+        COL_OF_NP[_r, _color] = _c
+ROWS_NP = np.arange(SIZE)
+
+
+def _popcount(x):
+    return POPCOUNT[x & POP_MASK] + POPCOUNT[x >> POP_BITS]
+
+
+def _popcount_np(x):
+    return POPCOUNT_NP[x & POP_MASK] + POPCOUNT_NP[x >> POP_BITS]
+
+
+def _open_neighbours(wall):
+    """Shifted copies of the wall: bit set where an empty cell has a tiled neighbour that way."""
+    empty = ~wall & FULL_WALL
+    return (
+        (wall << 1 & NOT_FIRST_COL) & empty,
+        (wall >> 1 & NOT_LAST_COL) & empty,
+        (wall << SIZE & FULL_WALL) & empty,
+        (wall >> SIZE) & empty,
+    )
+
+
+def board_features(board):
+    """The FEATURES of one Board, as a list."""
+    wall = board.wall_mask
+
+    pattern = 0.0
+    for r, row in enumerate(board.rows):
+        if row:
+            col = COLOR_COLS[r][row[0]]
+            row_run = LINE_RUN[wall >> (r * SIZE) & FULL_LINE][col]
+            col_run = LINE_RUN[COL_GATHER[wall >> col & COL_STRIDE]][r]
+            pattern += SCORE_TABLE[row_run][col_run] * len(row) / (r + 1)
+
+    adjacency = sum(_popcount(m) for m in _open_neighbours(wall))
+
+    bonuses = [0.0, 0.0, 0.0]
+    for i, (bonus, mask) in enumerate(BONUS_MASKS):
+        bonuses[i // SIZE] += bonus * PROGRESS[_popcount(wall & mask)]
+
+    return [board.score, pattern, adjacency, FLOOR_PENALTY[len(board.floor)]] + bonuses
+
+
+def array_features(wall, row_color, row_count, floor, score):
+    """
+    Vectorized board_features over the board arrays of core.batch.BatchGame:
+    ``wall``, ``floor`` and ``score`` have any shape S, ``row_color`` and
+    ``row_count`` shape S + (5,). Returns shape S + (len(FEATURES),).
+    """
+    wall = np.asarray(wall, dtype=np.int64)
+    row_color = np.asarray(row_color, dtype=np.int64)
+    row_count = np.asarray(row_count, dtype=np.int64)
+    walls = wall[..., None]
+
+    col = COL_OF_NP[ROWS_NP, row_color]
+    row_line = walls >> (ROWS_NP * SIZE) & FULL_LINE
+    col_line = np.zeros_like(col)
+    for r in range(SIZE):
+        col_line |= (walls >> (r * SIZE + col) & 1) << r
+    points = SCORES_NP[LINE_RUN_NP[row_line, col], LINE_RUN_NP[col_line, ROWS_NP]]
+    pattern = (points * row_count / (ROWS_NP + 1)).sum(axis=-1)
+
+    adjacency = sum(_popcount_np(m) for m in _open_neighbours(wall))
+
+    bonuses = [np.zeros(wall.shape) for _ in range(3)]
+    for i, (bonus, mask) in enumerate(BONUS_MASKS):
+        bonuses[i // SIZE] += bonus * PROGRESS_NP[_popcount_np(wall & mask)]
+
+    return np.stack([np.asarray(score, dtype=np.float64), pattern, adjacency,
+                     FLOOR_PENALTY_NP[np.asarray(floor)]] + bonuses, axis=-1)
+
+
+class Evaluator:
+    """
+    Static evaluation of boards and positions: a weighted sum of FEATURES,
+    each read from precomputed tables over the wall bitmask.
+
+    ``weights`` maps feature names to weights (missing ones keep
+    DEFAULT_WEIGHTS); fit() tunes them from played games. An Evaluator is an
+    ``evaluate(game, player)`` callable, so it plugs into AlphaBetaAgent:
+
+        AlphaBetaAgent(evaluate=Evaluator({"adjacency": 0.5}))
+
+    evaluate_batch() and evaluate_games() score many positions per call.
+    """
+
+    def __init__(self, weights=None):
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            unknown = set(weights) - set(FEATURES)
+            if unknown:
+                raise ValueError(f"unknown features: {sorted(unknown)}")
+            self.weights.update(weights)
+        self.vector = [self.weights[name] for name in FEATURES]
+        self.array = np.array(self.vector)
+
+    def board_value(self, board):
+        return sum(w * f for w, f in zip(self.vector, board_features(board)))
+
+    def values(self, game):
+        return [self.board_value(player.board) for player in game.players]
+
+    def __call__(self, game, player):
+        """``player``'s value minus the best opponent's."""
+        values = self.values(game)
+        return values[player] - max(v for p, v in enumerate(values) if p != player)
+
+    def evaluate_arrays(self, wall, row_color, row_count, floor, score):
+        """Values for board arrays shaped as for array_features()."""
+        return array_features(wall, row_color, row_count, floor, score) @ self.array
+
+    def evaluate_batch(self, batch):
+        """(games, players) values for every board of a BatchGame."""
+        return self.evaluate_arrays(batch.wall, batch.row_color, batch.row_count,
+                                    batch.floor, batch.score)
+
+    def evaluate_games(self, games):
+        """(games, players) values for AzulGame positions with the same player count."""
+        return self.evaluate_batch(BatchGame.from_games(games))
+
+    @classmethod
+    def fit(cls, features, targets, names=FEATURES):
+        """
+        Least-squares weights predicting ``targets`` (say, each board's final
+        score) from ``features`` rows; features not in ``names`` keep their
+        default weights and are subtracted from the targets first.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        targets = np.asarray(targets, dtype=np.float64)
+        fitted = [FEATURES.index(name) for name in names]
+        fixed = [i for i in range(len(FEATURES)) if i not in fitted]
+        defaults = np.array([DEFAULT_WEIGHTS[FEATURES[i]] for i in fixed])
+        targets = targets - features[:, fixed] @ defaults
+        solution, *_ = np.linalg.lstsq(features[:, fitted], targets, rcond=None)
+        return cls({FEATURES[i]: float(w) for i, w in zip(fitted, solution)})
@@ -1,16 +1,68 @@
 # core/factory.py
+from core.tile import TILE_COLORS, TilePool, empty_counts
+
+
 class Factory:
+    __slots__ = ("capacity", "counts", "total", "pool")
+
     def __init__(self, capacity=4):
         self.capacity = capacity
-        self.tiles = []
+        self.counts = empty_counts()
+        self.total = 0
+        self.pool = TilePool()
 
-    def add_tiles(self, tiles):
-        self.tiles.extend(tiles)
-        if len(tiles) > self.capacity:
+    @property
+    def tiles(self):
+        return self.pool.sync(self.counts)
+
+    def copy(self):
+        factory = Factory(self.capacity)
+        factory.counts[:] = self.counts
+        factory.total = self.total
+        return factory
+
+    # ----------------------------
+    # Count-based operations
+    # ----------------------------
+    def add(self, color, count=1):
+        self.counts[color] += count
+        self.total += count
+        if self.total > self.capacity:
             raise Exception(f'Over {self.capacity} tiles on the plate')
 
+    def take(self, color):
+        """Remove every tile of ``color`` and return how many there were."""
+        count = self.counts[color]
+        self.counts[color] = 0
+        self.total -= count
+        return count
+
+    def move_to(self, middle):
+        """Push every remaining tile into the middle."""
+        counts = self.counts
+        for color in TILE_COLORS:
+            if counts[color]:
+                middle.add(color, counts[color])
+                counts[color] = 0
+        self.total = 0
+
+    def clear(self):
+        for color in TILE_COLORS:
+            self.counts[color] = 0
+        self.total = 0
+        self.pool.clear()
+
+    # ----------------------------
+    # Tile-object adapter (UI)
+    # ----------------------------
+    def add_tiles(self, tiles):
+        self.pool.adopt(tiles)
+        for t in tiles:
+            self.add(t.color)
+
     def take_tiles(self, color: int):
-        chosen = [t for t in self.tiles if t.color == color]
-        remaining = [t for t in self.tiles if t.color != color]
-        self.tiles = []
+        tiles = self.tiles
+        chosen = [t for t in tiles if t.color == color]
+        remaining = [t for t in tiles if t.color != color]
+        self.clear()
         return chosen, remaining
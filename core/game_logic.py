@@ -1,27 +1,105 @@
 # core/game_round.py
 import random
-from core.tile import Tile
+from core import zobrist
+from core.board import COLOR_BITS
+from core.tile import FIRST_PLAYER, TILE_COLORS, TILES_PER_COLOR, empty_counts
 from core.factory import Factory
 from core.middle import Middle
-from random import shuffle
+
+# Move tuples are (source, color, row): source is a factory index or MIDDLE,
+# row is a pattern row index or FLOOR.
+MIDDLE = -1
+FLOOR = -1
+
+
+def encode_move(source, color, row):
+    """Pack a move into one int: (source + 1) << 6 | color << 3 | (row + 1)."""
+    return (source + 1) << 6 | color << 3 | (row + 1)
+
+
+def decode_move(action):
+    return (action >> 6) - 1, action >> 3 & 7, (action & 7) - 1
 
 
 class AzulGame:
-    def __init__(self, players):
+    def __init__(self, players, seed=None):
         
+        self.rng = random.Random(seed)
         self.players = players
-        shuffle(self.players)
+        self.rng.shuffle(self.players)
         self.current_player = 0
         
         self.num_factories = 1 + 2 * len(players)
         self.factories = [Factory() for _ in range(self.num_factories)]
         self.middle = Middle()
         self.bag = self._create_bag()
-        self.discard = []
+        self.discard = empty_counts()
         
+        self.round = 0
+        self.first_player_next = 0
+        self.game_over = False
+        
+        # Set record to False to skip undo records (throwaway rollout copies)
+        self.record = True
+        self.history = []
+        self._hash = None
+        # Bumped by every mutation; derived views are memoized against it
+        self.version = 0
+        self._views = {}
+        # Optional core.replay.ReplayRecorder told about every move and selection
+        self.recorder = None
         self.selected_tiles = []
+        self.selected_leftovers = []
         self.last_selection_info = None
         
+    def copy(self, seed=None, record=True):
+        """
+        Logic-only copy for search: no Tile objects, agents or undo history.
+        A pending UI selection is put back first. ``seed`` reseeds the copy's
+        bag draws; by default it continues the same random sequence.
+        """
+        game = AzulGame.__new__(AzulGame)
+        game.rng = random.Random()
+        if seed is None:
+            game.rng.setstate(self.rng.getstate())
+        else:
+            game.rng.seed(seed)
+        game.players = [player.copy() for player in self.players]
+        game.current_player = self.current_player
+        game.num_factories = self.num_factories
+        game.factories = [factory.copy() for factory in self.factories]
+        game.middle = self.middle.copy()
+        game.bag = self.bag[:]
+        game.discard = self.discard[:]
+        game.round = self.round
+        game.first_player_next = self.first_player_next
+        game.game_over = self.game_over
+        game.record = record
+        game.history = []
+        game._hash = self._hash
+        game.version = self.version
+        game._views = {}
+        game.recorder = None
+        game.selected_tiles = []
+        game.selected_leftovers = []
+        game.last_selection_info = None
+        if self.last_selection_info:
+            game._untake(*self.last_selection_info)
+            game._hash = None
+        return game
+
+    def memo(self, name, compute):
+        """
+        ``compute()`` cached until the game next changes. Callers must treat
+        the result as read-only: the same object is handed to everyone.
+        """
+        entry = self._views.get(name)
+        if entry is not None and entry[0] == self.version:
+            return entry[1]
+        value = compute()
+        self._views[name] = (self.version, value)
+        return value
+
     def is_selection(self):
         return bool(self.selected_tiles)
     
@@ -32,47 +110,379 @@ class AzulGame:
         self.current_player = (self.current_player + 1) % len(self.players)     
     
     def is_empty(self):
-        return not (any([f.tiles for f in self.factories]) or self.middle.tiles)
+        """No tiles left to take (a lone first-player marker does not count)."""
+        if self.middle.total:
+            return False
+        return not any(f.total for f in self.factories)
         
     def _create_bag(self):
-        colors = [1, 2, 3, 4, 5]  # integers as tile colors
-        bag = [Tile(c) for c in colors for _ in range(20)]
-        random.shuffle(bag)
+        bag = empty_counts()
+        for color in TILE_COLORS:
+            bag[color] = TILES_PER_COLOR
         return bag
 
+    def _draw_from_bag(self):
+        """Draw one random tile colour from the bag count vector."""
+        bag = self.bag
+        pick = self.rng.randrange(sum(bag))
+        for color in TILE_COLORS:
+            pick -= bag[color]
+            if pick < 0:
+                bag[color] -= 1
+                return color
+
+    def _refill_bag(self):
+        for color in TILE_COLORS:
+            self.bag[color] += self.discard[color]
+            self.discard[color] = 0
+
     def fill_factories(self):
         for factory in self.factories:
-            draw = min(factory.capacity, len(self.bag))
-            tiles = [self.bag.pop() for _ in range(draw)]
-            factory.add_tiles(tiles)
+            for _ in range(factory.capacity):
+                if not sum(self.bag):
+                    self._refill_bag()
+                    if not sum(self.bag):
+                        break
+                factory.add(self._draw_from_bag())
         
-        self.middle.add_tiles([Tile(-1), Tile(1), Tile(1), Tile(1), ])
-        self.middle.tile_first_taken = False
+        self.middle.put_first()
+        self._hash = None
+
+    # ----------------------------
+    # Full game flow
+    # ----------------------------
+    def start_round(self):
+        """Deal a new round; the game ends if there is nothing left to deal."""
+        self.version += 1
+        self.fill_factories()
+        self.round += 1
+        self.current_player = self.first_player_next
+        if not any(f.total for f in self.factories):
+            self.middle.take_first()
+            self._finish_game()
+
+    def legal_actions(self):
+        """
+        Every legal turn for the current player as encoded ints (see encode_move):
+        each (source, color, destination row) once, floor included. Factories
+        holding exactly the same tiles are equivalent and only listed once.
+        """
+        board = self.players[self.current_player].board
+        rows = board.rows
+        wall = board.wall_mask
+
+        # Row slots open to each colour on this board, floor (0) last. A full
+        # row takes nothing more: placing there would just be the floor move.
+        targets = [None] * len(empty_counts())
+        for color in TILE_COLORS:
+            slots = [
+                r + 1 for r in range(board.SIZE)
+                if (not rows[r] or rows[r][0] == color and len(rows[r]) < r + 1)
+                and not wall & COLOR_BITS[r][color]
+            ]
+            slots.append(0)
+            targets[color] = slots
+
+        actions = []
+        seen = set()
+        for i, factory in enumerate(self.factories):
+            if not factory.total:
+                continue
+            counts = factory.counts
+            signature = 0
+            for color in TILE_COLORS:
+                signature = signature << 3 | counts[color]
+            if signature in seen:
+                continue
+            seen.add(signature)
+            self._extend_actions(actions, i + 1, counts, targets)
+
+        if self.middle.total:
+            self._extend_actions(actions, 0, self.middle.counts, targets)
+        return actions
+
+    @staticmethod
+    def _extend_actions(actions, source_slot, counts, targets):
+        base = source_slot << 6
+        for color in TILE_COLORS:
+            if counts[color]:
+                color_base = base | color << 3
+                for slot in targets[color]:
+                    actions.append(color_base | slot)
+
+    def wasted_tiles(self, action):
+        """Tiles an encoded action would send to the floor (a floor move wastes all)."""
+        slot, color, row = action >> 6, action >> 3 & 7, (action & 7) - 1
+        source = self.middle if slot == 0 else self.factories[slot - 1]
+        count = source.counts[color]
+        if row == FLOOR:
+            return count
+        free = row + 1 - len(self.players[self.current_player].board.rows[row])
+        return count - free if count > free else 0
+
+    def legal_moves(self):
+        """legal_actions() decoded into (source, color, row) tuples (memoized)."""
+        return self.memo("legal_moves", self._legal_moves)
+
+    def _legal_moves(self):
+        return [decode_move(action) for action in self.legal_actions()]
+
+    def is_legal_move(self, move):
+        """
+        Whether (source, color, row) is a legal turn now. Unlike membership in
+        legal_moves() this accepts every factory, duplicates included.
+        """
+        source, color, row = move
+        if color not in TILE_COLORS:
+            return False
+        if source == MIDDLE:
+            if not self.middle.counts[color]:
+                return False
+        elif not 0 <= source < len(self.factories) or not self.factories[source].counts[color]:
+            return False
+        if row == FLOOR:
+            return True
+        board = self.players[self.current_player].board
+        return (0 <= row < board.SIZE and len(board.rows[row]) < row + 1
+                and board.can_place(row, color))
+
+    def apply_action(self, action, deal=True):
+        self.apply_move(decode_move(action), deal)
+
+    # ----------------------------
+    # Make / unmake
+    # ----------------------------
+    def _take(self, source, color):
+        """
+        Remove ``color`` from a source, leftovers of a factory going to the middle.
+        Returns (count, moved, took_first) where ``moved`` packs the leftover
+        counts 3 bits per colour so _untake can put them back.
+        """
+        if source == MIDDLE:
+            return self.middle.take(color), 0, self.middle.take_first()
+
+        factory = self.factories[source]
+        count = factory.take(color)
+        counts = factory.counts
+        moved = 0
+        for c in TILE_COLORS:
+            moved = moved << 3 | counts[c]
+        factory.move_to(self.middle)
+        return count, moved, False
+
+    def _untake(self, source, color, count, moved, took_first):
+        if source == MIDDLE:
+            self.middle.add(color, count)
+            if took_first:
+                self.middle.put_first()
+            return
+
+        factory = self.factories[source]
+        factory.add(color, count)
+        for c in reversed(TILE_COLORS):
+            n = moved & 7
+            if n:
+                self.middle.remove(c, n)
+                factory.add(c, n)
+            moved >>= 3
+
+    def apply_move(self, move, deal=True):
+        """
+        Play a complete turn for the current player: take the tiles, place them,
+        then either pass the turn or score the round once the table is empty.
+        The move is assumed to come from legal_moves(). An undo record is pushed
+        onto self.history so revert_move() can restore the previous position.
+        With deal=False a finished round is scored but the next one is left for
+        the caller to deal with start_round(); revert_move() undoes that too.
+        """
+        if self.recorder is not None:
+            self.recorder.on_move(self, move)
+        source, color, row = move
+        player_idx = self.current_player
+        board = self.players[player_idx].board
+        prev_first = self.first_player_next
+        self.version += 1
+
+        count, moved, took_first = self._take(source, color)
+        row_len = len(board.rows[row]) if row != FLOOR else 0
+        floor_len = len(board.floor)
+        if took_first:
+            self.first_player_next = player_idx
+            board._place_to_floor([FIRST_PLAYER])
 
+        dropped = board.place_tiles(row, color, count)
+        self.discard[color] += dropped
+
+        round_state = None
+        if self.is_empty():
+            if self.record:
+                round_state = self._save_round()
+            self.end_round(deal)
+            if not self.record:
+                self._hash = None
+                return
+        else:
+            self.next_player()
+
+        prev_hash = self._hash
+        if prev_hash is not None:
+            if round_state is None:
+                self._hash = self._hash_move(
+                    prev_hash, source, color, count, moved, took_first, row,
+                    row_len, floor_len, dropped, player_idx, prev_first)
+            else:
+                self._hash = zobrist.compute_hash(self)
+
+        if self.record:
+            self.history.append((
+                source, color, row, count, moved, took_first, row_len, floor_len,
+                dropped, player_idx, prev_first, round_state, prev_hash,
+            ))
+
+    def revert_move(self):
+        """Undo the last apply_move(), including any round end it triggered."""
+        (source, color, row, count, moved, took_first, row_len, floor_len,
+         dropped, player_idx, prev_first, round_state, prev_hash) = self.history.pop()
+        self.version += 1
+
+        if round_state is not None:
+            self._restore_round(round_state)
+
+        board = self.players[player_idx].board
+        if row != FLOOR:
+            del board.rows[row][row_len:]
+        del board.floor[floor_len:]
+        self.discard[color] -= dropped
+
+        self._untake(source, color, count, moved, took_first)
+        self.first_player_next = prev_first
+        self.current_player = player_idx
+        self._hash = prev_hash
+        if self.recorder is not None:
+            self.recorder.on_revert(self)
+
+    # ----------------------------
+    # Zobrist hashing
+    # ----------------------------
+    def zobrist_hash(self):
+        """
+        64-bit position hash. Computed in full on the first call, then kept up
+        to date by apply_move/revert_move in O(1) per turn.
+        """
+        if self._hash is None:
+            self._hash = zobrist.compute_hash(self)
+        return self._hash
+
+    def _hash_move(self, h, source, color, count, moved, took_first, row,
+                   row_len, floor_len, dropped, player_idx, prev_first):
+        middle = self.middle.counts
+        if source == MIDDLE:
+            h ^= zobrist.MIDDLE[color][count]
+            if took_first:
+                h ^= zobrist.FIRST_IN_MIDDLE
+        else:
+            keys = zobrist.FACTORY[source]
+            h ^= keys[color][count]
+            for c in reversed(TILE_COLORS):
+                n = moved & 7
+                if n:
+                    h ^= keys[c][n] ^ zobrist.MIDDLE[c][middle[c] - n] ^ zobrist.MIDDLE[c][middle[c]]
+                moved >>= 3
+
+        board = self.players[player_idx].board
+        if row != FLOOR:
+            row_keys = zobrist.ROW[player_idx][row][color]
+            h ^= row_keys[row_len] ^ row_keys[len(board.rows[row])]
+        floor_keys = zobrist.FLOOR[player_idx]
+        h ^= floor_keys[floor_len] ^ floor_keys[len(board.floor)]
+
+        if dropped:
+            discard_keys = zobrist.DISCARD[color]
+            h ^= discard_keys[self.discard[color] - dropped] ^ discard_keys[self.discard[color]]
+        if took_first:
+            h ^= zobrist.FIRST_NEXT[prev_first] ^ zobrist.FIRST_NEXT[player_idx]
+        return h ^ zobrist.TURN[player_idx] ^ zobrist.TURN[self.current_player]
+
+    def _save_round(self):
+        """Everything end_round() and the following deal can change."""
+        boards = tuple(
+            ([row[:] for row in p.board.rows], p.board.floor[:], p.board.wall_mask, p.board.score)
+            for p in self.players
+        )
+        return (boards, self.bag[:], self.discard[:], self.rng.getstate(),
+                self.round, self.current_player, self.game_over,
+                self.middle.tile_first_taken)
+
+    def _restore_round(self, state):
+        boards, bag, discard, rng_state, round_no, current, game_over, first_taken = state
+        for player, (rows, floor, wall_mask, score) in zip(self.players, boards):
+            board = player.board
+            board.rows = rows
+            board.floor = floor
+            board.wall_mask = wall_mask
+            board.score = score
+        self.bag[:] = bag
+        self.discard[:] = discard
+        self.rng.setstate(rng_state)
+        self.round = round_no
+        self.current_player = current
+        self.game_over = game_over
+        # The round only ends once the table is empty
+        for factory in self.factories:
+            factory.clear()
+        self.middle.clear()
+        self.middle.tile_first_taken = first_taken
+
+    def end_round(self, deal=True):
+        """Tile every wall, move spare tiles to the discard and deal again."""
+        self.version += 1
+        # Nobody took from the middle: the marker goes back, same start player
+        self.middle.tile_first_taken = True
+        for player in self.players:
+            board = player.board
+            for r, row in enumerate(board.rows):
+                if len(row) == r + 1:
+                    self.discard[row[0]] += r
+            for color in board.floor:
+                if color != FIRST_PLAYER:
+                    self.discard[color] += 1
+            board.end_round()
+
+        if any(player.board.has_full_row() for player in self.players):
+            self._finish_game()
+        elif deal:
+            self.start_round()
+
+    def _finish_game(self):
+        for player in self.players:
+            player.board.final_score()
+        self.game_over = True
+
+    def scores(self):
+        return [player.board.score for player in self.players]
+
+    # ----------------------------
+    # UI selection (take now, choose the row later)
+    # ----------------------------
     def player_select_from_factory(self, factory_index, color):
         factory = self.factories[factory_index]
-        chosen, remaining = factory.take_tiles(color)
-
-        self.last_selection_info = {
-            "origin": "factory",
-            "factory_idx": factory_index,
-            "selected_tiles": chosen,
-            "remaining_to_middle": remaining,
-            "middle_first_player_prev": self.middle.tile_first_taken
-        }
-
-        # Move remaining tiles to middle
-        if remaining:
-            self.middle.add_tiles(remaining)
+        tiles = factory.tiles
+        chosen = [t for t in tiles if t.color == color]
+        remaining = [t for t in tiles if t.color != color]
+
+        taken = self._take(factory_index, color)
+        self._hash = None
+        self.version += 1
+        self.last_selection_info = (factory_index, color) + taken
+        if self.recorder is not None:
+            self.recorder.on_select(self, factory_index, color)
+
+        # Hand the same Tile objects over so the renderer can animate them
+        factory.pool.clear()
+        self.middle.pool.adopt(remaining)
+        self.selected_leftovers = remaining
             
         self.selected_tiles = chosen
-        
-        print(f"Color {color} taken from factory {factory_index}")
-        print(f"Selected tiles: {self.selected_tiles}")
-        
-        moves = self.possible_moves()
-        for m in moves:
-            print(m)
             
         return chosen
     
@@ -81,21 +491,18 @@ class AzulGame:
             # Already have selected tiles — ignore until placed or undone
             return []
         
-        chosen = self.middle.take_tiles(color)
+        tiles = self.middle.tiles
+        chosen = [t for t in tiles if t.color == color or t.color == FIRST_PLAYER]
+
+        taken = self._take(MIDDLE, color)
+        self._hash = None
+        self.version += 1
+        self.last_selection_info = (MIDDLE, color) + taken
+        if self.recorder is not None:
+            self.recorder.on_select(self, MIDDLE, color)
+        self.middle.pool.discard(chosen)
+
         self.selected_tiles = chosen
-        # store last selection info for undo
-        self.last_selection_info = {
-            "origin": "middle",
-            "selected_tiles": chosen,
-            "first_tile_taken": self.middle.tile_first_taken
-        }
-            
-        print(f"Selected tiles: {self.selected_tiles}")
-        
-        moves = self.possible_moves()
-        for m in moves:
-            print(m)
-            
         return chosen
     
     def undo_selection(self):
@@ -103,34 +510,35 @@ class AzulGame:
         if not self.last_selection_info:
             return
 
-        info = self.last_selection_info
-
-        if info["origin"] == "factory":
-            factory_idx = info["factory_idx"]
-            # Return selected tiles
-            self.factories[factory_idx].add_tiles(info["selected_tiles"])
-            # Return leftover tiles that went to middle
-            if info["remaining_to_middle"]:
-                # Remove from middle
-                for t in info["remaining_to_middle"]:
-                    if t in self.middle.tiles:
-                        self.middle.tiles.remove(t)
-                self.factories[factory_idx].add_tiles(info["remaining_to_middle"])
-            # Restore first player tile state if needed
-            self.middle.tile_first_taken = info["middle_first_player_prev"]
-
-        elif info["origin"] == "middle":
-            # Return tiles to middle
-            self.middle.add_tiles(info["selected_tiles"])
-            if info["first_tile_taken"]:
-                self.middle.tile_first_taken = not info["first_tile_taken"]
+        source, color, count, moved, took_first = self.last_selection_info
+        self._untake(source, color, count, moved, took_first)
+        self._hash = None
+        self.version += 1
+        if self.recorder is not None:
+            self.recorder.on_unselect(self)
+
+        if source == MIDDLE:
+            self.middle.pool.adopt(self.selected_tiles)
+        else:
+            self.middle.pool.discard(self.selected_leftovers)
+            self.factories[source].pool.adopt(self.selected_tiles + self.selected_leftovers)
 
         # Clear selection
         self.selected_tiles = []
+        self.selected_leftovers = []
         self.last_selection_info = None
-        
-        print(f"Undo:")
-        print(f"Info: {info}")
+
+    def place_selection(self, row):
+        """Finish the selected turn by placing the tiles on ``row`` (or FLOOR)."""
+        if not self.last_selection_info:
+            return
+
+        source, color, count, moved, took_first = self.last_selection_info
+        self._untake(source, color, count, moved, took_first)
+        self.selected_tiles = []
+        self.selected_leftovers = []
+        self.last_selection_info = None
+        self.apply_move((source, color, row))
         
     def possible_moves(self):
         """
@@ -141,7 +549,11 @@ class AzulGame:
                 "to_row": number_of_tiles_placed_in_row,
                 "to_floor": number_of_tiles_to_floor (includes -1 markers)
             }
+        Memoized until the game changes.
         """
+        return self.memo("possible_moves", self._possible_moves)
+
+    def _possible_moves(self):
         if not self.selected_tiles:
             return []
 
@@ -157,11 +569,11 @@ class AzulGame:
         moves = []
 
         if count_normal > 0:
-            color = normal_tiles[0]  # all normal tiles are the same color
+            color = normal_tiles[0].color  # all normal tiles are the same color
             # Check pattern rows
             for row_idx in range(board.SIZE):
-                if board.can_place(row_idx, color):
-                    free_slots = (row_idx + 1) - len(board.rows[row_idx])
+                free_slots = (row_idx + 1) - len(board.rows[row_idx])
+                if free_slots and board.can_place(row_idx, color):
                     to_row = min(count_normal, free_slots)
                     to_floor = count_normal - to_row + count_marker  # include marker
                     moves.append({
@@ -0,0 +1,245 @@
+# core/mcts.py
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from core.agents import Agent
+from core.endgame import ENDGAME_SHARE, EndgameSolver, should_solve
+from core.game_logic import decode_move
+
+EXPLORATION = 1.4
+# Rollouts stop after this many round ends and score the margin at that point;
+# playing to the end of the game with a weak policy is mostly noise
+ROLLOUT_ROUNDS = 1
+ROLLOUT_SAMPLES = 3
+# Score margin that maps to a reward of ~0.88 (tanh(1))
+REWARD_SCALE = 10.0
+REPORT_EVERY = 64  # playouts between progress reports
+POLL_INTERVAL = 0.05  # seconds between progress checks while workers search
+
+# Set in each pool worker by _init_worker: the last cancelled job number
+_cancelled = None
+
+
+class Node:
+    __slots__ = ("parent", "action", "player", "children", "untried", "visits", "wins")
+
+    def __init__(self, parent, action, player, untried):
+        self.parent = parent
+        self.action = action
+        self.player = player  # seat that played ``action``
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+    def best_child(self):
+        log_n = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda c: c.wins / c.visits + EXPLORATION * math.sqrt(log_n / c.visits),
+        )
+
+
+def rollout(game, rng):
+    """
+    Play ``game`` on with a light policy: of a few random legal actions, the
+    one wasting the fewest tiles. Returns a reward in [0, 1] per seat from the
+    score margin over the best opponent once the rollout stops.
+    """
+    last_round = game.round + ROLLOUT_ROUNDS - 1
+    while not game.game_over and game.round <= last_round:
+        actions = game.legal_actions()
+        best = actions[rng.randrange(len(actions))]
+        best_waste = game.wasted_tiles(best)
+        for _ in range(ROLLOUT_SAMPLES - 1):
+            if not best_waste:
+                break
+            action = actions[rng.randrange(len(actions))]
+            waste = game.wasted_tiles(action)
+            if waste < best_waste:
+                best, best_waste = action, waste
+        game.apply_action(best)
+
+    scores = game.scores()
+    rewards = []
+    for p, score in enumerate(scores):
+        margin = score - max(s for q, s in enumerate(scores) if q != p)
+        rewards.append(0.5 + 0.5 * math.tanh(margin / REWARD_SCALE))
+    return rewards
+
+
+def search(game, time_budget, seed=None, max_playouts=None, report=None):
+    """
+    Single-threaded UCT from ``game`` (left untouched).
+
+    Every playout works on a fresh copy with its own bag seed, so rounds
+    beyond the current one are sampled rather than fixed. Moves that end the
+    round are leaves: the tree only spans the deterministic rest of the round.
+    Every REPORT_EVERY playouts ``report(action)`` gets the most visited
+    root action; returning False ends the search there.
+    Returns ({action: visits}, playouts, elapsed seconds).
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    deadline = start + time_budget
+    root = Node(None, None, None, game.legal_actions())
+    playouts = 0
+
+    while time.perf_counter() < deadline:
+        if max_playouts is not None and playouts >= max_playouts:
+            break
+        state = game.copy(seed=rng.getrandbits(64), record=False)
+        node = root
+
+        # Selection
+        while not node.untried and node.children:
+            node = node.best_child()
+            state.apply_action(node.action)
+
+        # Expansion
+        if node.untried:
+            action = node.untried.pop(rng.randrange(len(node.untried)))
+            player = state.current_player
+            round_no = state.round
+            state.apply_action(action)
+            untried = []
+            if state.round == round_no and not state.game_over:
+                untried = state.legal_actions()
+            child = Node(node, action, player, untried)
+            node.children.append(child)
+            node = child
+
+        # Simulation and backpropagation
+        rewards = rollout(state, rng)
+        while node is not None:
+            node.visits += 1
+            if node.player is not None:
+                node.wins += rewards[node.player]
+            node = node.parent
+        playouts += 1
+
+        if report is not None and not playouts % REPORT_EVERY and root.children:
+            best = max(root.children, key=lambda child: child.visits)
+            if report(best.action) is False:
+                break
+
+    visits = {child.action: child.visits for child in root.children}
+    return visits, playouts, time.perf_counter() - start
+
+
+def _init_worker(cancelled):
+    global _cancelled
+    _cancelled = cancelled
+
+
+def _worker_search(game, time_budget, seed, max_playouts, job):
+    """search() in a pool worker, stopping early once ``job`` is cancelled."""
+    return search(game, time_budget, seed, max_playouts,
+                  report=lambda action: _cancelled.value < job)
+
+
+class MCTSAgent(Agent):
+    """
+    Monte Carlo Tree Search player.
+
+    time_budget: wall-clock seconds per move
+    workers: processes for root-parallel search; each searches its own tree
+             and the root visit counts are summed before picking the move
+    max_playouts: optional cap per worker (useful for reproducible tests)
+    endgame_tiles: at most this many tiles left in a final round, the move is
+                   solved exactly by core.endgame instead (None = the threshold
+                   for the player count, 0 = never); a solve that overruns its
+                   share of the budget falls back to the search
+    After every move ``last_stats`` holds playouts and playouts/s per core.
+    """
+    name = "mcts"
+
+    def __init__(self, time_budget=1.0, workers=1, max_playouts=None,
+                 endgame_tiles=None, seed=None):
+        super().__init__(seed)
+        self.time_budget = time_budget
+        self.workers = workers or os.cpu_count() or 1
+        self.max_playouts = max_playouts
+        self.endgame_tiles = endgame_tiles
+        self.endgame = EndgameSolver()
+        self.last_stats = {}
+        self._pool = None
+        self._cancelled = None
+        self._job = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_cancelled"] = None
+        return state
+
+    def new_game(self):
+        self.endgame.clear()
+
+    def choose_move(self, game):
+        start = time.perf_counter()
+        if self.endgame_tiles != 0 and should_solve(game, self.endgame_tiles):
+            solution = self.endgame.solve(game, self.time_budget * ENDGAME_SHARE)
+            if solution is not None:
+                self.last_stats = self.endgame.stats(solution)
+                return decode_move(solution.move)
+        budget = self.time_budget - (time.perf_counter() - start)
+        seeds = [self.rng.getrandbits(64) for _ in range(self.workers)]
+        if self.workers == 1:
+            report = None
+            if self.progress is not None:
+                report = lambda action: self.report(decode_move(action))
+            results = [search(game, budget, seeds[0], self.max_playouts, report)]
+        else:
+            if self._pool is None:
+                self._cancelled = multiprocessing.Value("q", 0, lock=False)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self._cancelled,))
+            self._job += 1
+            snapshot = game.copy()
+            futures = [
+                self._pool.submit(_worker_search, snapshot, budget, s,
+                                  self.max_playouts, self._job)
+                for s in seeds
+            ]
+            pending = futures
+            while pending:
+                _, pending = wait(pending, POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                if pending and not self.report():
+                    # Cancelled: free the cores for the next search
+                    self._cancelled.value = self._job
+                    for future in pending:
+                        future.cancel()
+                    return self.rng.choice(game.legal_moves())
+            results = [f.result() for f in futures]
+
+        visits = {}
+        playouts = 0
+        elapsed = 0.0
+        for worker_visits, worker_playouts, worker_elapsed in results:
+            for action, n in worker_visits.items():
+                visits[action] = visits.get(action, 0) + n
+            playouts += worker_playouts
+            elapsed = max(elapsed, worker_elapsed)
+
+        self.last_stats = {
+            "playouts": playouts,
+            "elapsed": elapsed,
+            "workers": self.workers,
+            "playouts_per_sec_per_core": playouts / elapsed / self.workers if elapsed else 0.0,
+        }
+
+        if not visits:
+            return self.rng.choice(game.legal_moves())
+        return decode_move(max(visits, key=visits.get))
+
+    def close(self):
+        if self._pool is not None:
+            self._cancelled.value = self._job
+            self._pool.shutdown()
+            self._pool = None
+            self._cancelled = None
@@ -1,21 +1,93 @@
 # core/middle.py
+from core.tile import FIRST_PLAYER, TILE_COLORS, TilePool, empty_counts
+
+
 class Middle:
+    __slots__ = ("counts", "total", "tile_first_taken", "pool")
+
     def __init__(self):
-        self.tiles = []
-        self.tile_first_taken = False 
+        self.counts = empty_counts()
+        self.total = 0
+        # No marker on the table until the first round is dealt
+        self.tile_first_taken = True
+        self.pool = TilePool()
+
+    @property
+    def tiles(self):
+        return self.pool.sync(self.counts, first=not self.tile_first_taken)
+
+    def copy(self):
+        middle = Middle()
+        middle.counts[:] = self.counts
+        middle.total = self.total
+        middle.tile_first_taken = self.tile_first_taken
+        return middle
+
+    # ----------------------------
+    # Count-based operations
+    # ----------------------------
+    def add(self, color, count=1):
+        self.counts[color] += count
+        self.total += count
+
+    def take(self, color):
+        """Remove every tile of ``color`` and return how many there were."""
+        count = self.counts[color]
+        self.counts[color] = 0
+        self.total -= count
+        return count
 
+    def remove(self, color, count):
+        self.counts[color] -= count
+        self.total -= count
+
+    def put_first(self):
+        self.tile_first_taken = False
+
+    def take_first(self):
+        """Take the first player marker; returns True if it was still here."""
+        if self.tile_first_taken:
+            return False
+        self.tile_first_taken = True
+        return True
+
+    def clear(self):
+        for color in TILE_COLORS:
+            self.counts[color] = 0
+        self.total = 0
+        self.pool.clear()
+
+    # ----------------------------
+    # Tile-object adapter (UI)
+    # ----------------------------
     def add_tiles(self, tiles: list):
-        self.tiles.extend(tiles)
-        self.tiles = sorted(self.tiles, key= lambda x: x.color)
+        self.pool.adopt(tiles)
+        for t in tiles:
+            if t.color == FIRST_PLAYER:
+                self.tile_first_taken = False
+            else:
+                self.add(t.color)
+
+    def remove_tiles(self, tiles: list):
+        self.pool.discard(tiles)
+        for t in tiles:
+            if t.color == FIRST_PLAYER:
+                self.tile_first_taken = True
+            else:
+                self.counts[t.color] -= 1
+                self.total -= 1
 
     def take_tiles(self, color: int):
-        chosen_tiles = [t for t in self.tiles if t.color == color]
-        self.tiles = [t for t in self.tiles if t.color != color]
+        tiles = self.tiles
+        chosen_tiles = [t for t in tiles if t.color == color]
+        self.pool.discard(chosen_tiles)
+        self.take(color)
 
         if not self.tile_first_taken:
-            tile_first, self.tiles = self.tiles[0], self.tiles[1:]
-            
+            tile_first = tiles[0]
+            self.pool.discard([tile_first])
+
             chosen_tiles.append(tile_first)
             self.tile_first_taken = True
 
-        return chosen_tiles
\ No newline at end of file
+        return chosen_tiles
@@ -12,14 +12,29 @@ COLORS = [
 class Player:
     players_count = 0
     
-    def __init__(self, name):
+    def __init__(self, name, agent=None):
         self.name = name
+        self.agent = agent
         self.number = Player.players_count
         self.color = COLORS[(Player.players_count) % len(COLORS)]
         Player.increase_player_count()
         
         self.board = Board()
 
+    def copy(self):
+        """Copy for search: same seat and board, no agent, not counted as a new player."""
+        player = Player.__new__(Player)
+        player.name = self.name
+        player.agent = None
+        player.number = self.number
+        player.color = self.color
+        player.board = self.board.copy()
+        return player
+
+    @property
+    def is_bot(self):
+        return self.agent is not None
+
     @classmethod
     def increase_player_count(cls):
         cls.players_count += 1
\ No newline at end of file
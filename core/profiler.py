@@ -0,0 +1,108 @@
+# core/profiler.py
+import json
+import os
+import threading
+import time
+from collections import deque
+
+WINDOW = 240  # samples kept per stage for the rolling percentiles
+MAX_TRACE_EVENTS = 200000
+
+
+class _NullSection:
+    """What section() hands out while profiling is off: enter/exit do nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    """
+    Named timing sections for finding what dominates a frame.
+
+        with PROFILER.section("draw_factories"):
+            ...
+
+    Disabled, section() returns a shared no-op context manager, so a hook
+    costs one method call. Enabled, every section keeps its last ``window``
+    durations for rolling percentiles and is logged as a trace event that
+    export_trace() writes in Chrome's trace format (chrome://tracing or
+    ui.perfetto.dev).
+    """
+
+    def __init__(self, window=WINDOW, max_events=MAX_TRACE_EVENTS):
+        self.enabled = False
+        self.window = window
+        self.samples = {}
+        self.events = deque(maxlen=max_events)
+        self.origin = time.perf_counter()
+
+    def section(self, name):
+        if not self.enabled:
+            return NULL_SECTION
+        return _Section(self, name)
+
+    def record(self, name, start, end):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(end - start)
+        self.events.append((name, start, end - start, threading.get_ident()))
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        """Rolling percentiles of a section in seconds (nearest rank)."""
+        values = sorted(self.samples.get(name, ()))
+        if not values:
+            return tuple(0.0 for _ in points)
+        last = len(values) - 1
+        return tuple(values[min(last, int(p / 100 * len(values)))] for p in points)
+
+    def stats(self):
+        """{section: (p50, p95, p99)} in seconds, for every section seen."""
+        return {name: self.percentiles(name) for name in self.samples}
+
+    def reset(self):
+        self.samples = {}
+        self.events.clear()
+        self.origin = time.perf_counter()
+
+    def export_trace(self, path):
+        """Write the recorded sections as Chrome trace 'complete' events."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name, "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - self.origin) * 1e6, "dur": duration * 1e6,
+            }
+            for name, start, duration, tid in self.events
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+# Shared instance the UI and game loop report to
+PROFILER = Profiler()
@@ -0,0 +1,198 @@
+# core/replay.py
+"""
+Append-only game logs and a replay engine that seeks through them.
+
+A log is a sequence of records, each a type byte, a payload length and the
+payload. Moves are logged as encoded actions, with periodic keyframes that
+pair a snapshot (core.snapshot) with the state of the game's random
+generator, which only the bag draws use. Any turn can then be rebuilt from
+the nearest earlier keyframe, by restoring it and replaying the moves
+since. The recorder only reads the game, so recording never changes a deal.
+
+Every game starts with a HEADER record. Recording another game to the same
+path appends a new segment; Replay reads the last one unless told otherwise.
+"""
+import bisect
+import json
+import struct
+
+from core.game_logic import AzulGame, decode_move, encode_move
+from core.player import Player
+from core.snapshot import load, snapshot
+
+FORMAT = 2
+KEYFRAME_EVERY = 16  # moves between keyframes
+
+RECORD = struct.Struct("<BH")  # type, payload length
+HEADER, KEYFRAME, MOVE, REVERT, SELECT, UNSELECT = b"HKMRSU"
+KEY = struct.Struct("<I")      # turn; followed by the RNG state and the snapshot
+RNG_STATE = struct.Struct("<625I")  # random.Random's Mersenne Twister words and index
+ACTION = struct.Struct("<H")
+CHOICE = struct.Struct("<bB")  # source, color
+
+
+class ReplayRecorder:
+    """
+    Logs everything that happens to one game, once attached:
+
+        recorder = ReplayRecorder("game.azr")
+        recorder.attach(game)
+
+    The game calls back into the recorder before each move and after each
+    undo (see AzulGame.recorder). UI selections are logged as events too.
+    """
+
+    def __init__(self, path, keyframe_every=KEYFRAME_EVERY):
+        self.file = open(path, "ab")
+        self.keyframe_every = keyframe_every
+        self.turn = 0
+
+    def attach(self, game):
+        header = {"format": FORMAT, "players": [p.name for p in game.players]}
+        self.write(HEADER, json.dumps(header).encode())
+        self.keyframe(game)
+        game.recorder = self
+
+    def detach(self, game):
+        game.recorder = None
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def write(self, kind, payload=b""):
+        self.file.write(RECORD.pack(kind, len(payload)) + payload)
+        self.file.flush()
+
+    def keyframe(self, game):
+        _, words, _ = game.rng.getstate()
+        self.write(KEYFRAME, KEY.pack(self.turn) + RNG_STATE.pack(*words) + snapshot(game))
+
+    def on_move(self, game, move):
+        """Called by apply_move() before the move is made."""
+        if self.turn % self.keyframe_every == 0 and self.turn:
+            self.keyframe(game)
+        self.write(MOVE, ACTION.pack(encode_move(*move)))
+        self.turn += 1
+
+    def on_revert(self, game):
+        """Called by revert_move() once the move is undone."""
+        self.turn -= 1
+        self.write(REVERT)
+
+    def on_select(self, game, source, color):
+        self.write(SELECT, CHOICE.pack(source, color))
+
+    def on_unselect(self, game):
+        self.write(UNSELECT)
+
+
+def read_records(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + RECORD.size <= len(data):
+        kind, length = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if offset + length > len(data):
+            break  # torn final record from a crash mid-write
+        yield kind, data[offset:offset + length]
+        offset += length
+
+
+class Replay:
+    """
+    A recorded game that can be positioned at any turn.
+
+    ``game`` is one AzulGame updated in place, so a Renderer built on it
+    follows every seek() and step(). Seeking restores the nearest keyframe at
+    or before the target and replays the moves from there. Stepping back
+    undoes moves. ``index`` picks one of the ``games`` recorded to the
+    path, the last by default.
+    """
+
+    def __init__(self, path, index=-1):
+        segments = []
+        for kind, payload in read_records(path):
+            if kind == HEADER:
+                segments.append([])
+            if segments:
+                segments[-1].append((kind, payload))
+        if not segments:
+            raise ValueError(f"no game recorded in {path}")
+        self.games = len(segments)
+        self.index = range(self.games)[index]
+
+        self.moves = []
+        self.keyframes = {}  # turn -> (RNG state, snapshot)
+        self.events = []     # (turn, "select" | "unselect", details)
+        self.names = []
+        for kind, payload in segments[self.index]:
+            self._read(kind, payload)
+        self.keyframe_turns = sorted(self.keyframes)
+
+        players = [Player(name) for name in self.names]
+        self.game = AzulGame(list(players))
+        self.game.players = players
+        self.turn = None
+        self.seek(0)
+
+    def _read(self, kind, payload):
+        if kind == HEADER:
+            header = json.loads(payload)
+            if header["format"] != FORMAT:
+                raise ValueError(f"unknown replay format {header['format']}")
+            self.names = header["players"]
+        elif kind == KEYFRAME:
+            (turn,) = KEY.unpack_from(payload)
+            words = RNG_STATE.unpack_from(payload, KEY.size)
+            self.keyframes[turn] = ((3, words, None), payload[KEY.size + RNG_STATE.size:])
+        elif kind == MOVE:
+            self.moves.append(decode_move(ACTION.unpack(payload)[0]))
+        elif kind == REVERT:
+            self.moves.pop()
+            for turn in [t for t in self.keyframes if t > len(self.moves)]:
+                del self.keyframes[turn]
+        elif kind == SELECT:
+            self.events.append((len(self.moves), "select", CHOICE.unpack(payload)))
+        elif kind == UNSELECT:
+            self.events.append((len(self.moves), "unselect", None))
+
+    def __len__(self):
+        """Number of moves; turns run from 0 (the start) to len()."""
+        return len(self.moves)
+
+    def seek(self, turn):
+        turn = max(0, min(turn, len(self.moves)))
+        index = bisect.bisect_right(self.keyframe_turns, turn) - 1
+        if index < 0:
+            raise ValueError("no keyframe at or before the start")
+        base = self.keyframe_turns[index]
+
+        # Moving forward within reach of the current position: just play on
+        if self.turn is None or not (base <= self.turn <= turn):
+            rng_state, data = self.keyframes[base]
+            load(self.game, data)
+            self.game.rng.setstate(rng_state)
+            self.turn = base
+        while self.turn < turn:
+            self.game.apply_move(self.moves[self.turn])
+            self.turn += 1
+        return self.game
+
+    def step(self, count=1):
+        """Move ``count`` turns forward, or back if negative."""
+        if count >= 0:
+            return self.seek(self.turn + count)
+        target = max(0, self.turn + count)
+        if len(self.game.history) < self.turn - target:
+            # Moves from before the last restored keyframe cannot be undone
+            return self.seek(target)
+        while self.turn > target:
+            self.game.revert_move()
+            self.turn -= 1
+        return self.game
+
+    def events_at(self, turn):
+        """UI selections made while ``turn`` was the position."""
+        return [(kind, details) for t, kind, details in self.events if t == turn]
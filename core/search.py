@@ -0,0 +1,268 @@
+# core/search.py
+import random
+import time
+
+from core import zobrist
+from core.agents import Agent
+from core.board import Board
+from core.endgame import ENDGAME_SHARE, EndgameSolver, should_solve
+from core.game_logic import decode_move
+from core.zobrist import TranspositionTable
+
+INF = float("inf")
+WIN = 1000
+MAX_PLY = 64
+# Distinct salt per root seat: stored values are from the root player's view
+_salt_rng = random.Random(0x5A17)
+ROOT_SALT = [_salt_rng.getrandbits(64) for _ in range(zobrist.MAX_PLAYERS)]
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def score_margin(game, player):
+    """
+    Cheap static evaluation from ``player``'s point of view: score now, plus
+    a point per full pattern row and the current floor penalty, against the
+    best opponent.
+    """
+    values = []
+    for p in game.players:
+        board = p.board
+        value = board.score + sum(Board.FLOOR_PENALTIES[:len(board.floor)])
+        value += sum(1 for r, row in enumerate(board.rows) if len(row) == r + 1)
+        values.append(value)
+    mine = values[player]
+    return mine - max(v for p, v in enumerate(values) if p != player)
+
+
+class AlphaBetaAgent(Agent):
+    """
+    Iterative-deepening alpha-beta for play inside a round, with an
+    expectimax node wherever a move ends the round: the next deal is sampled
+    ``chance_samples`` times and the results averaged.
+
+    Built for 2 players; with more, every opponent is assumed to play against
+    the root player (paranoid search). Stops at ``max_depth``, after
+    ``time_budget`` seconds or after ``max_nodes`` nodes, whichever comes first.
+    ``last_stats`` reports depth, nodes, nodes/s and effective branching factor.
+    Once at most ``endgame_tiles`` tiles are left in a final round the move
+    comes from core.endgame's exact solver instead (None picks the threshold
+    for the player count, 0 turns that off). A solve that overruns its share
+    of the budget falls back to the search.
+    """
+    name = "alphabeta"
+
+    def __init__(self, time_budget=1.0, max_depth=None, max_nodes=None,
+                 chance_samples=2, evaluate=score_margin, endgame_tiles=None,
+                 seed=None):
+        super().__init__(seed)
+        self.time_budget = time_budget
+        self.max_depth = max_depth or MAX_PLY
+        self.max_nodes = max_nodes
+        self.chance_samples = chance_samples
+        self.evaluate = evaluate
+        self.table = TranspositionTable()
+        self.endgame_tiles = endgame_tiles
+        self.endgame = EndgameSolver()
+        self.last_stats = {}
+
+    def new_game(self):
+        self.table.clear()
+        self.endgame.clear()
+
+    def choose_move(self, game):
+        start = time.perf_counter()
+        if self.endgame_tiles != 0 and should_solve(game, self.endgame_tiles):
+            solution = self.endgame.solve(game, self.time_budget * ENDGAME_SHARE)
+            if solution is not None:
+                self.last_stats = self.endgame.stats(solution)
+                return decode_move(solution.move)
+        game = game.copy()
+        self.root = game.current_player
+        self.salt = ROOT_SALT[self.root]
+        self.history_scores = [0] * 1024
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.table.new_search()
+        self.nodes = 0
+        self.start = start
+        self.deadline = start + self.time_budget
+
+        actions = self._ordered(game, game.legal_actions(), 0, None)
+        best = actions[0]
+        depth_reached = 0
+        iteration_nodes = []
+        try:
+            for depth in range(1, self.max_depth + 1):
+                nodes_before = self.nodes
+                self.depth_limited = False
+                best = self._root(game, actions, depth)
+                depth_reached = depth
+                iteration_nodes.append(self.nodes - nodes_before)
+                if not self.report(decode_move(best), {"depth": depth, "nodes": self.nodes}):
+                    break
+                if not self.depth_limited:
+                    # Every line reached the end of the game; deeper adds nothing
+                    break
+                # Best move first on the next iteration
+                actions.remove(best)
+                actions.insert(0, best)
+        except SearchTimeout:
+            pass
+
+        elapsed = time.perf_counter() - self.start
+        ebf = 0.0
+        if len(iteration_nodes) >= 2 and iteration_nodes[-2]:
+            ebf = iteration_nodes[-1] / iteration_nodes[-2]
+        elif iteration_nodes:
+            ebf = float(iteration_nodes[0])
+        self.last_stats = {
+            "depth": depth_reached,
+            "nodes": self.nodes,
+            "elapsed": elapsed,
+            "nodes_per_sec": self.nodes / elapsed if elapsed else 0.0,
+            "ebf": ebf,
+            "tt_hits": self.table.hits,
+        }
+        return decode_move(best)
+
+    # ----------------------------
+    # Search
+    # ----------------------------
+    def _root(self, game, actions, depth):
+        best, best_value = actions[0], -INF
+        alpha, beta = -INF, INF
+        for action in actions:
+            value = self._after_move(game, action, depth - 1, alpha, beta, 1)
+            if value > best_value:
+                best, best_value = action, value
+            alpha = max(alpha, value)
+        self.table.store(game.zobrist_hash() ^ self.salt, depth, best_value, move=best)
+        return best
+
+    def _after_move(self, game, action, depth, alpha, beta, ply):
+        """Value of playing ``action``, sampling the deal if the round ends."""
+        game.apply_action(action, deal=False)
+        try:
+            if game.game_over:
+                return self._leaf(game)
+            if depth <= 0:
+                self.depth_limited = True
+                return self._leaf(game)
+            if not game.is_empty():
+                return self._alphabeta(game, depth, alpha, beta, ply)
+        finally:
+            game.revert_move()
+        return self._chance(game, action, depth, ply)
+
+    def _chance(self, game, action, depth, ply):
+        """Expectimax over sampled deals; seeds derive from the position."""
+        key = game.zobrist_hash() ^ action
+        total = 0.0
+        for i in range(self.chance_samples):
+            game.apply_action(action, deal=False)
+            try:
+                game.rng.seed(key + i)
+                game.start_round()
+                if game.game_over:
+                    total += self._leaf(game)
+                else:
+                    total += self._alphabeta(game, depth, -INF, INF, ply)
+            finally:
+                # Also takes back the deal
+                game.revert_move()
+        return total / self.chance_samples
+
+    def _count_node(self):
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SearchTimeout
+        self.nodes += 1
+        if not self.nodes & 255 and (time.perf_counter() >= self.deadline or not self.report()):
+            raise SearchTimeout
+
+    def _leaf(self, game):
+        self._count_node()
+        if game.game_over:
+            scores = game.scores()
+            margin = scores[self.root] - max(s for p, s in enumerate(scores) if p != self.root)
+            # A finished game outranks any heuristic estimate
+            if margin > 0:
+                return WIN + margin
+            if margin < 0:
+                return -WIN + margin
+            return 0
+        return self.evaluate(game, self.root)
+
+    def _alphabeta(self, game, depth, alpha, beta, ply):
+        self._count_node()
+
+        key = game.zobrist_hash() ^ self.salt
+        entry = self.table.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                value, flag = entry[2], entry[3]
+                if flag == TranspositionTable.EXACT:
+                    return value
+                if flag == TranspositionTable.LOWER and value >= beta:
+                    return value
+                if flag == TranspositionTable.UPPER and value <= alpha:
+                    return value
+
+        maximizing = game.current_player == self.root
+        actions = self._ordered(game, game.legal_actions(), ply, tt_move)
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
+        best_value = -INF if maximizing else INF
+
+        for action in actions:
+            value = self._after_move(game, action, depth - 1, alpha, beta, ply + 1)
+            if maximizing:
+                if value > best_value:
+                    best_value, best_move = value, action
+                alpha = max(alpha, value)
+            else:
+                if value < best_value:
+                    best_value, best_move = value, action
+                beta = min(beta, value)
+            if alpha >= beta:
+                self._record_cutoff(action, depth, ply)
+                break
+
+        if best_value <= alpha_orig:
+            flag = TranspositionTable.UPPER
+        elif best_value >= beta_orig:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self.table.store(key, depth, best_value, flag, best_move)
+        return best_value
+
+    # ----------------------------
+    # Move ordering
+    # ----------------------------
+    def _record_cutoff(self, action, depth, ply):
+        self.history_scores[action] += depth * depth
+        killers = self.killers[ply]
+        if killers[0] != action:
+            killers[1] = killers[0]
+            killers[0] = action
+
+    def _ordered(self, game, actions, ply, tt_move):
+        """TT move, then killers, then history score, then fewest wasted tiles."""
+        killers = self.killers[ply] if ply < MAX_PLY else (None, None)
+        history = self.history_scores
+
+        def priority(action):
+            if action == tt_move:
+                return 1 << 30
+            if action == killers[0]:
+                return 1 << 29
+            if action == killers[1]:
+                return 1 << 28
+            return history[action] * 16 - game.wasted_tiles(action)
+
+        return sorted(actions, key=priority, reverse=True)
+
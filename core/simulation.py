@@ -0,0 +1,51 @@
+# core/simulation.py
+import random
+import time
+
+from core.game_logic import AzulGame
+from core.player import Player
+
+
+def play_game(agents, seed=None):
+    """
+    Play one complete game without any UI.
+
+    agents: list of Agent objects, one per seat (2-4)
+    seed: makes the bag draws and the agents' own choices reproducible
+    Returns a dict with final scores listed in the same order as ``agents``.
+    """
+    players = [Player(getattr(agent, "name", f"P{i}"), agent=agent) for i, agent in enumerate(agents)]
+    for i, agent in enumerate(agents):
+        if hasattr(agent, "seed"):
+            agent.seed(None if seed is None else f"{seed}:{i}")
+        if hasattr(agent, "new_game"):
+            agent.new_game()
+
+    game = AzulGame(list(players), seed=seed)
+    game.start_round()
+
+    turns = 0
+    while not game.game_over:
+        player = game.players[game.current_player]
+        game.apply_move(player.agent.choose_move(game))
+        turns += 1
+
+    scores = [player.board.score for player in players]
+    best = max(scores)
+    return {
+        "seed": seed,
+        "scores": scores,
+        "winners": [i for i, score in enumerate(scores) if score == best],
+        "rounds": game.round,
+        "turns": turns,
+    }
+
+
+def run_games(agents, games, seed=None):
+    """Play ``games`` games in a row; returns (results, elapsed seconds)."""
+    rng = random.Random(seed)
+    results = []
+    start = time.perf_counter()
+    for _ in range(games):
+        results.append(play_game(agents, seed=rng.getrandbits(32)))
+    return results, time.perf_counter() - start
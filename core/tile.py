@@ -1,15 +1,73 @@
 import random
 
+TILE_COLORS = (1, 2, 3, 4, 5)
+FIRST_PLAYER = -1
+TILES_PER_COLOR = 20
+
+
+def empty_counts():
+    """Colour count vector, indexed directly by colour (slot 0 unused)."""
+    return [0] * (len(TILE_COLORS) + 1)
+
+
 class Tile:
     def __init__(self, color):
         self.color = color
         self.rotation = 0
         if color != -1:
             self.rotation = random.uniform(-30, 30)
-            
+
         self.middle_pos = None
-        
-        self.pos = None 
-    
+
+        self.pos = None
+
     def __repr__(self):
-        return f"|{self.color}|"
\ No newline at end of file
+        return f"|{self.color}|"
+
+
+class TilePool:
+    """
+    Adapter between a colour count vector and the Tile objects the UI draws.
+
+    Game logic only tracks counts. Renderers keep animation state and rotation
+    on Tile objects, so the pool keeps handing out the same objects for as long
+    as the counts allow, creating or dropping tiles only for the difference.
+    """
+    __slots__ = ("_tiles",)
+
+    def __init__(self):
+        self._tiles = {}
+
+    def _bucket(self, color, count):
+        bucket = self._tiles.get(color)
+        if bucket is None:
+            bucket = self._tiles[color] = []
+        while len(bucket) < count:
+            bucket.append(Tile(color))
+        del bucket[count:]
+        return bucket
+
+    def sync(self, counts, first=False):
+        """Return Tile objects matching ``counts`` (marker first), sorted by colour."""
+        tiles = []
+        if first:
+            tiles.extend(self._bucket(FIRST_PLAYER, 1))
+        else:
+            self._tiles.pop(FIRST_PLAYER, None)
+        for color in TILE_COLORS:
+            if counts[color] or color in self._tiles:
+                tiles.extend(self._bucket(color, counts[color]))
+        return tiles
+
+    def adopt(self, tiles):
+        for tile in tiles:
+            self._tiles.setdefault(tile.color, []).append(tile)
+
+    def discard(self, tiles):
+        for tile in tiles:
+            bucket = self._tiles.get(tile.color)
+            if bucket and tile in bucket:
+                bucket.remove(tile)
+
+    def clear(self):
+        self._tiles.clear()
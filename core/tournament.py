@@ -0,0 +1,281 @@
+# core/tournament.py
+import json
+import math
+import multiprocessing
+import os
+import random
+
+from core.simulation import play_game
+
+ELO_K = 16
+ELO_START = 1500
+# Glicko-1 constants
+GLICKO_Q = math.log(10) / 400
+GLICKO_START_RD = 350
+
+
+def game_seed(tournament_seed, game_id):
+    """Every game's seed follows from the tournament seed and its id alone."""
+    return random.Random(f"{tournament_seed}:{game_id}").getrandbits(32)
+
+
+# ----------------------------
+# Pairings
+# ----------------------------
+def round_robin(names, games_per_pair=2):
+    """Every pair meets ``games_per_pair`` times, alternating who sits first."""
+    jobs = []
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            for k in range(games_per_pair):
+                seats = (a, b) if k % 2 == 0 else (b, a)
+                jobs.append((f"rr:{a}:{b}:{k}", seats))
+    return jobs
+
+
+def swiss_round(names, results, round_no, games_per_pair=2):
+    """
+    Pair entrants with similar points, avoiding rematches where possible.
+    Only results from earlier rounds are used, so a half-played round pairs
+    the same way again on resume. With an odd field the lowest entrant that
+    has not sat out yet gets a bye.
+    """
+    points = {name: 0.0 for name in names}
+    met = set()
+    played = {r: set() for r in range(round_no)}
+    for result in results:
+        if not result["id"].startswith("swiss:"):
+            continue
+        result_round = int(result["id"].split(":")[1])
+        if result_round >= round_no:
+            continue
+        played[result_round].update(result["seats"])
+        for a, b, score in pairwise_outcomes(result):
+            points[a] += score
+            points[b] += 1 - score
+            met.add((a, b))
+            met.add((b, a))
+
+    order = sorted(names, key=lambda n: (-points[n], names.index(n)))
+    if len(order) % 2:
+        had_bye = {n for seats in played.values() if seats for n in names if n not in seats}
+        bye = next((n for n in reversed(order) if n not in had_bye), order[-1])
+        order.remove(bye)
+    jobs = []
+    board = 0
+    while order:
+        a = order.pop(0)
+        partner = next((b for b in order if (a, b) not in met), order[0])
+        order.remove(partner)
+        for k in range(games_per_pair):
+            seats = (a, partner) if k % 2 == 0 else (partner, a)
+            jobs.append((f"swiss:{round_no}:{board}:{k}", seats))
+        board += 1
+    return jobs
+
+
+# ----------------------------
+# Running
+# ----------------------------
+_worker_agents = None
+
+
+def _init_worker(agents, pooled=False):
+    global _worker_agents
+    if pooled:
+        # Pool workers are daemons, which may not start processes of their own
+        for agent in agents.values():
+            if getattr(agent, "workers", 1) != 1:
+                agent.workers = 1
+    _worker_agents = agents
+
+
+def _play(job):
+    game_id, seats, seed = job
+    result = play_game([_worker_agents[name] for name in seats], seed=seed)
+    result["id"] = game_id
+    result["seats"] = list(seats)
+    return result
+
+
+def _read_log(path):
+    """Finished games plus the byte length of the intact part of the log."""
+    results = []
+    good = 0
+    if not os.path.exists(path):
+        return results, good
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+            good += len(line)
+    return results, good
+
+
+def load_results(path):
+    """Read finished games; a torn last line from a crash is ignored."""
+    return _read_log(path)[0]
+
+
+class Tournament:
+    """
+    Plays agents against each other across a process pool.
+
+    agents: {name: Agent}, each must be picklable; with more than one
+            worker, agents that search on several processes use one each
+    path: JSON-lines results file; games already in it are skipped, so a
+          tournament killed half-way resumes where it stopped
+    """
+
+    def __init__(self, agents, path, seed=0, workers=None, games_per_pair=2):
+        self.agents = agents
+        self.names = list(agents)
+        self.path = path
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.games_per_pair = games_per_pair
+        self.results, good = _read_log(path)
+        # Cut a torn trailing line so new results append cleanly
+        if os.path.exists(path) and os.path.getsize(path) != good:
+            os.truncate(path, good)
+
+    def run_round_robin(self):
+        return self._run(round_robin(self.names, self.games_per_pair))
+
+    def run_swiss(self, rounds):
+        for round_no in range(rounds):
+            self._run(swiss_round(self.names, self.results, round_no, self.games_per_pair))
+        return self.results
+
+    def _run(self, pairings):
+        done = {result["id"] for result in self.results}
+        jobs = [
+            (game_id, seats, game_seed(self.seed, game_id))
+            for game_id, seats in pairings if game_id not in done
+        ]
+        if not jobs:
+            return self.results
+
+        with open(self.path, "a") as out:
+            if self.workers == 1:
+                _init_worker(self.agents)
+                finished = map(_play, jobs)
+                self._stream(finished, out)
+            else:
+                with multiprocessing.Pool(self.workers, _init_worker, (self.agents, True)) as pool:
+                    chunk = max(1, len(jobs) // (self.workers * 8))
+                    self._stream(pool.imap_unordered(_play, jobs, chunksize=chunk), out)
+        return self.results
+
+    def _stream(self, finished, out):
+        for result in finished:
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            self.results.append(result)
+
+    def standings(self):
+        """Elo and Glicko ratings, best first, each with a 95% interval."""
+        elo = elo_ratings(self.results, self.names)
+        glicko = glicko_ratings(self.results, self.names)
+        table = [
+            {"name": name, "elo": elo[name][0], "elo_ci": elo[name][1],
+             "glicko": glicko[name][0], "glicko_ci": glicko[name][1]}
+            for name in self.names
+        ]
+        return sorted(table, key=lambda row: -row["elo"])
+
+
+# ----------------------------
+# Ratings
+# ----------------------------
+def pairwise_outcomes(result):
+    """(a, b, score of a) for every pair of seats in one game."""
+    seats, scores = result["seats"], result["scores"]
+    for i in range(len(seats)):
+        for j in range(i + 1, len(seats)):
+            if scores[i] > scores[j]:
+                score = 1.0
+            elif scores[i] < scores[j]:
+                score = 0.0
+            else:
+                score = 0.5
+            yield seats[i], seats[j], score
+
+
+def _elo_pass(games, names):
+    ratings = {name: float(ELO_START) for name in names}
+    for a, b, score in games:
+        expected = 1 / (1 + 10 ** ((ratings[b] - ratings[a]) / 400))
+        ratings[a] += ELO_K * (score - expected)
+        ratings[b] -= ELO_K * (score - expected)
+    return ratings
+
+
+def elo_ratings(results, names, resamples=200, seed=0):
+    """
+    Sequential Elo in game-id order (so ratings do not depend on which worker
+    finished first). The interval comes from bootstrap-resampling the games.
+    Returns {name: (rating, half-width of the 95% interval)}.
+    """
+    games = [g for r in sorted(results, key=lambda r: r["id"]) for g in pairwise_outcomes(r)]
+    ratings = _elo_pass(games, names)
+    rng = random.Random(seed)
+    samples = {name: [] for name in names}
+    for _ in range(resamples if games else 0):
+        resampled = _elo_pass([rng.choice(games) for _ in games], names)
+        for name in names:
+            samples[name].append(resampled[name])
+
+    intervals = {}
+    for name in names:
+        values = sorted(samples[name])
+        if values:
+            lo = values[int(0.025 * (len(values) - 1))]
+            hi = values[int(0.975 * (len(values) - 1))]
+            intervals[name] = (ratings[name], (hi - lo) / 2)
+        else:
+            intervals[name] = (ratings[name], float("inf"))
+    return intervals
+
+
+def glicko_ratings(results, names, period=50):
+    """
+    Glicko-1, taking games in id order in rating periods of ``period`` games.
+    Returns {name: (rating, 1.96 * rating deviation)}.
+    """
+    ratings = {name: (float(ELO_START), float(GLICKO_START_RD)) for name in names}
+    ordered = sorted(results, key=lambda r: r["id"])
+
+    def g(rd):
+        return 1 / math.sqrt(1 + 3 * GLICKO_Q ** 2 * rd ** 2 / math.pi ** 2)
+
+    for start in range(0, len(ordered), period):
+        games = {name: [] for name in names}
+        for result in ordered[start:start + period]:
+            for a, b, score in pairwise_outcomes(result):
+                games[a].append((b, score))
+                games[b].append((a, 1 - score))
+
+        updated = dict(ratings)
+        for name, played in games.items():
+            if not played:
+                continue
+            r, rd = ratings[name]
+            d_inv = 0.0
+            delta = 0.0
+            for opponent, score in played:
+                r_j, rd_j = ratings[opponent]
+                g_j = g(rd_j)
+                expected = 1 / (1 + 10 ** (-g_j * (r - r_j) / 400))
+                d_inv += GLICKO_Q ** 2 * g_j ** 2 * expected * (1 - expected)
+                delta += g_j * (score - expected)
+            denom = 1 / rd ** 2 + d_inv
+            updated[name] = (r + GLICKO_Q / denom * delta, math.sqrt(1 / denom))
+        ratings = updated
+
+    return {name: (r, 1.96 * rd) for name, (r, rd) in ratings.items()}
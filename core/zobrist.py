@@ -0,0 +1,116 @@
+# core/zobrist.py
+import random
+
+from core.tile import TILE_COLORS, TILES_PER_COLOR
+
+MAX_PLAYERS = 4
+MAX_FACTORIES = 1 + 2 * MAX_PLAYERS
+SIZE = 5
+FLOOR_CAPACITY = 7
+SCORE_KEYS = 512
+
+# Fixed seed so hashes are stable across runs and processes
+_rng = random.Random(0xA2017)
+
+
+def _key():
+    return _rng.getrandbits(64)
+
+
+def _counts(n):
+    """Keys for count 0..n-1; count 0 hashes to nothing."""
+    return [0] + [_key() for _ in range(n - 1)]
+
+
+# FACTORY[factory][color][count]
+FACTORY = [[_counts(5) for _ in range(SIZE + 1)] for _ in range(MAX_FACTORIES)]
+# MIDDLE[color][count]
+MIDDLE = [_counts(TILES_PER_COLOR + 1) for _ in range(SIZE + 1)]
+FIRST_IN_MIDDLE = _key()
+BAG = [_counts(TILES_PER_COLOR + 1) for _ in range(SIZE + 1)]
+DISCARD = [_counts(TILES_PER_COLOR + 1) for _ in range(SIZE + 1)]
+
+# Per player: ROW[player][row][color][count], WALL[player][bit], ...
+ROW = [[[_counts(SIZE + 1) for _ in range(SIZE + 1)] for _ in range(SIZE)] for _ in range(MAX_PLAYERS)]
+WALL = [[_key() for _ in range(SIZE * SIZE)] for _ in range(MAX_PLAYERS)]
+FLOOR = [_counts(FLOOR_CAPACITY + 1) for _ in range(MAX_PLAYERS)]
+SCORE = [_counts(SCORE_KEYS) for _ in range(MAX_PLAYERS)]
+TURN = [_key() for _ in range(MAX_PLAYERS)]
+FIRST_NEXT = [_key() for _ in range(MAX_PLAYERS)]
+
+
+def board_hash(p, board):
+    h = FLOOR[p][len(board.floor)] ^ SCORE[p][board.score % SCORE_KEYS]
+    for r, row in enumerate(board.rows):
+        if row:
+            h ^= ROW[p][r][row[0]][len(row)]
+    wall = board.wall_mask
+    keys = WALL[p]
+    bit = 0
+    while wall:
+        if wall & 1:
+            h ^= keys[bit]
+        wall >>= 1
+        bit += 1
+    return h
+
+
+def compute_hash(game):
+    """Hash a whole AzulGame position from scratch."""
+    h = TURN[game.current_player] ^ FIRST_NEXT[game.first_player_next]
+    if not game.middle.tile_first_taken:
+        h ^= FIRST_IN_MIDDLE
+    for i, factory in enumerate(game.factories):
+        for color in TILE_COLORS:
+            h ^= FACTORY[i][color][factory.counts[color]]
+    for color in TILE_COLORS:
+        h ^= MIDDLE[color][game.middle.counts[color]]
+        h ^= BAG[color][game.bag[color]] ^ DISCARD[color][game.discard[color]]
+    for p, player in enumerate(game.players):
+        h ^= board_hash(p, player.board)
+    return h
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search results keyed by Zobrist hash.
+
+    Each hash maps to one slot (hash & mask). A slot is overwritten when it is
+    empty, holds the same position, was stored during an earlier search, or
+    was searched no deeper than the new result (depth-preferred replacement).
+    """
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    def __init__(self, size_bits=16):
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        self.slots = [None] * self.size
+        self.generation = 0
+        self.hits = 0
+        self.probes = 0
+
+    def new_search(self):
+        """Age existing entries so the next search may overwrite them."""
+        self.generation += 1
+
+    def probe(self, key):
+        self.probes += 1
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag=EXACT, move=None):
+        idx = key & self.mask
+        entry = self.slots[idx]
+        if (entry is None or entry[0] == key or entry[5] != self.generation
+                or entry[1] <= depth):
+            self.slots[idx] = (key, depth, value, flag, move, self.generation)
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.hits = self.probes = 0
+
+    def __len__(self):
+        return sum(1 for entry in self.slots if entry is not None)
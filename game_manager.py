@@ -1,28 +1,42 @@
+import os
 import pygame
 import sys
+import time
 
 from core.player import Player
 from ui.renderer import Renderer
 from ui.assets_manager import AssetManager
 
+from core.agents import GreedyAgent
+from core.ai_worker import AIWorker
 from core.game_logic import AzulGame
+from core.mcts import MCTSAgent
+from core.profiler import PROFILER
+from core.replay import ReplayRecorder
 
 # Game settings
 WIDTH, HEIGHT = 2200, 900
 FPS = 60
 DEBUG_MAX_PLAYERS = 3
+DEBUG_BOT_SEATS = 0  # last N seats are played by the computer
+BOT_TIME_BUDGET = 1.0  # seconds per bot move
+IDLE_WAIT_MS = 1000  # longest the loop sleeps on the event queue when idle
+ASSET_CACHE_DIR = "ui/assets/.cache"  # preprocessed texture atlas
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, record_path=None):
+        self.started = time.perf_counter()
+        self.startup_time = None
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Azul (Prototype)")
         self.clock = pygame.time.Clock()
         self.running = True
-        self.assets = AssetManager()
+        self.assets = AssetManager(cache_dir=ASSET_CACHE_DIR)
         
         self.last_click_time = 0
         self.click_delay = 150  
+        self.hovering = False
 
         # Players
         self.players = [
@@ -32,8 +46,20 @@ class GameManager:
             Player("Twój Stary"),
         ]
         self.players = self.players[:DEBUG_MAX_PLAYERS]
+        for player in self.players[len(self.players) - DEBUG_BOT_SEATS:]:
+            # The UI keeps one core; the bot's search gets the rest
+            player.agent = MCTSAgent(time_budget=BOT_TIME_BUDGET,
+                                     workers=max(1, (os.cpu_count() or 1) - 1))
 
         self.game_logic = AzulGame(self.players)
+        self.game_logic.start_round()
+        # Bots think in a background process, started on the first bot turn
+        self.ai = None
+        self.ai_version = None  # game version the running search started from
+        self.recorder = None
+        if record_path:
+            self.recorder = ReplayRecorder(record_path)
+            self.recorder.attach(self.game_logic)
         self.renderer = Renderer(self.screen, self.assets, self.game_logic)
         
 
@@ -66,65 +92,158 @@ class GameManager:
 
     def handle_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            self.handle_event(event)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.renderer.invalidate()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
                 self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                current_time = pygame.time.get_ticks()
-                if current_time - self.last_click_time < self.click_delay:
-                    # Ignore rapid clicks
-                    continue
-                self.last_click_time = current_time
-
-                pos = event.pos
-                undo_rect = self.renderer.button_renderer.get_button_rect('undo')
-                if undo_rect and undo_rect.collidepoint(pos):
-                    if self.game_logic.selected_tiles:
-                        self.game_logic.undo_selection()
-                        continue
-                for rect, (origin, factory_idx, color) in self.renderer.factory_renderer.tile_click_map:
-                    if rect.collidepoint(pos):
-                        if origin == "factory":
-                            chosen = self.game_logic.player_select_from_factory(factory_idx, color)
-                            for t in chosen:
-                                t.origin = "factory"
-                                t.factory_idx = factory_idx
-                        elif origin == "middle":
-                            chosen = self.game_logic.player_select_from_middle(color)
-                            for t in chosen:
-                                t.origin = "middle"
-                        continue
+            elif event.key == pygame.K_F3:
+                self.renderer.profile_overlay.toggle()
+            elif event.key == pygame.K_F4:
+                self.export_trace()
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            current_time = pygame.time.get_ticks()
+            if current_time - self.last_click_time < self.click_delay:
+                # Ignore rapid clicks
+                return
+            self.last_click_time = current_time
+
+            self.handle_click(self.renderer.hit_test(event.pos))
+        elif event.type == pygame.MOUSEMOTION:
+            self.handle_hover(self.renderer.hit_test(event.pos))
+
+    def handle_click(self, target):
+        game = self.game_logic
+        if target is None or game.game_over or game.players[game.current_player].is_bot:
+            return
+        kind, index, color = target
+        if kind == "button" and index == "undo":
+            if game.selected_tiles:
+                with PROFILER.section("logic.undo_selection"):
+                    game.undo_selection()
+        elif kind == "row":
+            # index is the board owner's player number
+            if game.selected_tiles and index == game.players[game.current_player].number:
+                if any(move["row"] == color for move in game.possible_moves()):
+                    with PROFILER.section("logic.place_selection"):
+                        game.place_selection(color)
+        elif game.selected_tiles:
+            # Already holding tiles: place or undo them first
+            return
+        elif kind == "factory":
+            with PROFILER.section("logic.select"):
+                chosen = game.player_select_from_factory(index, color)
+            for t in chosen:
+                t.origin = "factory"
+                t.factory_idx = index
+        elif kind == "middle":
+            with PROFILER.section("logic.select"):
+                chosen = game.player_select_from_middle(color)
+            for t in chosen:
+                t.origin = "middle"
+
+    def handle_hover(self, target):
+        """Show a hand cursor over anything clickable."""
+        hovering = target is not None
+        if hovering != self.hovering:
+            self.hovering = hovering
+            cursor = pygame.SYSTEM_CURSOR_HAND if hovering else pygame.SYSTEM_CURSOR_ARROW
+            pygame.mouse.set_cursor(cursor)
 
 
     def update(self, dt):
         """Update game state each frame."""
-        
-        # TODO: Add Azul-specific game logic here
-        pass
+        self.renderer.animate(dt)
+        game = self.game_logic
+        if game.game_over or game.is_selection():
+            return
+
+        player = game.players[game.current_player]
+        if not player.is_bot:
+            return
+        if self.ai is None:
+            self.ai = AIWorker()
+        try:
+            with PROFILER.section("logic.ai_poll"):
+                move = self.ai.poll()
+        except RuntimeError as e:
+            # A failed search or a dead worker must not take the window down
+            print(f"{player.name}: {e}; playing a greedy move instead", file=sys.stderr)
+            if not self.ai.process.is_alive():
+                self.ai.close()
+                self.ai = None  # a fresh worker starts on the next bot turn
+            move = GreedyAgent().choose_move(game)
+            self.ai_version = game.version
+        if move is not None and self.ai_version == game.version:
+            with PROFILER.section("logic.apply_move"):
+                game.apply_move(move)
+        elif not self.ai.busy or self.ai_version != game.version:
+            # Nothing running, or the position changed under it (undo): start over
+            self.ai_version = game.version
+            self.ai.submit(player.number, player.agent, game)
 
     def draw(self):
-        self.renderer.draw()
-        
-        pygame.display.flip()
+        dirty = self.renderer.draw()
+        if dirty:
+            pygame.display.update(dirty)
+
+    def export_trace(self):
+        """Write the profiled sections so far as a Chrome trace (F4)."""
+        path = time.strftime("trace-%Y%m%d-%H%M%S.json")
+        count = PROFILER.export_trace(path)
+        print(f"Wrote {count} trace events to {path}")
+
+    def first_frame_done(self):
+        """Report cold-start time, then cache what startup had to decode."""
+        self.startup_time = time.perf_counter() - self.started
+        source = "decoded" if self.assets.misses else "atlas"
+        print(f"First frame after {self.startup_time * 1e3:.0f} ms ({source})")
+        self.assets.save_atlas()
+
+    def is_idle(self):
+        """Nothing will change until the player does something."""
+        game = self.game_logic
+        bot_turn = (not game.game_over and not game.is_selection()
+                    and game.players[game.current_player].is_bot)
+        thinking = self.ai is not None and self.ai.busy
+        return not bot_turn and not thinking and not self.renderer.needs_frames()
+
+    def wait_for_input(self):
+        """Block on the event queue instead of rendering frames that show nothing new."""
+        event = pygame.event.wait(IDLE_WAIT_MS)
+        if event.type != pygame.NOEVENT:
+            self.handle_event(event)
+        # The wait is not frame time
+        self.clock.tick()
 
     def run(self):
         """Main game loop."""
         while self.running:
-            if self.game_logic.is_empty():
-                self.game_logic.fill_factories()
-                
-            
-                
             dt = self.clock.tick(FPS) / 1000.0  # Delta time in seconds
-            self.handle_events()
-            self.update(dt)
-            self.draw()
+            with PROFILER.section("frame"):
+                with PROFILER.section("handle_events"):
+                    self.handle_events()
+                with PROFILER.section("update"):
+                    self.update(dt)
+                with PROFILER.section("draw"):
+                    self.draw()
+            if self.startup_time is None:
+                self.first_frame_done()
+            if self.running and self.is_idle():
+                self.wait_for_input()
 
         self.quit()
 
     def quit(self):
+        if self.recorder is not None:
+            self.recorder.detach(self.game_logic)
+        if self.ai is not None:
+            self.ai.close()
         pygame.quit()
         sys.exit()
 
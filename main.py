@@ -0,0 +1,490 @@
+import argparse
+import importlib
+import os
+import sys
+import time
+
+# Agents by name, as "module:class". Modules are imported on first use, so
+# starting the CLI costs only argparse; pygame and ui load for `gui` alone.
+AGENT_TYPES = {
+    "random": "core.agents:RandomAgent",
+    "greedy": "core.agents:GreedyAgent",
+    "mcts": "core.mcts:MCTSAgent",
+    "alphabeta": "core.search:AlphaBetaAgent",
+}
+COLOR_NAMES = {-1: "first", 1: "cyan", 2: "red", 3: "blue", 4: "yellow", 5: "black"}
+COLOR_MARKS = {1: "c", 2: "r", 3: "b", 4: "y", 5: "k"}
+# Imports timed by `startup`: the CLI itself, the game engine, the windowed game
+STARTUP_MODULES = ("main", "core.game_logic", "game_manager")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play Azul games headless; only `gui` loads pygame.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    simulate = commands.add_parser("simulate", help="play a batch of games between agents")
+    simulate.add_argument("agents", nargs="*", default=["greedy", "random"],
+                          help=f"one agent per seat (2-4), from: {', '.join(sorted(AGENT_TYPES))}")
+    simulate.add_argument("-n", "--games", type=int, default=100)
+    simulate.add_argument("-s", "--seed", type=int, default=None)
+    add_search_args(simulate)
+
+    tournament = commands.add_parser("tournament", help="rate agents against each other")
+    tournament.add_argument("agents", nargs="+", help="entrants, each a different agent type")
+    tournament.add_argument("-o", "--out", default="tournament.jsonl",
+                            help="results file; run again with the same file to resume")
+    tournament.add_argument("-g", "--games-per-pair", type=int, default=10)
+    tournament.add_argument("--swiss", type=int, default=0, metavar="ROUNDS",
+                            help="play ROUNDS Swiss rounds instead of a round robin")
+    tournament.add_argument("-s", "--seed", type=int, default=0)
+    tournament.add_argument("-p", "--processes", type=int, default=0,
+                            help="games played in parallel (0 = all cores)")
+    add_search_args(tournament)
+
+    play = commands.add_parser("play", help="play one game and print every move")
+    play.add_argument("agents", nargs="*", default=["greedy", "random"],
+                      help="one agent per seat (2-4)")
+    play.add_argument("-s", "--seed", type=int, default=None)
+    add_search_args(play)
+
+    analyze = commands.add_parser("analyze", help="rank a position's moves with MCTS, "
+                                                  "or solve it exactly near the end")
+    analyze.add_argument("-p", "--players", type=int, choices=(2, 3, 4), default=2)
+    analyze.add_argument("-s", "--seed", type=int, default=0)
+    analyze.add_argument("-n", "--turns", type=int, default=0,
+                         help="greedy moves to play first (default: the opening)")
+    analyze.add_argument("-b", "--budget", type=float, default=2.0, help="seconds of search")
+    analyze.add_argument("-t", "--top", type=int, default=10, help="moves to list")
+    analyze.add_argument("-e", "--endgame-tiles", type=int, default=None,
+                         help="solve final rounds with at most this many tiles left "
+                              "(default: by player count, 0 = never)")
+
+    gui = commands.add_parser("gui", help="open the game window (imports pygame)")
+    gui.add_argument("-r", "--record", metavar="FILE", help="log the game for replay")
+
+    replay = commands.add_parser("replay", help="show a recorded game, move by move or in a window")
+    replay.add_argument("file")
+    replay.add_argument("-t", "--turn", type=int, default=None, help="print the position at this turn")
+    replay.add_argument("-g", "--game", type=int, default=-1,
+                        help="which game in the file, from 0 (default: the last)")
+    replay.add_argument("--gui", action="store_true", help="open the replay viewer (imports pygame)")
+
+    snap = commands.add_parser("snapshot", help="benchmark binary snapshots and deltas over random games")
+    snap.add_argument("-n", "--games", type=int, default=100)
+    snap.add_argument("-p", "--players", type=int, choices=(2, 3, 4), default=2)
+    snap.add_argument("-s", "--seed", type=int, default=0)
+
+    evaluate = commands.add_parser("evaluate", help="benchmark the static evaluator over greedy games")
+    evaluate.add_argument("-n", "--games", type=int, default=100)
+    evaluate.add_argument("-p", "--players", type=int, choices=(2, 3, 4), default=2)
+    evaluate.add_argument("-s", "--seed", type=int, default=0)
+    evaluate.add_argument("--fit", action="store_true",
+                          help="also fit the weights to the boards' final scores")
+
+    serve = commands.add_parser("serve", help="host tables for network clients (JSON lines over TCP)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--max-tables", type=int, default=10000)
+
+    loadtest = commands.add_parser("loadtest", help="random bots playing many tables on a local server")
+    loadtest.add_argument("-t", "--tables", type=int, default=1000)
+    loadtest.add_argument("-p", "--players", type=int, choices=(2, 3, 4), default=2)
+    loadtest.add_argument("-c", "--clients", type=int, default=4, help="bot connections")
+    loadtest.add_argument("-s", "--seed", type=int, default=0)
+
+    startup = commands.add_parser("startup", help="time a cold import of the CLI, engine and UI")
+    startup.add_argument("-r", "--repeat", type=int, default=5)
+
+    batch = commands.add_parser("batch", help="random games in lockstep on NumPy arrays (needs numpy)")
+    batch.add_argument("-n", "--games", type=int, default=10000)
+    batch.add_argument("-p", "--players", type=int, choices=(2, 3, 4), default=2)
+    batch.add_argument("-s", "--seed", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if not hasattr(args, "agents"):
+        return args
+    if args.command in ("simulate", "play") and not 2 <= len(args.agents) <= 4:
+        parser.error("Azul needs 2-4 players")
+    if args.command == "tournament" and (len(args.agents) < 2
+                                         or len(set(args.agents)) != len(args.agents)):
+        parser.error("a tournament needs at least 2 different agents")
+    if args.command == "tournament" and args.workers != 1 and args.processes != 1:
+        parser.error("search workers (-w) need the games played one at a time (-p 1)")
+    for name in args.agents:
+        if name not in AGENT_TYPES:
+            parser.error(f"unknown agent {name!r}")
+    return args
+
+
+def add_search_args(parser):
+    parser.add_argument("-b", "--budget", type=float, default=0.1,
+                        help="seconds per move for search agents")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="processes per search agent (0 = all cores)")
+
+
+def agent_class(name):
+    module, cls = AGENT_TYPES[name].split(":")
+    return getattr(importlib.import_module(module), cls)
+
+
+def make_agents(args):
+    agents = [agent_class(name)() for name in args.agents]
+    for agent in agents:
+        if hasattr(agent, "time_budget"):
+            agent.time_budget = args.budget
+        if hasattr(agent, "workers"):
+            agent.workers = args.workers or os.cpu_count() or 1
+    return agents
+
+
+def simulate(args):
+    from core.simulation import run_games
+
+    agents = make_agents(args)
+    try:
+        results, elapsed = run_games(agents, args.games, seed=args.seed)
+    finally:
+        for agent in agents:
+            if hasattr(agent, "close"):
+                agent.close()
+
+    wins = [0] * len(agents)
+    totals = [0] * len(agents)
+    for result in results:
+        for i in result["winners"]:
+            wins[i] += 1
+        for i, score in enumerate(result["scores"]):
+            totals[i] += score
+
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.1f} games/s)")
+    for i, name in enumerate(args.agents):
+        print(f"  seat {i} {name:<8} wins {wins[i]:>5}  avg score {totals[i] / args.games:.1f}")
+        stats = getattr(agents[i], "last_stats", None)
+        if stats:
+            print(f"    {format_stats(stats)}")
+
+
+def tournament(args):
+    from core.tournament import Tournament
+
+    agents = dict(zip(args.agents, make_agents(args)))
+    event = Tournament(agents, args.out, seed=args.seed, workers=args.processes,
+                       games_per_pair=args.games_per_pair)
+    resumed = len(event.results)
+    start = time.perf_counter()
+    if args.swiss:
+        event.run_swiss(args.swiss)
+    else:
+        event.run_round_robin()
+    elapsed = time.perf_counter() - start
+    played = len(event.results) - resumed
+
+    rate = played / elapsed * 3600 if elapsed else 0.0
+    print(f"{played} games in {elapsed:.2f}s ({rate:.0f} games/h), {resumed} resumed from {args.out}")
+    for row in event.standings():
+        print(f"  {row['name']:<10} Elo {row['elo']:7.1f} ± {row['elo_ci']:5.1f}   "
+              f"Glicko {row['glicko']:7.1f} ± {row['glicko_ci']:5.1f}")
+
+
+def batch(args):
+    from core.batch import BatchGame
+
+    games = BatchGame(args.games, args.players, seed=args.seed)
+    start = time.perf_counter()
+    games.start_round()
+    scores = games.play_out()
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.games} random games, {games.turns} turns in {elapsed:.2f}s "
+          f"({games.turns / elapsed:.0f} turns/s), {games.round.mean():.1f} rounds on average")
+    best = scores.max(axis=1, keepdims=True)
+    for seat in range(args.players):
+        wins = (scores[:, seat:seat + 1] == best).mean()
+        print(f"  seat {seat}  wins {wins:6.1%}  avg score {scores[:, seat].mean():.1f}")
+
+
+def describe_move(move):
+    source, color, row = move
+    where = "middle" if source == -1 else f"factory {source}"
+    to = "floor" if row == -1 else f"row {row + 1}"
+    return f"{COLOR_NAMES[color]} from {where} to {to}"
+
+
+def play(args):
+    from core.game_logic import AzulGame
+    from core.player import Player
+
+    agents = make_agents(args)
+    players = [Player(f"{name}-{i}", agent=agent) for i, (name, agent) in enumerate(zip(args.agents, agents))]
+    for i, agent in enumerate(agents):
+        if hasattr(agent, "seed"):
+            agent.seed(None if args.seed is None else f"{args.seed}:{i}")
+    game = AzulGame(players, seed=args.seed)
+    game.start_round()
+    try:
+        while not game.game_over:
+            round_no = game.round
+            player = game.players[game.current_player]
+            move = player.agent.choose_move(game)
+            print(f"round {round_no}  {player.name:<12} {describe_move(move)}")
+            game.apply_move(move)
+            if game.round != round_no or game.game_over:
+                scores = ", ".join(f"{p.name} {p.board.score}" for p in game.players)
+                print(f"  after round {round_no}: {scores}")
+    finally:
+        for agent in agents:
+            if hasattr(agent, "close"):
+                agent.close()
+    best = max(game.scores())
+    winners = [p.name for p in players if p.board.score == best]
+    print(f"winner: {', '.join(winners)} with {best}")
+
+
+def analyze(args):
+    from core.agents import GreedyAgent
+    from core.endgame import EndgameSolver, should_solve
+    from core.game_logic import AzulGame, decode_move
+    from core.mcts import search
+    from core.player import Player
+
+    game = AzulGame([Player(f"P{i}") for i in range(args.players)], seed=args.seed)
+    game.start_round()
+    greedy = GreedyAgent(args.seed)
+    for _ in range(args.turns):
+        if game.game_over:
+            break
+        game.apply_move(greedy.choose_move(game))
+    if game.game_over:
+        print(f"game over after {args.turns} moves: {game.scores()}")
+        return
+    mover = game.players[game.current_player].name
+    print(f"round {game.round}, {mover} to move")
+
+    if args.endgame_tiles != 0 and should_solve(game, args.endgame_tiles):
+        solution = EndgameSolver().solve(game)
+        outcome = "final" if solution.exact else "end-of-round"
+        scores = ", ".join(f"{p.name} {s}" for p, s in zip(game.players, solution.scores))
+        print(f"solved in {solution.elapsed:.2f}s ({solution.nodes} positions): "
+              f"{mover} {solution.margin:+d}, {outcome} scores {scores}")
+        for action in solution.line:
+            player = game.players[game.current_player].name
+            print(f"  {player:<4} {describe_move(decode_move(action))}")
+            game.apply_action(action, deal=False)
+        return
+
+    visits, playouts, elapsed = search(game, args.budget, seed=args.seed)
+    total = sum(visits.values()) or 1
+    print(f"{playouts} playouts in {elapsed:.2f}s, {len(game.legal_actions())} legal moves")
+    ranked = sorted(visits.items(), key=lambda item: -item[1])[:args.top]
+    for action, n in ranked:
+        print(f"  {n / total:6.1%}  {describe_move(decode_move(action))}")
+
+
+def gui(args):
+    from game_manager import GameManager
+
+    GameManager(record_path=args.record).run()
+
+
+def replay(args):
+    if args.gui:
+        from ui.replay_viewer import ReplayViewer
+
+        ReplayViewer(args.file, turn=args.turn or 0, game=args.game).run()
+        return
+
+    from core.replay import Replay
+
+    log = Replay(args.file, args.game)
+    print(f"game {log.index + 1} of {log.games}: {len(log)} moves by {', '.join(log.names)}, "
+          f"keyframes at turns {log.keyframe_turns}")
+    if args.turn is None:
+        for turn, move in enumerate(log.moves):
+            game = log.seek(turn)
+            print(f"{turn:4d}  round {game.round}  {game.players[game.current_player].name:<12} "
+                  f"{describe_move(move)}")
+        game = log.seek(len(log))
+    else:
+        game = log.seek(args.turn)
+        print(f"turn {log.turn}, round {game.round}, {game.players[game.current_player].name} to move")
+    for player in game.players:
+        board = player.board
+        rows = " ".join(COLOR_MARKS[row[0]] * len(row) if row else "." for row in board.rows)
+        print(f"  {player.name:<12} score {board.score:3d}  rows {rows}  floor {len(board.floor)}")
+
+
+def snapshot_bench(args):
+    import pickle
+    from core.agents import RandomAgent
+    from core.game_logic import AzulGame
+    from core.player import Player
+    from core.snapshot import apply_delta, delta, restore, snapshot
+
+    positions, pairs = [], []
+    for g in range(args.games):
+        agent = RandomAgent(args.seed + g)
+        game = AzulGame([Player(f"P{i}") for i in range(args.players)], seed=args.seed + g)
+        game.start_round()
+        first = len(positions)
+        positions.append(game.copy(record=False))
+        while not game.game_over:
+            game.apply_move(agent.choose_move(game))
+            positions.append(game.copy(record=False))
+        pairs.extend((i, i + 1) for i in range(first, len(positions) - 1))
+
+    start = time.perf_counter()
+    snapshots = [snapshot(game) for game in positions]
+    packed = time.perf_counter() - start
+    start = time.perf_counter()
+    for data in snapshots:
+        restore(data)
+    restored = time.perf_counter() - start
+    pairs = [(snapshots[i], snapshots[j]) for i, j in pairs]
+    start = time.perf_counter()
+    patches = [delta(old, new) for old, new in pairs]
+    diffed = time.perf_counter() - start
+    assert all(apply_delta(old, patch) == new for (old, new), patch in zip(pairs, patches))
+
+    n = len(positions)
+    pickled = sum(len(pickle.dumps(game)) for game in positions[:100]) / min(n, 100)
+    print(f"{n} positions from {args.games} games, {args.players} players")
+    print(f"  snapshot {len(snapshots[0])} bytes, {packed / n * 1e6:.1f} us to pack, "
+          f"{restored / n * 1e6:.1f} us to restore")
+    print(f"  delta    {sum(map(len, patches)) / len(patches):.1f} bytes on average, "
+          f"{diffed / len(pairs) * 1e6:.1f} us each")
+    print(f"  pickle   {pickled:.0f} bytes for comparison")
+
+
+def evaluate_bench(args):
+    import numpy as np
+    from core.agents import GreedyAgent
+    from core.batch import BatchGame
+    from core.evaluation import FEATURES, Evaluator, array_features
+    from core.game_logic import AzulGame
+    from core.player import Player
+
+    positions, finals = [], []
+    for g in range(args.games):
+        agent = GreedyAgent(args.seed + g)
+        game = AzulGame([Player(f"P{i}") for i in range(args.players)], seed=args.seed + g)
+        game.start_round()
+        first = len(positions)
+        while not game.game_over:
+            positions.append(game.copy(record=False))
+            game.apply_move(agent.choose_move(game))
+        finals.extend([game.scores()] * (len(positions) - first))
+
+    evaluator = Evaluator()
+    boards = len(positions) * args.players
+    start = time.perf_counter()
+    scalar = [evaluator.values(game) for game in positions]
+    one_by_one = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = BatchGame.from_games(positions)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    values = evaluator.evaluate_batch(batch)
+    batched = time.perf_counter() - start
+    assert np.allclose(values, scalar)
+
+    print(f"{len(positions)} positions ({boards} boards) from {args.games} greedy games")
+    print(f"  one by one  {boards / one_by_one:10.0f} boards/s")
+    print(f"  batch       {boards / batched:10.0f} boards/s "
+          f"({boards / (loaded + batched):.0f} including BatchGame.from_games)")
+
+    if args.fit:
+        features = array_features(batch.wall, batch.row_color, batch.row_count,
+                                  batch.floor, batch.score).reshape(-1, len(FEATURES))
+        targets = np.array(finals, dtype=np.float64).reshape(-1)
+        fitted = Evaluator.fit(features, targets)
+        for name, candidate in (("default", evaluator), ("fitted", fitted)):
+            error = np.abs(features @ candidate.array - targets).mean()
+            print(f"  {name:<8} mean error {error:5.1f} points against final scores")
+        print("  " + ", ".join(f"{name} {w:.2f}" for name, w in fitted.weights.items()))
+
+
+def serve(args):
+    import asyncio
+    from net.server import GameServer
+
+    server = GameServer(args.host, args.port, max_tables=args.max_tables)
+    print(f"serving on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+def loadtest(args):
+    import asyncio
+    from net.loadtest import load_test
+
+    stats = asyncio.run(load_test(args.tables, args.players, args.clients, args.seed))
+    p50, p95, p99 = stats["move_ms"]
+    print(f"{stats['finished']} tables, {stats['moves']} moves in {stats['elapsed']:.2f}s "
+          f"({stats['moves_per_sec']:.0f} moves/s)")
+    print(f"  move latency p50 {p50:.3f} ms  p95 {p95:.3f} ms  p99 {p99:.3f} ms")
+    print(f"  memory {stats['table_bytes'] / 1024:.1f} KiB per table "
+          f"({stats['tables']} tables in play when sampled)")
+
+
+def time_import(module):
+    """Seconds a fresh interpreter spends importing ``module``, and whether pygame came with it."""
+    import subprocess
+
+    code = ("import sys, time; t = time.perf_counter(); "
+            f"import {module}; print(time.perf_counter() - t, 'pygame' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         check=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                         env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+    seconds, pygame = out.stdout.split()[-2:]
+    return float(seconds), pygame == "True"
+
+
+def startup(args):
+    import statistics
+
+    for module in STARTUP_MODULES:
+        runs = [time_import(module) for _ in range(args.repeat)]
+        median = statistics.median(seconds for seconds, _ in runs)
+        pygame = "with pygame" if runs[0][1] else "no pygame"
+        print(f"  import {module:<16} {median * 1e3:7.1f} ms  ({pygame})")
+
+
+COMMANDS = {
+    "simulate": simulate,
+    "tournament": tournament,
+    "batch": batch,
+    "play": play,
+    "analyze": analyze,
+    "gui": gui,
+    "replay": replay,
+    "snapshot": snapshot_bench,
+    "evaluate": evaluate_bench,
+    "serve": serve,
+    "loadtest": loadtest,
+    "startup": startup,
+}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    COMMANDS[args.command](args)
+
+
+def format_stats(stats):
+    """One line of search statistics from an agent's last move."""
+    if stats.get("endgame"):
+        kind = "exact" if stats["exact"] else "to round end"
+        return (f"endgame solved ({kind}): margin {stats['margin']:+d} "
+                f"after {stats['nodes']} positions")
+    if "playouts_per_sec_per_core" in stats:
+        return (f"{stats['playouts_per_sec_per_core']:.0f} playouts/s per core "
+                f"on {stats['workers']} worker(s)")
+    return (f"{stats['nodes_per_sec']:.0f} nodes/s, depth {stats['depth']}, "
+            f"branching factor {stats['ebf']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
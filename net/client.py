@@ -0,0 +1,118 @@
+# net/client.py
+import asyncio
+import itertools
+import random
+
+from net.protocol import MAX_LINE, ProtocolError, encode, read_message
+
+
+def random_policy(state, rng):
+    return rng.choice(state["legal"])
+
+
+class BotClient:
+    """
+    Scripted player for a GameServer: one connection that can sit at many
+    tables and answers every "your turn" state with ``policy(state, rng)``.
+
+        client = await BotClient(port=server.port).connect()
+        table = await client.create(players=2)
+        await client.join(table)
+        ...
+        scores = await client.finished(table)
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, policy=random_policy, seed=None, name="bot"):
+        self.host = host
+        self.port = port
+        self.policy = policy
+        self.rng = random.Random(seed)
+        self.name = name
+        self.reader = self.writer = None
+        self.task = None
+        self.ids = itertools.count(1)
+        self.replies = {}  # request id -> future of its reply
+        self.results = {}  # table -> future of the final scores
+        self.errors = []
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE)
+        self.task = asyncio.create_task(self.listen())
+        return self
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        if self.task is not None:
+            await self.task
+
+    def send(self, message):
+        self.writer.write(encode(message))
+
+    async def request(self, message):
+        message["id"] = request_id = next(self.ids)
+        future = self.replies[request_id] = asyncio.get_running_loop().create_future()
+        self.send(message)
+        await self.writer.drain()
+        return await future
+
+    async def create(self, players=2, seed=None):
+        reply = await self.request({"op": "create", "players": players, "seed": seed})
+        return reply["table"]
+
+    async def join(self, table):
+        """Take the next free seat at ``table``; returns the seat number."""
+        first_seat = table not in self.results
+        if first_seat:
+            self.results[table] = asyncio.get_running_loop().create_future()
+        try:
+            reply = await self.request({"op": "join", "table": table, "name": self.name})
+        except ProtocolError:
+            if first_seat:
+                self.results.pop(table).cancel()
+            raise
+        return reply["seat"]
+
+    async def stats(self):
+        return await self.request({"op": "stats"})
+
+    async def finished(self, table):
+        """Final scores of ``table``, in seat order."""
+        return await self.results[table]
+
+    async def listen(self):
+        try:
+            while True:
+                message = await read_message(self.reader)
+                if message is None:
+                    break
+                self.receive(message)
+        except (ConnectionError, ProtocolError) as e:
+            self.errors.append(str(e))
+        finally:
+            for future in list(self.replies.values()) + list(self.results.values()):
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed"))
+
+    def receive(self, message):
+        op = message["op"]
+        if op == "state":
+            if message["over"]:
+                result = self.results.get(message["table"])
+                if result is not None and not result.done():
+                    result.set_result([board["score"] for board in message["boards"]])
+            elif "legal" in message:
+                move = self.policy(message, self.rng)
+                self.send({"op": "move", "table": message["table"], "move": move})
+        elif op == "error" and "id" not in message:
+            # A rejected move or an abandoned table: that game is over for us
+            self.errors.append(message["error"])
+            result = self.results.get(message.get("table"))
+            if result is not None and not result.done():
+                result.set_exception(ProtocolError(message["error"]))
+        elif "id" in message:
+            future = self.replies.pop(message["id"])
+            if op == "error":
+                future.set_exception(ProtocolError(message["error"]))
+            else:
+                future.set_result(message)
@@ -0,0 +1,42 @@
+# net/loadtest.py
+import asyncio
+import time
+
+from net.client import BotClient
+from net.server import GameServer
+
+
+async def load_test(tables=1000, players=2, clients=4, seed=0):
+    """
+    Start a server on a free localhost port and have ``clients`` random bots
+    play ``tables`` games at once, seats dealt round-robin over the bots.
+    Returns the server's stats, sampled while every table is in play, plus
+    the wall time and move rate of the whole run.
+    """
+    server = await GameServer(port=0, max_tables=tables).start()
+    bots = [await BotClient(port=server.port, seed=seed + i, name=f"bot{i}").connect()
+            for i in range(clients)]
+    try:
+        start = time.perf_counter()
+        ids = await asyncio.gather(*(bots[t % clients].create(players, seed=seed + t)
+                                     for t in range(tables)))
+        seats = [(bots[(t + s) % clients], table) for t, table in enumerate(ids) for s in range(players)]
+        await asyncio.gather(*(bot.join(table) for bot, table in seats))
+        stats = server.stats()
+
+        await asyncio.gather(*(bots[t % clients].finished(table) for t, table in enumerate(ids)))
+        elapsed = time.perf_counter() - start
+        final = server.stats()
+    finally:
+        for bot in bots:
+            await bot.close()
+        await server.stop()
+
+    stats.update(
+        finished=final["finished"],
+        moves=final["moves"],
+        move_ms=final["move_ms"],
+        elapsed=elapsed,
+        moves_per_sec=final["moves"] / elapsed if elapsed else 0.0,
+    )
+    return stats
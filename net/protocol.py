@@ -0,0 +1,58 @@
+# net/protocol.py
+"""
+Newline-delimited JSON messages, one object per line, each with an "op".
+
+Client to server:
+    {"op": "create", "players": 2, "seed": null}  -> {"op": "created", "table": id}
+    {"op": "join", "table": id, "name": "..."}     -> {"op": "joined", "table": id, "seat": n}
+    {"op": "move", "table": id, "move": [source, color, row]}
+    {"op": "stats"}                                -> {"op": "stats", ...}
+
+Server to client:
+    {"op": "state", "table": id, "seat": n, "turn": n, ...} after every change
+    {"op": "error", "table": id, "error": "..."} for a rejected request
+
+A seed is null, an integer or a string; table ids are integers. A
+request may carry an "id", which its reply (or error) echoes back.
+Seats are numbered in join order. A connection may sit at any number of
+seats, at any number of tables. A table nobody has sat down at goes away
+when the connection that created it closes.
+"""
+import json
+
+MAX_LINE = 1 << 16
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(line):
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        raise ProtocolError(f"bad JSON: {e}") from None
+    if not isinstance(message, dict) or "op" not in message:
+        raise ProtocolError("a message must be an object with an 'op'")
+    return message
+
+
+async def read_message(reader):
+    """Next message from ``reader``, or None once the peer has closed."""
+    line = await reader.readline()
+    if not line:
+        return None
+    return decode(line)
+
+
+def board_state(board):
+    return {
+        "rows": [list(row) for row in board.rows],
+        "floor": list(board.floor),
+        "wall": board.wall_mask,
+        "score": board.score,
+    }
@@ -0,0 +1,290 @@
+# net/server.py
+import asyncio
+import gc
+import itertools
+import sys
+import time
+import types
+
+from core.game_logic import AzulGame
+from core.player import Player
+from core.profiler import Profiler
+from net.protocol import MAX_LINE, ProtocolError, board_state, encode, read_message
+
+MAX_TABLES = 10000
+MEMORY_SAMPLE = 20  # tables measured when reporting memory per table
+
+
+class Table:
+    """One game and the connections sitting at it, in join order."""
+
+    def __init__(self, table_id, players, seed=None, owner=None):
+        self.id = table_id
+        self.owner = owner  # Connection that created it, until the table fills
+        self.seats = [None] * players  # Connection per seat
+        self.names = [None] * players
+        self.seed = seed
+        self.game = None
+        self.order = None  # game seat -> join seat (AzulGame shuffles players)
+
+    @property
+    def full(self):
+        return None not in self.seats
+
+    def join(self, connection, name):
+        seat = self.seats.index(None)
+        self.seats[seat] = connection
+        self.names[seat] = name
+        if self.full:
+            players = [Player(name) for name in self.names]
+            self.game = AzulGame(list(players), seed=self.seed)
+            self.game.record = False  # nothing is ever undone here
+            self.order = [players.index(p) for p in self.game.players]
+            self.game.start_round()
+        return seat
+
+    @property
+    def turn(self):
+        return self.order[self.game.current_player]
+
+    def state(self):
+        """What every seat is told after a change; broadcast() personalises it."""
+        game = self.game
+        boards = [None] * len(self.seats)
+        for player, join_seat in zip(game.players, self.order):
+            boards[join_seat] = board_state(player.board)
+        return {
+            "op": "state",
+            "table": self.id,
+            "turn": self.turn,
+            "round": game.round,
+            "version": game.version,
+            "factories": [f.counts[1:] for f in game.factories],
+            "middle": game.middle.counts[1:],
+            "first_taken": game.middle.tile_first_taken,
+            "boards": boards,
+            "over": game.game_over,
+        }
+
+
+class Connection:
+    __slots__ = ("writer", "seats", "created")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.seats = set()  # (table id, seat)
+        self.created = set()  # ids of tables it created that have not filled yet
+
+    def send(self, message):
+        self.writer.write(encode(message))
+
+
+def reply(connection, request, message):
+    """Answer ``request``, echoing its "id" if it had one."""
+    if "id" in request:
+        message["id"] = request["id"]
+    connection.send(message)
+
+
+def deep_sizeof(objects):
+    """
+    Bytes held by ``objects`` and everything they reference, classes and
+    modules aside. Objects shared between them are counted once.
+    """
+    seen = set()
+    stack = list(objects)
+    size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (type, types.ModuleType, types.FunctionType)):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return size
+
+
+class GameServer:
+    """
+    Hosts any number of tables in one process over newline-delimited JSON
+    (see net.protocol). Moves are checked with AzulGame.is_legal_move();
+    after every accepted move each seat at the table is sent the new state.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, max_tables=MAX_TABLES):
+        self.host = host
+        self.port = port
+        self.max_tables = max_tables
+        self.tables = {}
+        self.ids = itertools.count(1)
+        self.server = None
+        self.finished = 0
+        self.moves = 0
+        # Move latency: receipt to every seat's state written
+        self.latency = Profiler(max_events=0)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def handle(self, reader, writer):
+        connection = Connection(writer)
+        try:
+            while True:
+                try:
+                    message = await read_message(reader)
+                except ProtocolError as e:
+                    connection.send({"op": "error", "error": str(e)})
+                    continue
+                except (ConnectionError, ValueError):
+                    break
+                if message is None:
+                    break
+                self.dispatch(connection, message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.leave(connection)
+            writer.close()
+
+    def dispatch(self, connection, message):
+        op = message["op"]
+        try:
+            if op == "move":
+                self.move(connection, message)
+            elif op == "create":
+                reply(connection, message, {"op": "created", "table": self.create(connection, message)})
+            elif op == "join":
+                self.join(connection, message)
+            elif op == "stats":
+                reply(connection, message, dict(self.stats(), op="stats"))
+            else:
+                raise ProtocolError(f"unknown op {op!r}")
+        except ProtocolError as e:
+            reply(connection, message, {"op": "error", "table": message.get("table"), "error": str(e)})
+        except (KeyError, TypeError, ValueError) as e:
+            # A field of the wrong type that got past the checks: refuse the
+            # request rather than drop the connection
+            reply(connection, message, {"op": "error", "table": message.get("table"),
+                                        "error": f"malformed {op!r} request: {e}"})
+
+    def create(self, connection, message):
+        players = message.get("players", 2)
+        if type(players) is not int or players not in (2, 3, 4):
+            raise ProtocolError("a table seats 2-4 players")
+        seed = message.get("seed")
+        if seed is not None and type(seed) not in (int, str):
+            raise ProtocolError("seed must be an integer or a string")
+        if len(self.tables) >= self.max_tables:
+            raise ProtocolError("server full")
+        table = Table(next(self.ids), players, seed, owner=connection)
+        self.tables[table.id] = table
+        connection.created.add(table.id)
+        return table.id
+
+    def table(self, message):
+        table_id = message.get("table")
+        if type(table_id) is not int:
+            raise ProtocolError("table must be an integer id")
+        table = self.tables.get(table_id)
+        if table is None:
+            raise ProtocolError("no such table")
+        return table
+
+    def join(self, connection, message):
+        table = self.table(message)
+        if table.full:
+            raise ProtocolError("table is full")
+        seat = table.join(connection, str(message.get("name", "player")))
+        connection.seats.add((table.id, seat))
+        reply(connection, message, {"op": "joined", "table": table.id, "seat": seat})
+        if table.full:
+            if table.owner is not None:
+                table.owner.created.discard(table.id)
+                table.owner = None
+            self.broadcast(table)
+
+    def move(self, connection, message):
+        start = time.perf_counter()
+        table = self.table(message)
+        game = table.game
+        if game is None or game.game_over:
+            raise ProtocolError("game is not running")
+        if table.seats[table.turn] is not connection:
+            raise ProtocolError("not your turn")
+        try:
+            move = tuple(int(x) for x in message["move"])
+        except (KeyError, TypeError, ValueError):
+            raise ProtocolError("move must be [source, color, row]") from None
+        if not game.is_legal_move(move):
+            raise ProtocolError(f"illegal move {list(move)}")
+
+        game.apply_move(move)
+        self.moves += 1
+        self.broadcast(table)
+        if game.game_over:
+            self.close_table(table)
+        self.latency.record("move", start, time.perf_counter())
+
+    def broadcast(self, table):
+        state = table.state()
+        game = table.game
+        for seat, connection in enumerate(table.seats):
+            message = dict(state, seat=seat)
+            if seat == state["turn"] and not game.game_over:
+                message["legal"] = game.legal_moves()
+            connection.send(message)
+
+    def close_table(self, table):
+        del self.tables[table.id]
+        self.finished += 1
+        for seat, connection in enumerate(table.seats):
+            connection.seats.discard((table.id, seat))
+
+    def leave(self, connection):
+        """
+        A client went away: the tables it sat at cannot go on, and the ones it
+        created that nobody has sat down at yet are dropped with it.
+        """
+        for table_id, _ in list(connection.seats):
+            table = self.tables.pop(table_id, None)
+            if table is None:
+                continue
+            for other in set(table.seats) - {connection, None}:
+                other.send({"op": "error", "table": table_id, "error": "a player left"})
+                other.seats = {s for s in other.seats if s[0] != table_id}
+        connection.seats = set()
+
+        for table_id in connection.created:
+            table = self.tables.get(table_id)
+            if table is None:
+                continue
+            if any(table.seats):
+                table.owner = None  # the players seated there keep it
+            else:
+                del self.tables[table_id]
+        connection.created = set()
+
+    def stats(self):
+        """Tables, moves, move latency percentiles (ms) and memory per table (bytes)."""
+        tables = list(self.tables.values())
+        sample = [t.game for t in tables[:MEMORY_SAMPLE] if t.game is not None]
+        p50, p95, p99 = self.latency.percentiles("move")
+        return {
+            "tables": len(tables),
+            "finished": self.finished,
+            "moves": self.moves,
+            "move_ms": [p50 * 1e3, p95 * 1e3, p99 * 1e3],
+            "table_bytes": deep_sizeof(sample) // len(sample) if sample else 0,
+        }
@@ -0,0 +1,63 @@
+import time
+import unittest
+
+from core.agents import GreedyAgent
+from core.ai_worker import AIWorker
+from core.game_logic import AzulGame
+from core.mcts import MCTSAgent
+from core.player import Player
+from core.search import AlphaBetaAgent
+
+
+def wait_for_move(worker, timeout=20.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        move = worker.poll()
+        if move is not None:
+            return move
+        time.sleep(0.01)
+    raise AssertionError("no move from the worker")
+
+
+class TestAIWorker(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.worker = AIWorker()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.worker.close()
+
+    def setUp(self):
+        self.game = AzulGame([Player("A"), Player("B")], seed=1)
+        self.game.start_round()
+
+    def test_move_comes_back_through_the_queue(self):
+        self.worker.submit("greedy", GreedyAgent(1), self.game)
+        move = wait_for_move(self.worker)
+        self.assertIn(move, self.game.legal_moves())
+        self.assertFalse(self.worker.busy)
+
+    def test_best_so_far_is_streamed(self):
+        self.worker.submit("mcts", MCTSAgent(time_budget=0.5, workers=1, seed=2), self.game)
+        deadline = time.perf_counter() + 20
+        while self.worker.best is None and time.perf_counter() < deadline:
+            self.assertIsNone(self.worker.poll())
+            time.sleep(0.01)
+        self.assertIn(self.worker.best, self.game.legal_moves())
+        self.assertIn(wait_for_move(self.worker), self.game.legal_moves())
+        self.assertGreater(self.worker.stats["playouts"], 0)
+
+    def test_cancelled_search_stops_early(self):
+        agent = AlphaBetaAgent(time_budget=30.0, seed=3)
+        self.worker.submit("alphabeta", agent, self.game)
+        time.sleep(0.3)
+        self.worker.cancel()
+        self.assertIsNone(self.worker.poll())
+
+        # The worker is free again long before the cancelled budget runs out
+        start = time.perf_counter()
+        self.worker.submit("greedy", GreedyAgent(1), self.game)
+        self.assertIn(wait_for_move(self.worker), self.game.legal_moves())
+        self.assertLess(time.perf_counter() - start, 10)
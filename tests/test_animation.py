@@ -0,0 +1,43 @@
+import unittest
+
+from ui.animation import AnimationScheduler
+
+
+class Sprite:
+    def __init__(self, pos):
+        self.screen_pos = pos
+
+
+class TestAnimationScheduler(unittest.TestCase):
+
+    def test_position_depends_on_time_not_frames(self):
+        smooth, choppy = Sprite((0, 0)), Sprite((0, 0))
+        a, b = AnimationScheduler(duration=0.2), AnimationScheduler(duration=0.2)
+        a.move(smooth, (100, 50))
+        b.move(choppy, (100, 50))
+        for _ in range(6):
+            a.advance(1 / 60)
+        b.advance(0.1)  # one dropped-frame step covering the same time
+        self.assertAlmostEqual(smooth.screen_pos[0], choppy.screen_pos[0])
+        self.assertAlmostEqual(smooth.screen_pos[0], 50)
+
+    def test_finishes_on_target_and_goes_idle(self):
+        sprite = Sprite((0, 0))
+        scheduler = AnimationScheduler(duration=0.2)
+        self.assertFalse(scheduler.advance(0.1))
+        scheduler.move(sprite, (10, 10))
+        self.assertTrue(scheduler.active)
+        self.assertTrue(scheduler.advance(1.0))
+        self.assertEqual(sprite.screen_pos, (10, 10))
+        self.assertFalse(scheduler.active)
+
+    def test_retarget_starts_from_current_position(self):
+        sprite = Sprite((0, 0))
+        scheduler = AnimationScheduler(duration=0.2)
+        scheduler.move(sprite, (100, 0))
+        scheduler.advance(0.1)
+        scheduler.move(sprite, (50, 100))
+        scheduler.advance(0.1)
+        self.assertAlmostEqual(sprite.screen_pos[0], 50)
+        self.assertAlmostEqual(sprite.screen_pos[1], 50)
+        self.assertEqual(len(scheduler.tweens), 1)
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import pygame
+    from ui.atlas import TextureAtlas
+except ImportError:
+    pygame = None
+
+
+@unittest.skipIf(pygame is None, "pygame not installed")
+class TestTextureAtlas(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.dir.name, "tile.png")
+        open(self.source, "w").close()
+        mtime = os.path.getmtime(self.source)
+
+        self.images = {}
+        for i, size in enumerate([(30, 20), (10, 40), (2100, 5)]):
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill((40 * i, 100, 200, 255 - i))
+            self.images[("tile.png", 1.0, *size)] = surface
+        self.sources = {key: (self.source, mtime) for key in self.images}
+        self.path = os.path.join(self.dir.name, "cache", "atlas.bin")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def assertSamePixels(self, a, b):
+        self.assertEqual(a.get_size(), b.get_size())
+        self.assertEqual(pygame.image.tobytes(a, "RGBA"), pygame.image.tobytes(b, "RGBA"))
+
+    def test_packed_regions_do_not_overlap(self):
+        atlas = TextureAtlas.pack(self.images, self.sources)
+        rects = list(atlas.regions.values())
+        for i, a in enumerate(rects):
+            self.assertTrue(atlas.surface.get_rect().contains(a))
+            for b in rects[i + 1:]:
+                self.assertFalse(a.colliderect(b))
+        for key, image in self.images.items():
+            self.assertSamePixels(atlas.get(key), image)
+
+    def test_save_and_load_round_trip(self):
+        TextureAtlas.pack(self.images, self.sources).save(self.path)
+        atlas = TextureAtlas.load(self.path)
+        self.assertEqual(len(atlas), 3)
+        for key, image in self.images.items():
+            self.assertSamePixels(atlas.get(key), image)
+
+    def test_changed_source_makes_cache_stale(self):
+        TextureAtlas.pack(self.images, self.sources).save(self.path)
+        mtime = os.path.getmtime(self.source)
+        os.utime(self.source, (mtime + 10, mtime + 10))
+        self.assertIsNone(TextureAtlas.load(self.path))
+
+    def test_missing_or_corrupt_file(self):
+        self.assertIsNone(TextureAtlas.load(self.path))
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as f:
+            f.write(b"not an atlas")
+        self.assertIsNone(TextureAtlas.load(self.path))
@@ -0,0 +1,101 @@
+import random
+import unittest
+
+from core.board import Board
+from core.game_logic import FLOOR, MIDDLE, AzulGame, decode_move
+from core.player import Player
+
+try:
+    import numpy as np
+    from core.batch import BatchGame
+except ImportError:
+    np = None
+
+
+def same_board(a, b):
+    return (a.rows, len(a.floor), a.wall_mask, a.score) == (b.rows, len(b.floor), b.wall_mask, b.score)
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestBatchGame(unittest.TestCase):
+
+    def test_matches_scalar_engine(self):
+        """Replay random scalar games through the batch; boards must agree after every turn."""
+        rng = random.Random(4)
+        for seed in range(12):
+            players = [Player(str(i)) for i in range(2 + seed % 3)]
+            game = AzulGame(players, seed=seed)
+            game.start_round()
+            batch = BatchGame.from_games([game], seed=seed)
+            while not game.game_over:
+                action = rng.choice(game.legal_actions())
+                game.apply_action(action, deal=False)
+                batch.step([action], deal=False)
+                if game.is_empty() and not game.game_over:
+                    # Deals use different random streams; copy the scalar deal over
+                    game.start_round()
+                    batch.load(0, game)
+                for p, player in enumerate(game.players):
+                    self.assertTrue(same_board(batch.board(0, p), player.board))
+                self.assertEqual(list(batch.discard[0]), game.discard)
+                self.assertEqual(batch.current[0], game.current_player)
+                self.assertEqual(batch.done[0], game.game_over)
+
+    def test_end_round_scoring_matches_board(self):
+        rng = random.Random(9)
+        games = []
+        for seed in range(40):
+            game = AzulGame([Player("A"), Player("B")], seed=seed)
+            for player in game.players:
+                board = player.board
+                board.wall_mask = rng.getrandbits(25) & rng.getrandbits(25)
+                for r in range(Board.SIZE):
+                    color = rng.randint(1, 5)
+                    if board.can_place(r, color):
+                        board.rows[r] = [color] * rng.randint(0, r + 1)
+                board.floor = [1] * rng.randint(0, Board.FLOOR_CAPACITY)
+                board.score = rng.randint(0, 30)
+            games.append(game)
+
+        batch = BatchGame.from_games(games)
+        batch._end_round(np.arange(len(games)), deal=False)
+        for i, game in enumerate(games):
+            game.end_round(deal=False)
+            for p, player in enumerate(game.players):
+                self.assertTrue(same_board(batch.board(i, p), player.board))
+            self.assertEqual(batch.done[i], game.game_over)
+
+    def test_random_actions_are_legal(self):
+        games = [AzulGame([Player("A"), Player("B"), Player("C")], seed=s) for s in range(20)]
+        for game in games:
+            game.start_round()
+        batch = BatchGame.from_games(games, seed=1)
+        for _ in range(10):
+            mask = batch.legal_mask()
+            for i, action in enumerate(batch.random_actions()):
+                game = games[i]
+                source, color, row = decode_move(int(action))
+                tiles = game.middle if source == MIDDLE else game.factories[source]
+                self.assertGreater(tiles.counts[color], 0)
+                board = game.players[game.current_player].board
+                self.assertTrue(row == FLOOR or board.can_place(row, color))
+                self.assertTrue(mask[i, action >> 6, color - 1, action & 7])
+                # The mask lists identical factories separately, legal_actions() once
+                self.assertGreaterEqual(mask[i].sum(), len(game.legal_actions()))
+                games[i].apply_action(int(action), deal=False)
+                if games[i].is_empty() and not games[i].game_over:
+                    games[i].start_round()
+                batch.load(i, games[i])
+
+    def test_play_out_finishes_every_game(self):
+        batch = BatchGame(200, players=2, seed=5)
+        batch.start_round()
+        scores = batch.play_out()
+        self.assertTrue(batch.done.all())
+        self.assertEqual(scores.shape, (200, 2))
+        self.assertTrue((scores >= 0).all())
+        # Tiles are conserved: 100 per game across bag, discard, rows and walls
+        walls = np.array([[bin(int(w)).count("1") for w in row] for row in batch.wall])
+        total = batch.bag.sum(1) + batch.discard.sum(1) + walls.sum(1)
+        total += batch.row_count.sum((1, 2)) + batch.factories.sum((1, 2)) + batch.middle.sum(1)
+        self.assertTrue((total == 100).all())
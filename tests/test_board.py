@@ -79,3 +79,22 @@ class TestAzulBoard(unittest.TestCase):
         # Place 10 tiles in floor (capacity 7)
         self.board._place_to_floor([1]*10)
         self.assertEqual(len(self.board.floor), 7)  # only 7 are stored
+
+    def test_adjacent_scoring_both_axes(self):
+        # Cross shape around (2, 2): 3 in the row, 3 in the column
+        for c in (1, 3):
+            self.board.wall[2][c] = self.board.pattern[2][c]
+        for r in (1, 3):
+            self.board.wall[r][2] = self.board.pattern[r][2]
+        self.board.wall[2][2] = self.board.pattern[2][2]
+        self.assertEqual(self.board.score_tile(2, 2), 3 + 3 - 1)
+
+    def test_wall_view_matches_bitmask(self):
+        self.board.place_tiles(0, 3, 1)
+        self.board.place_tiles(4, 1, 5)
+        self.board.end_round()
+        self.assertEqual(self.board.wall_mask, (1 << 2) | (1 << (4 * 5 + 4)))
+        self.assertEqual(self.board.wall[0][2], 3)
+        self.assertEqual(self.board.wall[4][4], 1)
+        self.assertIsNone(self.board.wall[1][1])
+        self.assertFalse(self.board.can_place(0, 3))
@@ -0,0 +1,100 @@
+import time
+import unittest
+
+from core.agents import GreedyAgent
+from core.endgame import ENDGAME_TILES, EndgameSolver, margin, should_solve
+from core.game_logic import AzulGame
+from core.mcts import MCTSAgent
+from core.player import Player
+from core.search import AlphaBetaAgent
+
+
+def endgame(players, seed, tiles=6):
+    """A greedy game played up to a final round with at most ``tiles`` left."""
+    game = AzulGame([Player(str(i)) for i in range(players)], seed=seed)
+    game.start_round()
+    agent = GreedyAgent(seed)
+    while not should_solve(game, tiles):
+        game.apply_move(agent.choose_move(game))
+        if game.game_over:
+            raise AssertionError("game ended before the endgame")
+    return game
+
+
+def brute_force(game):
+    """Every seat's scores under best play, without tables or pruning."""
+    player = game.current_player
+    best = None
+    for action in game.legal_actions():
+        game.apply_action(action, deal=False)
+        if game.game_over or game.is_empty():
+            scores = EndgameSolver()._leaf(game)
+        else:
+            scores = brute_force(game)
+        game.revert_move()
+        if best is None or margin(scores, player) > margin(best, player):
+            best = scores
+    return best
+
+
+class TestEndgameSolver(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        for players, seed in ((2, 0), (2, 1), (3, 3)):
+            game = endgame(players, seed)
+            solution = EndgameSolver().solve(game)
+            expected = brute_force(game.copy())
+            self.assertEqual(solution.margin, margin(expected, game.current_player))
+
+    def test_line_plays_out_to_the_scores(self):
+        game = endgame(2, 2, tiles=8)
+        solution = EndgameSolver().solve(game)
+        self.assertEqual(solution.move, solution.line[0])
+        for action in solution.line:
+            self.assertFalse(game.is_empty())
+            game.apply_action(action)
+        self.assertEqual(tuple(game.scores()), solution.scores)
+        self.assertEqual(game.game_over, solution.exact)
+
+    def test_not_used_early(self):
+        game = AzulGame([Player("A"), Player("B")], seed=1)
+        game.start_round()
+        self.assertFalse(should_solve(game, 100))
+
+    def test_agents_switch_to_the_solver(self):
+        game = endgame(2, 1)
+        expected = EndgameSolver().solve(game).margin
+        history = list(game.history)
+        for agent in (AlphaBetaAgent(time_budget=30), MCTSAgent(time_budget=30)):
+            move = agent.choose_move(game)
+            self.assertIn(move, game.legal_moves())
+            self.assertTrue(agent.last_stats["endgame"])
+            self.assertEqual(agent.last_stats["margin"], expected)
+        self.assertEqual(game.history, history)
+
+    def test_max_n_solves_quickly_at_the_default_threshold(self):
+        worst = 0.0
+        for players, seed in ((p, s) for p in (3, 4) for s in range(1, 9)):
+            game = endgame(players, seed, tiles=ENDGAME_TILES[players])
+            start = time.perf_counter()
+            EndgameSolver().solve(game)
+            worst = max(worst, time.perf_counter() - start)
+        self.assertLess(worst, 2.0)
+
+    def test_overrunning_solve_falls_back_to_search(self):
+        # About 20 seconds to solve with three players and 8 tiles left
+        game = endgame(3, 7, tiles=8)
+        self.assertIsNone(EndgameSolver().solve(game, time_budget=0.05))
+        for agent in (AlphaBetaAgent(time_budget=0.4, endgame_tiles=8),
+                      MCTSAgent(time_budget=0.4, endgame_tiles=8)):
+            start = time.perf_counter()
+            move = agent.choose_move(game)
+            self.assertLess(time.perf_counter() - start, 1.5)
+            self.assertIn(move, game.legal_moves())
+            self.assertNotIn("endgame", agent.last_stats)
+            # What the solver finished before the limit is kept for later turns
+            self.assertTrue(agent.endgame.memo)
+
+
+if __name__ == "__main__":
+    unittest.main()
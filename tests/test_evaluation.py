@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from core.agents import RandomAgent
+from core.board import Board
+from core.game_logic import AzulGame
+from core.player import Player
+from core.search import AlphaBetaAgent
+
+try:
+    import numpy as np
+    from core.batch import BatchGame
+    from core.evaluation import FEATURES, Evaluator, array_features, board_features
+except ImportError:
+    np = None
+
+
+def random_positions(players, games, seed):
+    positions = []
+    for g in range(games):
+        game = AzulGame([Player(str(i)) for i in range(players)], seed=seed + g)
+        game.start_round()
+        agent = RandomAgent(seed + g)
+        while not game.game_over:
+            game.apply_move(agent.choose_move(game))
+            positions.append(game.copy(record=False))
+    return positions
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestEvaluator(unittest.TestCase):
+
+    def test_features_of_a_known_board(self):
+        board = Board()
+        for c in range(5):
+            board.wall[0][c] = board.pattern[0][c]
+        board.place_tiles(1, 1, 2)  # cyan completes row 2 next to the full row 1
+        board.place_tiles(-1, 3, 2)
+        board.score = 15
+        score, pattern, adjacency, floor, rows, columns, colors = board_features(board)
+        self.assertEqual(score, 15)
+        # Cyan sits under the yellow tile of row 1: a 2-tile column
+        self.assertEqual(pattern, 2)
+        self.assertEqual(adjacency, 5)
+        self.assertEqual(floor, -2)
+        self.assertEqual(rows, 2)
+        self.assertAlmostEqual(columns, 5 * 7 * (1 / 5) ** 2)
+        self.assertAlmostEqual(colors, 5 * 10 * (1 / 5) ** 2)
+
+    def test_batch_matches_one_by_one(self):
+        for players in (2, 3, 4):
+            positions = random_positions(players, 3, seed=players)
+            evaluator = Evaluator({"adjacency": 0.5, "colors": 0.3})
+            expected = [evaluator.values(game) for game in positions]
+            np.testing.assert_allclose(evaluator.evaluate_games(positions), expected)
+
+    def test_arrays_of_any_shape(self):
+        batch = BatchGame.from_games(random_positions(2, 1, seed=9))
+        features = array_features(batch.wall, batch.row_color, batch.row_count,
+                                  batch.floor, batch.score)
+        self.assertEqual(features.shape, batch.wall.shape + (len(FEATURES),))
+        flat = array_features(batch.wall.reshape(-1), batch.row_color.reshape(-1, 5),
+                              batch.row_count.reshape(-1, 5), batch.floor.reshape(-1),
+                              batch.score.reshape(-1))
+        np.testing.assert_allclose(flat, features.reshape(-1, len(FEATURES)))
+
+    def test_fit_recovers_weights(self):
+        rng = np.random.default_rng(1)
+        features = rng.normal(size=(200, len(FEATURES)))
+        # Features left out of the fit keep their default weights
+        weights = {"score": 1.0, "pattern": 0.5, "adjacency": 2.0, "floor": 1.0,
+                   "rows": 1.0, "columns": 3.0, "colors": 1.0}
+        targets = features @ np.array([weights[name] for name in FEATURES])
+        fitted = Evaluator.fit(features, targets, names=("pattern", "adjacency", "columns"))
+        for name in ("pattern", "adjacency", "columns"):
+            self.assertAlmostEqual(fitted.weights[name], weights[name])
+
+    def test_unknown_weights_are_rejected(self):
+        with self.assertRaises(ValueError):
+            Evaluator({"tempo": 1.0})
+
+    def test_plugs_into_alpha_beta(self):
+        game = random.choice(random_positions(2, 1, seed=4)[:10])
+        move = AlphaBetaAgent(time_budget=30, max_depth=2, evaluate=Evaluator()).choose_move(game)
+        self.assertIn(move, game.legal_moves())
+
+
+if __name__ == "__main__":
+    unittest.main()
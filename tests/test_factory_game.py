@@ -135,3 +135,21 @@ class TestFactoryGame(unittest.TestCase):
         remaining_colors = [t.color for t in self.game.middle.tiles]
         for t in remaining_colors:
             self.assertNotEqual(t, -1, "Tile(-1) should no longer be in middle")
+
+    def test_fill_factories_draws_counts_from_bag(self):
+        self.game.fill_factories()
+        on_plates = sum(f.total for f in self.game.factories)
+        self.assertEqual(on_plates, 4 * len(self.game.factories))
+        self.assertEqual(sum(self.game.bag) + on_plates, 100)
+        self.assertFalse(self.game.middle.tile_first_taken)
+
+    def test_factory_counts_move_to_middle(self):
+        factory = Factory()
+        for color in (2, 2, 3, 5):
+            factory.add(color)
+        middle = Middle()
+        self.assertEqual(factory.take(2), 2)
+        factory.move_to(middle)
+        self.assertEqual(factory.total, 0)
+        self.assertEqual(middle.total, 2)
+        self.assertEqual([t.color for t in middle.tiles], [3, 5])
@@ -0,0 +1,25 @@
+import unittest
+
+from ui.hit_test import HitIndex
+
+
+class TestHitIndex(unittest.TestCase):
+
+    def test_topmost_region_wins(self):
+        index = HitIndex(cell_size=32)
+        index.add((0, 0, 100, 100), "board")
+        index.add((40, 40, 20, 20), "tile")
+        self.assertEqual(index.hit((50, 50)), "tile")
+        self.assertEqual(index.hit((10, 90)), "board")
+        self.assertEqual(index.hit((60, 50)), "board")  # right edge is exclusive
+        self.assertIsNone(index.hit((150, 50)))
+
+    def test_region_spanning_cells_and_clear(self):
+        index = HitIndex(cell_size=10)
+        index.add((5, 5, 30, 3), "row")
+        for x in (5, 15, 25, 34):
+            self.assertEqual(index.hit((x, 6)), "row")
+        self.assertEqual(len(index), 1)
+        index.clear()
+        self.assertIsNone(index.hit((15, 6)))
+        self.assertEqual(len(index), 0)
@@ -0,0 +1,41 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+
+import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestHeadlessCli(unittest.TestCase):
+
+    def test_import_loads_neither_pygame_nor_ui(self):
+        code = ("import sys, main; "
+                "print(sorted(m for m in sys.modules if m.split('.')[0] in ('pygame', 'ui', 'core')))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             check=True, cwd=ROOT)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+    def test_agents_resolve_lazily(self):
+        for name in main.AGENT_TYPES:
+            self.assertEqual(main.agent_class(name).name, name)
+
+    def test_play_prints_every_move(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            main.main(["play", "greedy", "random", "-s", "5"])
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("round 1"))
+        self.assertTrue(lines[-1].startswith("winner:"))
+
+    def test_unknown_agent_is_rejected(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main.parse_args(["play", "greedy", "nobody"])
+
+    def test_search_workers_need_serial_games(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main.parse_args(["tournament", "greedy", "mcts", "-p", "2", "-w", "2"])
+        self.assertEqual(main.parse_args(["tournament", "greedy", "mcts", "-p", "1", "-w", "2"]).workers, 2)
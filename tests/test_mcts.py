@@ -0,0 +1,51 @@
+import time
+import unittest
+
+from core.game_logic import AzulGame
+from core.mcts import MCTSAgent, search
+from core.player import Player
+
+
+class TestMCTS(unittest.TestCase):
+
+    def setUp(self):
+        self.game = AzulGame([Player("A"), Player("B")], seed=2)
+        self.game.start_round()
+
+    def test_returns_legal_move_and_stats(self):
+        agent = MCTSAgent(time_budget=5, max_playouts=200, seed=1)
+        move = agent.choose_move(self.game)
+        self.assertIn(move, self.game.legal_moves())
+        self.assertEqual(agent.last_stats["playouts"], 200)
+        self.assertGreater(agent.last_stats["playouts_per_sec_per_core"], 0)
+
+    def test_search_leaves_game_untouched(self):
+        before = self.game.zobrist_hash()
+        visits, playouts, _ = search(self.game, time_budget=5, seed=3, max_playouts=100)
+        self.assertEqual(sum(visits.values()), playouts)
+        self.assertEqual(self.game.zobrist_hash(), before)
+        self.assertEqual(self.game.history, [])
+
+    def test_root_parallel_merges_visits(self):
+        agent = MCTSAgent(time_budget=5, workers=2, max_playouts=50, seed=1)
+        try:
+            move = agent.choose_move(self.game)
+        finally:
+            agent.close()
+        self.assertIn(move, self.game.legal_moves())
+        self.assertEqual(agent.last_stats["playouts"], 100)
+
+    def test_cancel_stops_the_workers(self):
+        agent = MCTSAgent(time_budget=30, workers=2, seed=1)
+        stop = time.perf_counter() + 0.5
+        agent.progress = lambda move, stats: time.perf_counter() < stop
+        try:
+            self.assertIn(agent.choose_move(self.game), self.game.legal_moves())
+            # The next search gets the pool at once, not after the cancelled budget
+            agent.progress = None
+            agent.time_budget = 0.5
+            start = time.perf_counter()
+            agent.choose_move(self.game)
+            self.assertLess(time.perf_counter() - start, 10)
+        finally:
+            agent.close()
@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+import unittest
+
+from core.profiler import NULL_SECTION, Profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_disabled_records_nothing(self):
+        profiler = Profiler()
+        self.assertIs(profiler.section("draw"), NULL_SECTION)
+        with profiler.section("draw"):
+            pass
+        self.assertEqual(profiler.stats(), {})
+        self.assertEqual(len(profiler.events), 0)
+
+    def test_rolling_percentiles(self):
+        profiler = Profiler(window=100)
+        for ms in range(1, 201):
+            profiler.record("draw", 0.0, ms / 1000)
+        # Only the last 100 samples (101..200 ms) count
+        p50, p95, p99 = profiler.percentiles("draw")
+        self.assertAlmostEqual(p50, 0.151)
+        self.assertAlmostEqual(p95, 0.196)
+        self.assertAlmostEqual(p99, 0.200)
+
+    def test_chrome_trace_export(self):
+        profiler = Profiler()
+        profiler.enabled = True
+        with profiler.section("frame"):
+            with profiler.section("draw"):
+                pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            self.assertEqual(profiler.export_trace(path), 2)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        self.assertEqual([e["name"] for e in events], ["draw", "frame"])
+        self.assertTrue(all(e["ph"] == "X" and e["dur"] >= 0 for e in events))
+        draw, frame = events
+        self.assertGreaterEqual(draw["ts"], frame["ts"])
@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+import unittest
+
+from core.agents import RandomAgent
+from core.game_logic import FLOOR, AzulGame
+from core.player import Player
+from core.replay import Replay, ReplayRecorder
+from core.snapshot import snapshot
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".azr")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def record(self, reverts=False, seed=3):
+        """Record a random game; returns the snapshot after every turn."""
+        rng = random.Random(seed)
+        agent = RandomAgent(seed)
+        game = AzulGame([Player("A"), Player("B"), Player("C")], seed=seed)
+        game.start_round()
+        recorder = ReplayRecorder(self.path, keyframe_every=8)
+        recorder.attach(game)
+        snapshots = [snapshot(game)]
+        while not game.game_over:
+            game.apply_move(agent.choose_move(game))
+            snapshots.append(snapshot(game))
+            if reverts and len(snapshots) > 2 and rng.random() < 0.15:
+                game.revert_move()
+                snapshots.pop()
+        recorder.detach(game)
+        return snapshots
+
+    def test_seek_matches_the_recorded_game(self):
+        snapshots = self.record()
+        replay = Replay(self.path)
+        self.assertEqual(len(replay), len(snapshots) - 1)
+        for turn in list(range(len(snapshots))) + [40, 3, 17, 0]:
+            replay.seek(turn)
+            self.assertEqual(snapshot(replay.game), snapshots[turn])
+
+    def test_random_steps_with_undone_moves(self):
+        snapshots = self.record(reverts=True)
+        replay = Replay(self.path)
+        self.assertEqual(len(replay), len(snapshots) - 1)
+        rng = random.Random(1)
+        for _ in range(300):
+            if rng.random() < 0.3:
+                replay.seek(rng.randrange(len(snapshots)))
+            else:
+                replay.step(rng.randint(-6, 6))
+            self.assertEqual(snapshot(replay.game), snapshots[replay.turn])
+
+    def test_selections_are_logged_as_events(self):
+        game = AzulGame([Player("A"), Player("B")], seed=2)
+        game.start_round()
+        recorder = ReplayRecorder(self.path)
+        recorder.attach(game)
+        source, color, _ = game.legal_moves()[0]
+        game.player_select_from_factory(source, color)
+        game.undo_selection()
+        game.player_select_from_factory(source, color)
+        game.place_selection(FLOOR)
+        recorder.detach(game)
+
+        replay = Replay(self.path)
+        self.assertEqual(replay.moves, [(source, color, FLOOR)])
+        self.assertEqual(replay.events_at(0), [
+            ("select", (source, color)), ("unselect", None), ("select", (source, color))])
+
+    def test_recording_does_not_change_the_game(self):
+        def play(recorded):
+            agent = RandomAgent(3)
+            game = AzulGame([Player("A"), Player("B")], seed=7)
+            game.start_round()
+            if recorded:
+                ReplayRecorder(self.path, keyframe_every=4).attach(game)
+            while not game.game_over:
+                game.apply_move(agent.choose_move(game))
+                if len(game.history) % 7 == 0:
+                    game.revert_move()
+                    game.apply_move(agent.choose_move(game))
+            if recorded:
+                game.recorder.detach(game)
+            return snapshot(game)
+
+        self.assertEqual(play(True), play(False))
+
+    def test_each_recorded_game_is_a_segment(self):
+        first = self.record(seed=3)
+        second = self.record(seed=4)
+        replay = Replay(self.path)
+        self.assertEqual((replay.games, replay.index), (2, 1))
+        self.assertEqual(len(replay), len(second) - 1)
+        self.assertEqual(snapshot(replay.seek(len(replay))), second[-1])
+        self.assertTrue(replay.game.game_over)
+
+        replay = Replay(self.path, 0)
+        self.assertEqual(len(replay), len(first) - 1)
+        self.assertEqual(snapshot(replay.seek(len(replay))), first[-1])
+
+    def test_torn_last_record_is_ignored(self):
+        snapshots = self.record()
+        with open(self.path, "ab") as f:
+            f.write(b"M\x02")
+        replay = Replay(self.path)
+        replay.seek(len(replay))
+        self.assertEqual(snapshot(replay.game), snapshots[-1])
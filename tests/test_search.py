@@ -0,0 +1,54 @@
+import unittest
+
+from core.game_logic import AzulGame
+from core.player import Player
+from core.search import AlphaBetaAgent
+from core.simulation import play_game
+
+
+class TestAlphaBeta(unittest.TestCase):
+
+    def setUp(self):
+        self.game = AzulGame([Player("A"), Player("B")], seed=8)
+        self.game.start_round()
+
+    def test_node_budget_and_stats(self):
+        agent = AlphaBetaAgent(time_budget=30, max_nodes=2000)
+        move = agent.choose_move(self.game)
+        self.assertIn(move, self.game.legal_moves())
+        stats = agent.last_stats
+        self.assertLessEqual(stats["nodes"], 2000)
+        self.assertGreaterEqual(stats["depth"], 1)
+        self.assertGreater(stats["nodes_per_sec"], 0)
+
+    def test_deterministic_with_fixed_depth(self):
+        moves = [AlphaBetaAgent(time_budget=30, max_depth=2).choose_move(self.game) for _ in range(2)]
+        self.assertEqual(moves[0], moves[1])
+        self.assertEqual(self.game.history, [])
+
+    def test_takes_free_points(self):
+        game = self.game
+        for factory in game.factories:
+            factory.clear()
+        game.factories[0].add(2, 1)
+        game.factories[1].add(4, 3)
+        game._hash = None
+        # Row 1 needs one more red tile, next to a wall tile: 2 points there
+        board = game.players[game.current_player].board
+        board.place_tiles(1, 2, 1)
+        board.wall[1][3] = board.pattern[1][3]
+        move = AlphaBetaAgent(time_budget=30, max_depth=3).choose_move(game)
+        self.assertEqual(move, (0, 2, 1))
+
+    def test_tables_are_reset_for_each_game(self):
+        agent = AlphaBetaAgent(time_budget=30, max_nodes=300)
+        agent.choose_move(self.game)
+        agent.endgame.memo[0] = None
+        self.assertTrue(len(agent.table))
+        agent.new_game()
+        self.assertEqual((len(agent.table), agent.endgame.memo), (0, {}))
+
+        cleared = []
+        agent.new_game = lambda: cleared.append(True)
+        play_game([agent, AlphaBetaAgent(time_budget=30, max_nodes=50)], seed=1)
+        self.assertEqual(cleared, [True])
@@ -0,0 +1,174 @@
+import asyncio
+import unittest
+
+from net.client import BotClient
+from net.loadtest import load_test
+from net.protocol import ProtocolError, encode, read_message
+from net.server import GameServer
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await GameServer(port=0).start()
+        self.bots = []
+
+    async def asyncTearDown(self):
+        for bot in self.bots:
+            await bot.close()
+        await self.server.stop()
+
+    async def bot(self, **kwargs):
+        bot = await BotClient(port=self.server.port, **kwargs).connect()
+        self.bots.append(bot)
+        return bot
+
+    async def until(self, condition, timeout=2.0):
+        """Wait for the server to catch up with a closed connection."""
+        for _ in range(int(timeout / 0.01)):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        self.fail("timed out")
+
+    async def test_bots_play_a_table_to_the_end(self):
+        a, b = await self.bot(seed=1), await self.bot(seed=2)
+        table = await a.create(players=2, seed=7)
+        self.assertEqual(await a.join(table), 0)
+        self.assertEqual(await b.join(table), 1)
+        scores = await asyncio.wait_for(a.finished(table), 10)
+        self.assertEqual(scores, await b.finished(table))
+        self.assertEqual(len(scores), 2)
+        self.assertEqual((a.errors, b.errors), ([], []))
+        self.assertEqual(self.server.finished, 1)
+        self.assertEqual(self.server.tables, {})
+
+    async def test_one_connection_at_many_tables(self):
+        bot = await self.bot(seed=3)
+        tables = [await bot.create(players=3) for _ in range(5)]
+        for table in tables:
+            for seat in range(3):
+                self.assertEqual(await bot.join(table), seat)
+        results = await asyncio.wait_for(asyncio.gather(*map(bot.finished, tables)), 10)
+        self.assertTrue(all(len(scores) == 3 for scores in results))
+
+    async def test_requests_are_validated(self):
+        bot = await self.bot()
+        with self.assertRaises(ProtocolError):
+            await bot.create(players=5)
+        with self.assertRaises(ProtocolError):
+            await bot.join(999)
+        table = await bot.create(players=2)
+        await bot.join(table)
+        await bot.join(table)
+        with self.assertRaises(ProtocolError):
+            await bot.join(table)
+
+    async def test_illegal_and_out_of_turn_moves_are_rejected(self):
+        peers = [await asyncio.open_connection("127.0.0.1", self.server.port) for _ in range(2)]
+
+        async def ask(seat, message):
+            reader, writer = peers[seat]
+            writer.write(encode(message))
+            await writer.drain()
+            return await read_message(reader)
+
+        table = (await ask(0, {"op": "create", "players": 2, "seed": 1}))["table"]
+        await ask(0, {"op": "join", "table": table})
+        await ask(1, {"op": "join", "table": table})
+        states = [await read_message(reader) for reader, _ in peers]
+        turn = states[0]["turn"]
+        self.assertIn("legal", states[turn])
+        self.assertNotIn("legal", states[1 - turn])
+
+        reply = await ask(1 - turn, {"op": "move", "table": table, "move": states[turn]["legal"][0]})
+        self.assertEqual(reply["error"], "not your turn")
+        reply = await ask(turn, {"op": "move", "table": table, "move": [0, 0, 0]})
+        self.assertIn("illegal", reply["error"])
+        reply = await ask(turn, {"op": "bogus", "id": 5})
+        self.assertEqual((reply["error"], reply["id"]), ("unknown op 'bogus'", 5))
+
+        reply = await ask(turn, {"op": "move", "table": table, "move": states[turn]["legal"][0]})
+        self.assertEqual((reply["op"], reply["version"]), ("state", states[turn]["version"] + 1))
+        for _, writer in peers:
+            writer.close()
+            await writer.wait_closed()
+
+    async def test_move_from_a_duplicate_factory_is_accepted(self):
+        peers = [await asyncio.open_connection("127.0.0.1", self.server.port) for _ in range(2)]
+
+        async def ask(seat, message):
+            reader, writer = peers[seat]
+            writer.write(encode(message))
+            await writer.drain()
+            return await read_message(reader)
+
+        # Seed 3 deals factory 4 the same tiles as factory 1, so legal_moves()
+        # lists only the first of them
+        table = (await ask(0, {"op": "create", "players": 2, "seed": 3}))["table"]
+        await ask(0, {"op": "join", "table": table})
+        await ask(1, {"op": "join", "table": table})
+        states = [await read_message(reader) for reader, _ in peers]
+        turn = states[0]["turn"]
+        factories = states[turn]["factories"]
+        duplicate = next(i for i, f in enumerate(factories) if f in factories[:i])
+        self.assertNotIn(duplicate, [move[0] for move in states[turn]["legal"]])
+
+        color = next(c for c, n in enumerate(factories[duplicate], 1) if n)
+        reply = await ask(turn, {"op": "move", "table": table, "move": [duplicate, color, -1]})
+        self.assertEqual((reply["op"], reply["version"]), ("state", states[turn]["version"] + 1))
+        self.assertEqual(reply["factories"][duplicate], [0] * 5)
+        for _, writer in peers:
+            writer.close()
+            await writer.wait_closed()
+
+    async def test_malformed_requests_get_errors(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+
+        async def ask(message):
+            writer.write(encode(message))
+            await writer.drain()
+            return await read_message(reader)
+
+        for message in ({"op": "create", "seed": [1]}, {"op": "create", "players": 2.0},
+                        {"op": "join", "table": [1]}, {"op": "move", "table": {}},
+                        {"op": "join", "table": "1"}):
+            self.assertEqual((await ask(message))["op"], "error", message)
+        self.assertEqual(self.server.tables, {})
+
+        # The connection survives and a string seed is fine
+        table = (await ask({"op": "create", "seed": "abc"}))["table"]
+        await ask({"op": "join", "table": table})
+        self.assertEqual((await ask({"op": "join", "table": table}))["op"], "joined")
+        self.assertIsNotNone(self.server.tables[table].game)
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_tables_left_empty_are_dropped(self):
+        self.server.max_tables = 3
+        creator = await self.bot()
+        for _ in range(3):
+            await creator.create(players=2)
+        with self.assertRaises(ProtocolError):
+            await creator.create(players=2)
+
+        # A table someone sits at outlives its creator until they leave too
+        other = await self.bot()
+        kept = sorted(self.server.tables)[0]
+        await other.join(kept)
+        await creator.close()
+        self.bots.remove(creator)
+        await self.until(lambda: len(self.server.tables) == 1)
+        self.assertEqual(list(self.server.tables), [kept])
+        self.assertIsNotNone(await other.create(players=2))
+
+        await other.close()
+        self.bots.remove(other)
+        await self.until(lambda: not self.server.tables)
+
+    async def test_stats_report_latency_and_memory(self):
+        stats = await load_test(tables=20, players=2, clients=2, seed=4)
+        self.assertEqual(stats["finished"], 20)
+        self.assertGreater(stats["moves"], 20 * 20)
+        self.assertGreater(stats["table_bytes"], 0)
+        self.assertGreater(stats["move_ms"][0], 0)
@@ -0,0 +1,211 @@
+import unittest
+
+from core.agents import GreedyAgent, RandomAgent
+from core.game_logic import FLOOR, AzulGame, decode_move, encode_move
+from core.player import Player
+from core.simulation import play_game
+from core.tile import FIRST_PLAYER, TILE_COLORS
+
+
+def tiles_in_play(game):
+    """Count every colour tile wherever it sits; should always be 100."""
+    total = sum(game.bag) + sum(game.discard)
+    total += sum(f.total for f in game.factories) + game.middle.total
+    for player in game.players:
+        board = player.board
+        total += sum(len(row) for row in board.rows)
+        total += sum(1 for c in board.floor if c != FIRST_PLAYER)
+        total += bin(board.wall_mask).count("1")
+    return total
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_full_game_finishes(self):
+        result = play_game([GreedyAgent(), RandomAgent()], seed=7)
+        self.assertEqual(len(result["scores"]), 2)
+        self.assertGreater(result["rounds"], 0)
+        self.assertTrue(result["winners"])
+
+    def test_same_seed_same_game(self):
+        agents = [RandomAgent(), RandomAgent(), GreedyAgent()]
+        self.assertEqual(play_game(agents, seed=123), play_game(agents, seed=123))
+
+    def test_tiles_are_conserved(self):
+        players = [Player("A", RandomAgent(1)), Player("B", RandomAgent(2))]
+        game = AzulGame(players, seed=3)
+        game.start_round()
+        while not game.game_over:
+            agent = game.players[game.current_player].agent
+            game.apply_move(agent.choose_move(game))
+            self.assertEqual(tiles_in_play(game), 20 * len(TILE_COLORS))
+        self.assertTrue(any(p.board.has_full_row() for p in players))
+
+    def test_undo_selection_keeps_the_round(self):
+        game = AzulGame([Player("A"), Player("B")], seed=4)
+        game.start_round()
+        source, color, row = game.legal_moves()[0]
+        game.apply_move((source, color, row))
+        game.first_player_next = 1
+        factory = next(i for i, f in enumerate(game.factories) if f.total)
+        color = next(c for c in TILE_COLORS if game.factories[factory].counts[c])
+        game.player_select_from_factory(factory, color)
+        game.undo_selection()
+        self.assertEqual((game.round, game.first_player_next, game.game_over), (1, 1, False))
+
+    def test_round_ends_with_only_the_marker_left(self):
+        game = AzulGame([Player("A"), Player("B")], seed=5)
+        game.start_round()
+        for factory in game.factories:
+            factory.clear()
+        game.middle.clear()
+        game.factories[0].add(2, 4)
+        # Nobody has taken from the middle, so the marker is still there
+        game.apply_move((0, 2, -1))
+        self.assertEqual(game.round, 2)
+        self.assertTrue(game.legal_moves())
+
+
+class TestLegalActions(unittest.TestCase):
+
+    def setUp(self):
+        self.game = AzulGame([Player("A"), Player("B")], seed=11)
+        self.game.start_round()
+
+    def test_actions_round_trip(self):
+        for action in self.game.legal_actions():
+            self.assertEqual(encode_move(*decode_move(action)), action)
+
+    def test_identical_factories_listed_once(self):
+        game = self.game
+        for factory in game.factories:
+            factory.clear()
+        game.factories[0].add(2, 4)
+        game.factories[3].add(2, 4)
+        sources = {decode_move(a)[0] for a in game.legal_actions()}
+        self.assertEqual(sources, {0})
+
+    def test_covers_every_row_and_floor(self):
+        game = self.game
+        for factory in game.factories:
+            factory.clear()
+        game.factories[1].add(3, 2)
+        game.factories[1].add(4, 2)
+        board = game.players[game.current_player].board
+        board.place_tiles(1, 3, 1)
+        moves = set(game.legal_moves())
+        self.assertNotIn((1, 4, 1), moves)
+        self.assertIn((1, 3, 1), moves)
+        self.assertEqual(len(moves), 2 * 6 - 1)
+        self.assertIn((1, 4, FLOOR), moves)
+
+    def test_full_row_is_not_a_destination(self):
+        game = self.game
+        for factory in game.factories:
+            factory.clear()
+        game.factories[1].add(3, 2)
+        board = game.players[game.current_player].board
+        board.place_tiles(0, 3, 1)
+        moves = set(game.legal_moves())
+        self.assertNotIn((1, 3, 0), moves)
+        self.assertIn((1, 3, FLOOR), moves)
+        self.assertEqual(len(moves), 5)
+
+    def test_is_legal_move(self):
+        game = self.game
+        for factory in game.factories:
+            factory.clear()
+        game.factories[0].add(2, 4)
+        game.factories[3].add(2, 4)
+        board = game.players[game.current_player].board
+        board.place_tiles(0, 2, 1)
+        for move in game.legal_moves():
+            self.assertTrue(game.is_legal_move(move))
+        # The duplicate factory is legal even though it is not listed
+        self.assertTrue(game.is_legal_move((3, 2, 1)))
+        for move in [(3, 2, 0), (3, 1, FLOOR), (1, 2, FLOOR), (5, 2, FLOOR), (0, 2, 5), (0, 0, 1)]:
+            self.assertFalse(game.is_legal_move(move), move)
+
+
+def fingerprint(game):
+    boards = [
+        ([row[:] for row in p.board.rows], p.board.floor[:], p.board.wall_mask, p.board.score)
+        for p in game.players
+    ]
+    sources = [f.counts[:] for f in game.factories] + [game.middle.counts[:]]
+    return (boards, sources, game.middle.tile_first_taken, game.bag[:], game.discard[:],
+            game.current_player, game.first_player_next, game.round, game.game_over)
+
+
+class TestMakeUnmake(unittest.TestCase):
+
+    def setUp(self):
+        self.agent = RandomAgent(5)
+        self.game = AzulGame([Player("A"), Player("B"), Player("C")], seed=9)
+        self.game.start_round()
+
+    def test_revert_every_move_of_a_game(self):
+        game = self.game
+        while not game.game_over:
+            before = fingerprint(game)
+            move = self.agent.choose_move(game)
+            game.apply_move(move)
+            after = fingerprint(game)
+            game.revert_move()
+            self.assertEqual(fingerprint(game), before)
+            game.apply_move(move)
+            self.assertEqual(fingerprint(game), after)
+
+    def test_deep_unwind(self):
+        game = self.game
+        start = fingerprint(game)
+        while not game.game_over:
+            game.apply_move(self.agent.choose_move(game))
+        while game.history:
+            game.revert_move()
+        self.assertEqual(fingerprint(game), start)
+
+    def test_selection_undo_and_place(self):
+        game = self.game
+        start = fingerprint(game)
+        source, color, _ = game.legal_moves()[0]
+        game.player_select_from_factory(source, color)
+        game.undo_selection()
+        self.assertEqual(fingerprint(game), start)
+
+        game.player_select_from_factory(source, color)
+        game.place_selection(FLOOR)
+        self.assertEqual(len(game.history), 1)
+        game.revert_move()
+        self.assertEqual(fingerprint(game), start)
+
+
+class TestMemoizedViews(unittest.TestCase):
+
+    def setUp(self):
+        self.game = AzulGame([Player("A"), Player("B")], seed=4)
+        self.game.start_round()
+
+    def test_views_reused_until_the_game_changes(self):
+        game = self.game
+        moves = game.legal_moves()
+        self.assertIs(game.legal_moves(), moves)
+
+        version = game.version
+        game.apply_move(moves[0])
+        self.assertGreater(game.version, version)
+        self.assertIsNot(game.legal_moves(), moves)
+
+        game.revert_move()
+        self.assertEqual(game.legal_moves(), moves)
+
+    def test_selection_invalidates_possible_moves(self):
+        game = self.game
+        self.assertEqual(game.possible_moves(), [])
+        source, color, _ = game.legal_moves()[0]
+        game.player_select_from_factory(source, color)
+        options = game.possible_moves()
+        self.assertTrue(options)
+        self.assertIs(game.possible_moves(), options)
+        game.undo_selection()
+        self.assertEqual(game.possible_moves(), [])
@@ -0,0 +1,61 @@
+import unittest
+
+from core.agents import RandomAgent
+from core.game_logic import AzulGame
+from core.player import Player
+from core.snapshot import apply_delta, delta, restore, size, snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def play(self, players, seed):
+        """Snapshots after every move of a random game, and the game."""
+        agent = RandomAgent(seed)
+        game = AzulGame([Player(f"P{i}") for i in range(players)], seed=seed)
+        game.start_round()
+        snapshots = [snapshot(game)]
+        while not game.game_over:
+            game.apply_move(agent.choose_move(game))
+            snapshots.append(snapshot(game))
+        return game, snapshots
+
+    def test_sizes(self):
+        self.assertEqual(size(2), 61)
+        self.assertEqual(size(4), 99)
+
+    def test_round_trip_every_turn(self):
+        for players, seed in ((2, 1), (3, 2), (4, 3)):
+            _, snapshots = self.play(players, seed)
+            for data in snapshots:
+                self.assertEqual(len(data), size(players))
+                self.assertEqual(snapshot(restore(data)), data)
+
+    def test_restored_game_plays_on(self):
+        agent = RandomAgent(4)
+        game = AzulGame([Player("A"), Player("B")], seed=4)
+        game.start_round()
+        for _ in range(5):
+            game.apply_move(agent.choose_move(game))
+        copy = restore(snapshot(game))
+        self.assertEqual(copy.legal_moves(), game.legal_moves())
+        self.assertEqual(copy.zobrist_hash(), game.zobrist_hash())
+        move = game.legal_moves()[0]
+        game.apply_move(move)
+        copy.apply_move(move)
+        self.assertEqual(snapshot(copy), snapshot(game))
+
+    def test_pending_selection_is_put_back(self):
+        game = AzulGame([Player("A"), Player("B")], seed=5)
+        game.start_round()
+        before = snapshot(game)
+        source, color, _ = game.legal_moves()[0]
+        game.player_select_from_factory(source, color)
+        self.assertEqual(snapshot(game), before)
+
+    def test_deltas_rebuild_every_turn(self):
+        _, snapshots = self.play(4, 6)
+        for old, new in zip(snapshots, snapshots[1:]):
+            patch = delta(old, new)
+            self.assertLess(len(patch), len(new))
+            self.assertEqual(apply_delta(old, patch), new)
+        self.assertEqual(delta(snapshots[0], snapshots[0]), b"")
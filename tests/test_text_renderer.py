@@ -0,0 +1,28 @@
+import unittest
+
+try:
+    import pygame
+    from ui.text_renderer import TextRenderer
+except ImportError:
+    pygame = None
+
+
+@unittest.skipIf(pygame is None, "pygame not installed")
+class TestTextRenderer(unittest.TestCase):
+
+    def setUp(self):
+        pygame.font.init()
+        self.text = TextRenderer(cache_size=2)
+
+    def test_fonts_and_surfaces_are_reused(self):
+        first = self.text.render_outlined("3", 40)
+        self.assertIs(self.text.render_outlined("3", 40), first)
+        self.assertIs(self.text.font(40), self.text.font(40))
+        self.assertEqual(len(self.text.fonts), 1)
+        # Different colours are different entries
+        self.assertIsNot(self.text.render_outlined("3", 40, text_color=(255, 0, 0)), first)
+
+    def test_cache_is_bounded(self):
+        for n in range(5):
+            self.text.render(str(n), 24, (0, 0, 0))
+        self.assertEqual(len(self.text.surfaces), 2)
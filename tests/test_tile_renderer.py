@@ -0,0 +1,28 @@
+import unittest
+
+try:
+    from ui.tile_renderer import SpriteCache, TileRenderer
+except ImportError:
+    SpriteCache = None
+
+
+@unittest.skipIf(SpriteCache is None, "pygame not installed")
+class TestSpriteCache(unittest.TestCase):
+
+    def test_least_recently_used_is_evicted(self):
+        cache = SpriteCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_rotation_quantization(self):
+        renderer = TileRenderer(None, None, rotation_step=5)
+        self.assertEqual(renderer.quantize_rotation(12.4), 10)
+        self.assertEqual(renderer.quantize_rotation(-2.6), 355)
+        renderer.rotation_step = 0
+        self.assertEqual(renderer.quantize_rotation(12.4), 12.4)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from core.agents import GreedyAgent, RandomAgent
+from core.mcts import MCTSAgent
+from core.tournament import Tournament, elo_ratings, load_results, round_robin, swiss_round
+
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "results.jsonl")
+        self.agents = {"random": RandomAgent(), "greedy": GreedyAgent(), "greedy2": GreedyAgent()}
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_robin_pairs_everyone(self):
+        jobs = round_robin(["a", "b", "c"], games_per_pair=2)
+        self.assertEqual(len(jobs), 6)
+        self.assertIn(("rr:a:b:1", ("b", "a")), jobs)
+
+    def test_resume_after_crash_replays_nothing(self):
+        Tournament(self.agents, self.path, seed=4, workers=1).run_round_robin()
+        results = load_results(self.path)
+        self.assertEqual(len(results), 6)
+
+        # Simulate a crash mid-write: drop the last game, leave a torn line
+        with open(self.path) as f:
+            lines = f.readlines()
+        with open(self.path, "w") as f:
+            f.writelines(lines[:-1])
+            f.write(lines[-1][:10])
+
+        resumed = Tournament(self.agents, self.path, seed=4, workers=1)
+        self.assertEqual(len(resumed.results), 5)
+        resumed.run_round_robin()
+        by_id = {r["id"]: r for r in load_results(self.path)}
+        self.assertEqual(len(by_id), 6)
+        self.assertEqual(by_id, {r["id"]: r for r in results})
+
+    def test_swiss_and_ratings(self):
+        tournament = Tournament(self.agents, self.path, seed=1, workers=1, games_per_pair=4)
+        tournament.run_swiss(rounds=2)
+        # Different byes each round, so nobody plays the same pairing twice
+        pairings = {tuple(sorted(r["seats"])) for r in tournament.results}
+        self.assertEqual(len(pairings), 2)
+        self.assertEqual(len(swiss_round(tournament.names, tournament.results, 2, 4)), 4)
+
+        standings = tournament.standings()
+        self.assertEqual([row["name"] for row in standings][-1], "random")
+        ratings = elo_ratings(tournament.results, tournament.names)
+        self.assertTrue(all(ci >= 0 for _, ci in ratings.values()))
+
+    def test_multi_worker_agents_in_a_process_pool(self):
+        # Pool workers cannot start processes, so the agent searches on one
+        agents = {"mcts": MCTSAgent(time_budget=10, workers=2, max_playouts=20), "greedy": GreedyAgent()}
+        tournament = Tournament(agents, self.path, seed=2, workers=2, games_per_pair=2)
+        self.assertEqual(len(tournament.run_round_robin()), 2)
+        self.assertEqual(agents["mcts"].workers, 2)
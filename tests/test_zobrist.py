@@ -0,0 +1,70 @@
+import unittest
+
+from core.agents import RandomAgent
+from core.game_logic import AzulGame
+from core.player import Player
+from core.zobrist import TranspositionTable, compute_hash
+
+
+class TestZobrist(unittest.TestCase):
+
+    def setUp(self):
+        self.game = AzulGame([Player("A"), Player("B")], seed=21)
+        self.game.start_round()
+        self.agent = RandomAgent(4)
+
+    def test_incremental_matches_full_hash(self):
+        game = self.game
+        game.zobrist_hash()
+        while not game.game_over:
+            game.apply_move(self.agent.choose_move(game))
+            self.assertEqual(game.zobrist_hash(), compute_hash(game))
+
+    def test_revert_restores_hash(self):
+        game = self.game
+        start = game.zobrist_hash()
+        for _ in range(6):
+            game.apply_move(self.agent.choose_move(game))
+        for _ in range(6):
+            game.revert_move()
+        self.assertEqual(game.zobrist_hash(), start)
+
+    def test_transposition_same_hash(self):
+        game = self.game
+        for factory in game.factories:
+            factory.clear()
+        game.factories[0].add(1, 4)
+        game.factories[1].add(2, 4)
+        game.factories[2].add(3, 4)
+        game.factories[3].add(4, 4)
+        game._hash = None
+
+        # A: f0 -> row 3, B: f1 -> row 3, A: f2 -> row 2
+        for move in [(0, 1, 3), (1, 2, 3), (2, 3, 2)]:
+            game.apply_move(move)
+        first = game.zobrist_hash()
+        for _ in range(3):
+            game.revert_move()
+
+        # Same turns for each player, A's picks swapped
+        for move in [(2, 3, 2), (1, 2, 3), (0, 1, 3)]:
+            game.apply_move(move)
+        self.assertEqual(game.zobrist_hash(), first)
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_bounded_and_depth_preferred(self):
+        table = TranspositionTable(size_bits=4)
+        for key in range(100):
+            table.store(key, depth=1, value=key)
+        self.assertLessEqual(len(table), 16)
+
+        table.store(3, depth=5, value=1)
+        table.store(3 + 16, depth=2, value=2)
+        self.assertEqual(table.probe(3)[2], 1)
+        self.assertIsNone(table.probe(3 + 16))
+
+        table.new_search()
+        table.store(3 + 16, depth=1, value=2)
+        self.assertEqual(table.probe(3 + 16)[2], 2)
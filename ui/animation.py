@@ -0,0 +1,59 @@
+# ui/animation.py
+MOVE_TIME = 0.2  # seconds for a tile to slide to a new position
+
+
+class Tween:
+    __slots__ = ("obj", "start", "target", "elapsed", "duration")
+
+    def __init__(self, obj, start, target, duration):
+        self.obj = obj
+        self.start = start
+        self.target = target
+        self.elapsed = 0.0
+        self.duration = duration
+
+
+class AnimationScheduler:
+    """
+    Every running tween in one table, advanced together by wall-clock time.
+
+    A tween slides ``obj.screen_pos`` linearly from where it was to a target
+    over ``duration`` seconds. Progress depends only on the elapsed time, so
+    a dropped frame makes the next step longer, not the motion slower.
+    """
+
+    def __init__(self, duration=MOVE_TIME):
+        self.duration = duration
+        self.tweens = {}
+
+    @property
+    def active(self):
+        return bool(self.tweens)
+
+    def move(self, obj, target):
+        """Send ``obj`` towards ``target``, from wherever it is right now."""
+        tween = self.tweens.get(id(obj))
+        if tween is not None and tween.target == target:
+            return
+        self.tweens[id(obj)] = Tween(obj, obj.screen_pos, target, self.duration)
+
+    def advance(self, dt):
+        """Step every tween by ``dt`` seconds; returns whether anything moved."""
+        if not self.tweens:
+            return False
+        finished = []
+        for key, tween in self.tweens.items():
+            tween.elapsed += dt
+            t = tween.elapsed / tween.duration if tween.duration > 0 else 1.0
+            if t >= 1.0:
+                tween.obj.screen_pos = tween.target
+                finished.append(key)
+                continue
+            (x0, y0), (x1, y1) = tween.start, tween.target
+            tween.obj.screen_pos = (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+        for key in finished:
+            del self.tweens[key]
+        return True
+
+    def clear(self):
+        self.tweens.clear()
@@ -1,10 +1,28 @@
 import pygame
 import os
 
+from ui.atlas import TextureAtlas
+
+ATLAS_FILE = "atlas.bin"
+
+
 class AssetManager:
-    def __init__(self, asset_dir="ui/assets"):
+    """
+    Loads images scaled to their display size, keyed by (file, scale, size).
+
+    With a cache directory, every image handed out is remembered; save_atlas()
+    packs them into a TextureAtlas on disk, and the next launch serves them
+    straight from it instead of decoding and resampling the sources again.
+    """
+
+    def __init__(self, asset_dir="ui/assets", cache_dir=None):
         self.asset_dir = asset_dir
         self.cache = {}
+        self.sources = {}
+        self.atlas_path = os.path.join(cache_dir, ATLAS_FILE) if cache_dir else None
+        self.atlas = TextureAtlas.load(self.atlas_path) if self.atlas_path else None
+        # Images decoded from source this run, i.e. missing from the atlas
+        self.misses = 0
 
     def scale_img(self, img, scale):
         w, h = img.get_size()
@@ -12,15 +30,34 @@ class AssetManager:
                 img, (int(w * scale), int(h * scale))
             )
 
-    def load_image(self, filename, scale=1.0):
-        if filename in self.cache:
-            return self.cache[filename]
+    def load_image(self, filename, scale=1.0, size=None):
+        """``filename`` scaled by ``scale``, or to exactly ``size`` if given."""
+        key = (filename, float(scale), *(size or (None, None)))
+        if key in self.cache:
+            return self.cache[key]
 
         path = os.path.join(self.asset_dir, filename)
-        image = pygame.image.load(path).convert_alpha()
+        image = self.atlas.get(key) if self.atlas is not None else None
+        if image is None:
+            self.misses += 1
+            image = pygame.image.load(path).convert_alpha()
+            if size is not None:
+                image = pygame.transform.smoothscale(image, size)
+            elif scale != 1.0:
+                image = self.scale_img(image, scale)
 
-        if scale != 1.0:
-            image = self.scale_img(image, scale)
+        self.cache[key] = image
+        self.sources[key] = (path, os.path.getmtime(path))
+        return image
 
-        self.cache[filename] = image
-        return image
\ No newline at end of file
+    def save_atlas(self):
+        """
+        Persist everything loaded so far as the atlas for the next launch.
+        Does nothing without a cache directory or when nothing was missing.
+        """
+        if not self.atlas_path or not self.misses:
+            return False
+        atlas = TextureAtlas.pack(self.cache, self.sources)
+        atlas.save(self.atlas_path)
+        self.misses = 0
+        return True
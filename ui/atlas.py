@@ -0,0 +1,111 @@
+# ui/atlas.py
+import json
+import os
+import struct
+
+import pygame
+
+MAGIC = b"AZATLAS1"
+HEADER = struct.Struct("<8sI")  # magic, length of the JSON manifest
+PADDING = 1  # transparent gap between packed images
+MAX_WIDTH = 2048
+
+
+class TextureAtlas:
+    """
+    Preprocessed images packed into one surface, handed out as subsurfaces.
+
+    Every entry is an image already scaled to its display size, so a launch
+    that finds a valid cache file skips decoding and resampling entirely:
+    it reads one blob of raw RGBA pixels. The manifest stored with the
+    pixels records each entry's source file, mtime and size; an entry whose
+    source changed makes the whole file stale.
+    """
+
+    def __init__(self, surface, regions, sources):
+        self.surface = surface
+        self.regions = regions    # key -> pygame.Rect inside surface
+        self.sources = sources    # key -> (path, mtime) it was made from
+        self.images = {key: surface.subsurface(rect) for key, rect in regions.items()}
+
+    def get(self, key):
+        return self.images.get(key)
+
+    def __contains__(self, key):
+        return key in self.images
+
+    def __len__(self):
+        return len(self.images)
+
+    @classmethod
+    def pack(cls, images, sources, max_width=MAX_WIDTH):
+        """
+        Shelf-pack ``{key: surface}`` tallest first: images fill a row left
+        to right and a new row starts under the tallest one when it is full.
+        """
+        order = sorted(images, key=lambda k: (-images[k].get_height(), str(k)))
+        width = max([max_width] + [images[k].get_width() + PADDING for k in order])
+        regions = {}
+        x = y = shelf = 0
+        for key in order:
+            w, h = images[key].get_size()
+            if x + w > width:
+                x, y, shelf = 0, y + shelf + PADDING, 0
+            regions[key] = pygame.Rect(x, y, w, h)
+            x += w + PADDING
+            shelf = max(shelf, h)
+
+        surface = pygame.Surface((width, max(1, y + shelf)), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        for key, rect in regions.items():
+            surface.blit(images[key], rect)
+        return cls(surface, regions, sources)
+
+    def save(self, path):
+        """Write manifest and pixels; the file is replaced atomically."""
+        entries = [
+            {"key": list(key), "rect": list(rect), "source": self.sources[key][0],
+             "mtime": self.sources[key][1]}
+            for key, rect in self.regions.items()
+        ]
+        manifest = json.dumps({"size": list(self.surface.get_size()), "entries": entries}).encode()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(manifest)))
+            f.write(manifest)
+            f.write(pygame.image.tobytes(self.surface, "RGBA"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """The atlas stored at ``path``, or None if missing, corrupt or stale."""
+        try:
+            with open(path, "rb") as f:
+                magic, length = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC:
+                    return None
+                manifest = json.loads(f.read(length))
+                pixels = f.read()
+        except (OSError, ValueError, struct.error):
+            return None
+
+        regions, sources = {}, {}
+        for entry in manifest["entries"]:
+            source, mtime = entry["source"], entry["mtime"]
+            try:
+                if os.path.getmtime(source) != mtime:
+                    return None
+            except OSError:
+                return None
+            key = tuple(entry["key"])
+            regions[key] = pygame.Rect(entry["rect"])
+            sources[key] = (source, mtime)
+
+        size = tuple(manifest["size"])
+        if len(pixels) != size[0] * size[1] * 4:
+            return None
+        surface = pygame.image.frombytes(pixels, size, "RGBA")
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return cls(surface, regions, sources)
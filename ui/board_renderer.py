@@ -1,35 +1,42 @@
 # ui/board_renderer.py
 import pygame
 from core.player import Player
+from ui.text_renderer import TextRenderer
 
 
 MARGIN = 20
 SPACING = 50
 NICKNAME_FONT_SIZE = 24
+# Pattern row geometry on the board image
+ROW_TILE_SIZE = 51
+ROW_SPACING = 8
 
 class PlayerBoardRenderer:
-    def __init__(self, screen, asset_manager, board_scale=1):
+    def __init__(self, screen, asset_manager, board_scale=1, text_renderer=None):
         self.screen = screen
         self.assets = asset_manager
+        self.text = text_renderer or TextRenderer()
         
         self.board_img = self.assets.load_image("board.jpg", board_scale)
+        # (rect, content) of everything drawn outside the static layer this frame
+        self.drawn = []
 
 
-    def draw_player_name(self, name, color, x, y):
+    def draw_player_name(self, name, color, x, y, target=None):
         """Draw player's name with shadow effect."""
-        font = pygame.font.SysFont(None, NICKNAME_FONT_SIZE)
-        shadow = font.render(name, True, color)
-        text = font.render(name, True, (0, 0, 0))
+        if target is None:
+            target = self.screen
+        shadow = self.text.render(name, NICKNAME_FONT_SIZE, tuple(color))
+        text = self.text.render(name, NICKNAME_FONT_SIZE, (0, 0, 0))
 
         name_x = x + 90 - text.get_width() // 2
         name_y = y + 80 - text.get_height() - 5
 
-        self.screen.blit(shadow, (name_x + 2, name_y + 2))
-        self.screen.blit(text, (name_x, name_y))
-    
-    
-    def draw_board(self, player: Player, current_player, possible_moves):
-        """Draw board in 2-column layout anchored to right edge."""
+        target.blit(shadow, (name_x + 2, name_y + 2))
+        target.blit(text, (name_x, name_y))
+
+    def board_rect(self, player: Player):
+        """Boards sit in a 2-column layout anchored to the right edge."""
         board_w, board_h = self.board_img.get_size()
         screen_width, _ = self.screen.get_size()
 
@@ -41,67 +48,75 @@ class PlayerBoardRenderer:
         
         # Y: stacked per row
         y = MARGIN + row * (board_h + SPACING)
+        return pygame.Rect(x, y, board_w, board_h)
+
+    def draw_board(self, player: Player, target=None):
+        """Draw the parts of a board that never change (outline, image, name)."""
+        if target is None:
+            target = self.screen
+        rect = self.board_rect(player)
+        x, y = rect.topleft
 
         # Outline rectangle
-        outline_rect = pygame.Rect(x - 3, y - 3, board_w + 6, board_h + 6)
-        pygame.draw.rect(self.screen, player.color, outline_rect, 3, border_radius=4)
+        outline_rect = rect.inflate(6, 6)
+        pygame.draw.rect(target, player.color, outline_rect, 3, border_radius=4)
 
         # Board image
-        self.screen.blit(self.board_img, (x, y))
+        target.blit(self.board_img, (x, y))
 
         # Player name (with shadow)
-        self.draw_player_name(player.name, player.color, x, y)
+        self.draw_player_name(player.name, player.color, x, y, target)
+        return rect
 
+    def draw_highlights(self, player: Player, current_player, possible_moves):
+        """Outline the rows the current selection can go to."""
         if possible_moves and player.number == current_player:
-            self._highlight_valid_rows(possible_moves, x, y)
-            
-
-        return pygame.Rect(x, y, board_w, board_h)
+            rect = self.board_rect(player)
+            self._highlight_valid_rows(possible_moves, rect.x, rect.y)
     
+    def row_rect(self, board_x, board_y, row_idx):
+        """Screen rect of a pattern row (0-4) or of the floor line (-1)."""
+        x_right = board_x + 295
+        if row_idx == -1:
+            num_tiles = 7
+            row_width = ROW_TILE_SIZE * num_tiles + ROW_SPACING * (num_tiles - 1) + 40
+            row_height = ROW_TILE_SIZE * 1.2
+            rx = x_right - row_width + 150
+            # Floor row sits just below the 5th pattern row
+            ry = board_y + 5 * (row_height + ROW_SPACING) - 2
+        else:
+            num_tiles = row_idx + 1
+            row_width = ROW_TILE_SIZE * num_tiles + ROW_SPACING * (num_tiles - 1)
+            row_height = ROW_TILE_SIZE
+            rx = x_right - row_width
+            ry = board_y + 10 + row_idx * (row_height + ROW_SPACING)
+        return pygame.Rect(rx, ry, row_width, row_height)
+
+    def click_regions(self, player: Player):
+        """(rect, target) for each pattern row and the floor of a board."""
+        rect = self.board_rect(player)
+        for row_idx in (0, 1, 2, 3, 4, -1):
+            yield self.row_rect(rect.x, rect.y, row_idx), ("row", player.number, row_idx)
+
     def _highlight_valid_rows(self, possible_moves: list, board_x, board_y):
         """
         Draw red dotted outlines around valid rows (0-4) and the floor row (-1).
         
-        player: Player object (for accessing board if needed)
         possible_moves: list of dicts, each with "row", "to_row", "to_floor"
         board_x, board_y: top-left coordinates of the board image
-        tile_size: height of one tile (square)
-        spacing: spacing between tiles in a row
         """
-        SIZE = 51
-        SPACING = 8
-        
         # filter to only moves that can actually place at least one tile in row
         valid_rows = [m["row"] for m in possible_moves if m["to_row"] > 0 or (m["row"] == -1 and m["to_floor"] > 0)]
         if not valid_rows:
             return
 
-        x_right = board_x + 295
-        
-        # Draw pattern rows (0-4)
-        for row_idx in range(5):
-            if row_idx not in valid_rows:
+        # Pattern rows (0-4), then the floor which is always an option
+        for row_idx in (0, 1, 2, 3, 4, -1):
+            if row_idx != -1 and row_idx not in valid_rows:
                 continue
-
-            num_tiles = row_idx + 1
-            row_width = SIZE * num_tiles + SPACING * (num_tiles - 1)
-            row_height = SIZE
-            rx = x_right - row_width
-            ry = board_y + 10 + row_idx * (row_height + SPACING)
-
-            rect = pygame.Rect(rx, ry, row_width, row_height)
+            rect = self.row_rect(board_x, board_y, row_idx)
             self.draw_dotted_rect(rect, color=(255, 0, 0), dot_size=4, gap=6, width=2)
-
-        
-        num_tiles = 7
-        row_width = SIZE * num_tiles + SPACING * (num_tiles - 1) + 40
-        row_height = SIZE * 1.2
-        rx = x_right - row_width + 150
-        # Position floor row just below the 5th pattern row
-        ry = board_y + 5 * (row_height + SPACING) - 2
-
-        rect = pygame.Rect(rx, ry, row_width, row_height)
-        self.draw_dotted_rect(rect, color=(255, 0, 0), dot_size=4, gap=6, width=2)
+            self.drawn.append((tuple(rect.inflate(6, 6)), ("highlight", row_idx)))
 
     def draw_dotted_rect(self, rect, color=(255, 0, 0), dot_size=4, gap=4, width=2):
         """Draw a dotted rectangle around a given rect."""
@@ -1,12 +1,15 @@
 import pygame
-from ui.utils import render_text_with_outline
+from ui.text_renderer import TextRenderer
 
 class ButtonRenderer:
-    def __init__(self, screen, size=(120, 50), margin = 20):
+    def __init__(self, screen, size=(120, 50), margin = 20, text_renderer=None):
         self.screen = screen
+        self.text = text_renderer or TextRenderer()
         self.size = size
         self.margin = margin
         self.buttons = {}  # store button_id -> pygame.Rect
+        # (rect, content) of everything drawn this frame
+        self.drawn = []
 
     def draw_undo_button(self, pos=None):
         screen_width, screen_height = self.screen.get_size()
@@ -23,13 +26,13 @@ class ButtonRenderer:
             (x + 40, y + height - 10)     # bottom back
         ]
         
-        pygame.draw.polygon(self.screen, (255, 0, 0), arrow_points)
+        arrow_rect = pygame.draw.polygon(self.screen, (255, 0, 0), arrow_points)
 
         # Draw label using outline text
-        font = pygame.font.SysFont(None, 32)
-        text_surf = render_text_with_outline("UNDO", font, text_color=(255,255,255), outline_color=(0,0,0))
+        text_surf = self.text.render_outlined("UNDO", 32, text_color=(255,255,255), outline_color=(0,0,0))
         text_rect = text_surf.get_rect(midleft=(x + 45, y + height // 2))
         self.screen.blit(text_surf, text_rect)
+        self.drawn.append((tuple(arrow_rect.union(text_rect)), "undo"))
 
         # Store button rect
         self.buttons['undo'] = pygame.Rect(x, y, width, height)
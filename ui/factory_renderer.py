@@ -4,8 +4,8 @@ import math
 import random
 
 from ui.assets_manager import AssetManager
+from ui.text_renderer import TextRenderer
 from ui.tile_renderer import TileRenderer
-from ui.utils import render_text_with_outline
 
 CENTER_X_RATIO = 0.2
 CENTER_Y_RATIO = 0.5
@@ -20,8 +20,10 @@ COLOR_OFFSETS = [
 ]
 
 class FactoryRenderer:
-    def __init__(self, screen, asset_manager: AssetManager, num_factories, factory_scale=1):
+    def __init__(self, screen, asset_manager: AssetManager, num_factories, factory_scale=1,
+                 tile_renderer=None, text_renderer=None):
         self.screen = screen
+        self.text = text_renderer or TextRenderer()
         self.assets = asset_manager
         self.num_factories = num_factories
 
@@ -34,9 +36,10 @@ class FactoryRenderer:
         # Load factory plate image
         self.factory_img = self.assets.load_image("factory.png", factory_scale)
 
-        # Tile renderer
-        self.tile_renderer = TileRenderer(screen, asset_manager)
-        self.tile_click_map = []
+        # Tile renderer (pass one in to share its sprite cache)
+        self.tile_renderer = tile_renderer or TileRenderer(screen, asset_manager)
+        # (rect, content) of everything drawn outside the static layer this frame
+        self.drawn = []
         
         self._group_angles = self._get_group_angles()     
         
@@ -50,55 +53,67 @@ class FactoryRenderer:
 
         return group_angles     
 
-    def draw_factories(self, factories):
-        factories_info = []
+    def factory_rect(self, i):
+        """Plates are spread evenly on a circle around the table centre."""
         cx, cy = self.center
         fw, fh = self.factory_img.get_size()
-        self.tile_click_map = []  # reset click map each frame
-
-        # precompute slot offsets once
+        angle = i * (2 * math.pi / self.num_factories) - math.pi / 2
+        fx = cx + int(math.cos(angle) * self.radius) - fw // 2
+        fy = cy + int(math.sin(angle) * self.radius) - fh // 2
+        return pygame.Rect(fx, fy, fw, fh)
+
+    def draw_plates(self, target=None):
+        """Draw the empty factory plates (static, so usually onto a cached layer)."""
+        if target is None:
+            target = self.screen
+        for i in range(self.num_factories):
+            target.blit(self.factory_img, self.factory_rect(i).topleft)
+
+    def _slot_positions(self, i):
+        """Top-left tile positions of the four slots on plate ``i``."""
+        rect = self.factory_rect(i)
+        fw, fh = rect.size
         slot_r = min(fw, fh) // 6
-        slot_offsets = [
-            (-slot_r, -slot_r), ( slot_r, -slot_r),
-            (-slot_r,  slot_r), ( slot_r,  slot_r)
+        half = self.tile_renderer.tile_size // 2
+        return [
+            (rect.x + fw // 2 + ox - half, rect.y + fh // 2 + oy - half)
+            for ox, oy in ((-slot_r, -slot_r), (slot_r, -slot_r), (-slot_r, slot_r), (slot_r, slot_r))
         ]
 
+    def draw_factories(self, factories):
+        """Draw the tiles on each plate; the plates come from draw_plates()."""
         for i, factory in enumerate(factories):
-            # position factory on circle
-            angle = i * (2 * math.pi / self.num_factories) - math.pi / 2
-            fx = cx + int(math.cos(angle) * self.radius) - fw // 2
-            fy = cy + int(math.sin(angle) * self.radius) - fh // 2
-
-            rect = pygame.Rect(fx, fy, fw, fh)
-            self.screen.blit(self.factory_img, rect.topleft)
-
-            slots = []
             # draw tiles into slots (zip prevents overflow)
-            for (ox, oy), tile in zip(slot_offsets, factory.tiles):
-                sx, sy = fx + fw // 2 + ox, fy + fh // 2 + oy
-                pos = (sx - self.tile_renderer.tile_size // 2,
-                    sy - self.tile_renderer.tile_size // 2)
-
-                rect_tile = self.tile_renderer.draw_tile(tile, pos)
-                slots.append((sx, sy))
-                self.tile_click_map.append((rect_tile, ("factory", i, tile.color)))
+            for pos, tile in zip(self._slot_positions(i), factory.tiles):
+                self.tile_renderer.draw_tile(tile, pos)
 
-            factories_info.append((rect, slots))
-
-        return factories_info
+    def click_regions(self, factories, middle):
+        """(rect, target) for every clickable tile, where the tile comes to rest."""
+        for i, factory in enumerate(factories):
+            for pos, tile in zip(self._slot_positions(i), factory.tiles):
+                yield self.tile_renderer.tile_rect(tile, pos), ("factory", i, tile.color)
+        for tile in middle.tiles:
+            if tile.color != -1 and tile.middle_pos is not None:
+                yield self.tile_renderer.tile_rect(tile, tile.middle_pos), ("middle", None, tile.color)
 
-    def draw_middle(self, middle):
-        mx, my = self.center
-        radius = self.radius / 2.4
-        
-        # Split tiles
+    @staticmethod
+    def group_middle(middle):
+        """(first-player tile or None, {color: [tiles]}) for the middle."""
         first_tile = None
-        other_tiles = []
+        color_groups = {}
         for tile in middle.tiles:
             if tile.color == -1:
                 first_tile = tile
             else:
-                other_tiles.append(tile)
+                color_groups.setdefault(tile.color, []).append(tile)
+        return first_tile, color_groups
+
+    def draw_middle(self, middle, groups=None):
+        """``groups`` may pass in a memoized group_middle(middle)."""
+        mx, my = self.center
+        radius = self.radius / 2.4
+        
+        first_tile, color_groups = groups or self.group_middle(middle)
 
         # Draw the first player tile at the exact center
         if first_tile:
@@ -107,17 +122,9 @@ class FactoryRenderer:
                                         my - self.tile_renderer.tile_size // 2)
             self.tile_renderer.draw_tile(first_tile, first_tile.middle_pos, rotate=True)
 
-        if not other_tiles:
+        if not color_groups:
             return
 
-        # Group tiles by color
-        color_groups = {}
-        for tile in other_tiles:
-            color_groups.setdefault(tile.color, []).append(tile)
-
-
-        font = pygame.font.SysFont(None, 40)
-
         # Draw each color group
         for color, tiles in color_groups.items():
             angle = self._group_angles[color]
@@ -132,10 +139,10 @@ class FactoryRenderer:
                     jitter_y = random.randint(-30, 30)
                     tile.middle_pos = (gx + jitter_x - self.tile_renderer.tile_size // 2,
                                     gy + jitter_y - self.tile_renderer.tile_size // 2)
-                rect_tile = self.tile_renderer.draw_tile(tile, tile.middle_pos, rotate=True)
-                self.tile_click_map.append((rect_tile, ("middle", None, tile.color)))
+                self.tile_renderer.draw_tile(tile, tile.middle_pos, rotate=True)
 
             # Draw count next to stack
-            count_surf = render_text_with_outline(str(len(tiles)), font)
+            count_surf = self.text.render_outlined(str(len(tiles)), 40)
             text_pos = (gx + radius * 0.1, gy - 10)
-            self.screen.blit(count_surf, text_pos)
+            text_rect = self.screen.blit(count_surf, text_pos)
+            self.drawn.append((tuple(text_rect), ("count", color, len(tiles))))
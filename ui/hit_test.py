@@ -0,0 +1,47 @@
+# ui/hit_test.py
+CELL_SIZE = 64
+
+
+class HitIndex:
+    """
+    Uniform-grid index over clickable screen regions.
+
+    Each region is stored in every grid cell its rect overlaps, so a lookup
+    only checks the handful of regions in the cell under the cursor. Regions
+    added later are on top, matching the order they were drawn in.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+
+    def clear(self):
+        self.cells = {}
+        self.count = 0
+
+    def add(self, rect, target):
+        """Register ``rect`` (any pygame.Rect-like x, y, w, h) as ``target``."""
+        x, y, w, h = rect
+        if w <= 0 or h <= 0:
+            return
+        size = self.cell_size
+        entry = (x, y, x + w, y + h, target)
+        self.count += 1
+        for cx in range(int(x) // size, int(x + w - 1) // size + 1):
+            for cy in range(int(y) // size, int(y + h - 1) // size + 1):
+                self.cells.setdefault((cx, cy), []).append(entry)
+
+    def hit(self, pos):
+        """Target of the topmost region containing ``pos``, or None."""
+        px, py = pos
+        entries = self.cells.get((int(px) // self.cell_size, int(py) // self.cell_size))
+        if not entries:
+            return None
+        for left, top, right, bottom, target in reversed(entries):
+            if left <= px < right and top <= py < bottom:
+                return target
+        return None
+
+    def __len__(self):
+        return self.count
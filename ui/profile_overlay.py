@@ -0,0 +1,53 @@
+# ui/profile_overlay.py
+import pygame
+
+from core.profiler import PROFILER
+
+FONT_SIZE = 20
+LINE_HEIGHT = 18
+PADDING = 8
+
+
+class ProfileOverlay:
+    """Panel listing rolling p50/p95/p99 times (ms) of every profiled section."""
+
+    def __init__(self, screen, text_renderer, profiler=PROFILER, pos=(10, 10)):
+        self.screen = screen
+        self.text = text_renderer
+        self.profiler = profiler
+        self.pos = pos
+        self.visible = False
+        self.frames = 0
+        self.drawn = []
+
+    def toggle(self):
+        """Show or hide the panel; profiling runs only while it is shown."""
+        self.visible = not self.visible
+        self.profiler.enabled = self.visible
+        if self.visible:
+            self.profiler.reset()
+
+    def lines(self):
+        rows = sorted(self.profiler.stats().items(), key=lambda item: -item[1][2])
+        lines = [f"{'section':<22}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, (p50, p95, p99) in rows:
+            lines.append(f"{name[:22]:<22}{p50 * 1e3:7.2f}{p95 * 1e3:7.2f}{p99 * 1e3:7.2f}")
+        return lines
+
+    def draw(self):
+        if not self.visible:
+            return None
+        surfaces = [self.text.render(line, FONT_SIZE, (255, 255, 255), name="monospace")
+                    for line in self.lines()]
+        width = max(s.get_width() for s in surfaces) + 2 * PADDING
+        height = LINE_HEIGHT * len(surfaces) + 2 * PADDING
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, surface in enumerate(surfaces):
+            panel.blit(surface, (PADDING, PADDING + i * LINE_HEIGHT))
+        rect = self.screen.blit(panel, self.pos)
+        # Content changes every frame, so the panel is always redrawn
+        self.frames += 1
+        self.drawn.append((tuple(rect), ("profile", self.frames)))
+        return rect
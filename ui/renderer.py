@@ -1,11 +1,17 @@
 # ui/renderer.py
+import pygame
+
 from ui.board_renderer import PlayerBoardRenderer
 from ui.factory_renderer import FactoryRenderer
 from ui.assets_manager import AssetManager
 from ui.button_renderer import ButtonRenderer
+from ui.hit_test import HitIndex
+from ui.profile_overlay import ProfileOverlay
+from ui.text_renderer import TextRenderer
 from ui.tile_renderer import TileRenderer
 
 from core.game_logic import AzulGame
+from core.profiler import PROFILER
 
 BAG_X_RATIO = 0.02
 BAG_Y_RATIO = 0.05
@@ -25,25 +31,78 @@ class Renderer:
         self.background = self.assets.load_image("background.jpg", scale=0.5)
         self.bag = self.assets.load_image("bag.png", scale=0.8)
 
-        # renderers
-        self.board_renderer = PlayerBoardRenderer(screen, asset_manager, board_scale=0.75)
-        self.factory_renderer = FactoryRenderer(screen, asset_manager, self.game_logic.num_factories, factory_scale=0.8)
+        # renderers (sharing one sprite cache and one text cache)
+        self.text_renderer = TextRenderer()
+        self.board_renderer = PlayerBoardRenderer(screen, asset_manager, board_scale=0.75,
+                                                  text_renderer=self.text_renderer)
         self.tile_renderer = TileRenderer(screen, asset_manager)
+        self.tile_renderer.preload()
+        self.factory_renderer = FactoryRenderer(screen, asset_manager, self.game_logic.num_factories,
+                                                factory_scale=0.8, tile_renderer=self.tile_renderer,
+                                                text_renderer=self.text_renderer)
         
         # undo
-        self.button_renderer = ButtonRenderer(screen)
-        
+        self.button_renderer = ButtonRenderer(screen, text_renderer=self.text_renderer)
+        self.profile_overlay = ProfileOverlay(screen, self.text_renderer)
+
+        # Every renderer records what it draws on top of the static layer
+        # into one shared list of (rect, content) pairs
+        self.drawn = []
+        for renderer in (self.board_renderer, self.factory_renderer, self.tile_renderer,
+                         self.button_renderer, self.profile_overlay):
+            renderer.drawn = self.drawn
+
+        self.static_layer = None
+        self.last_drawn = []
+        self.last_state = None
+        self.hit_index = HitIndex()
+        # Tiles moved by animate() since the last drawn frame
+        self.moved = False
     
-    def draw_background(self):
+    def draw_background(self, target=None):
+        if target is None:
+            target = self.screen
         bg_width, bg_heigth = self.background.get_size()
         
         for x in range(0, self.width, bg_width):
             for y in range(0, self.height, bg_heigth):
-                self.screen.blit(self.background, (x, y))
+                target.blit(self.background, (x, y))
     
-    def draw_bag(self):
+    def draw_bag(self, target=None):
+        if target is None:
+            target = self.screen
         X, Y = 50, 70
-        self.screen.blit(self.bag, (X, Y))
+        target.blit(self.bag, (X, Y))
+
+    def build_static_layer(self):
+        """Background, bag, factory plates and boards, composited once."""
+        layer = self.screen.copy()
+        with PROFILER.section("draw_background"):
+            self.draw_background(layer)
+            self.draw_bag(layer)
+        with PROFILER.section("draw_plates"):
+            self.factory_renderer.draw_plates(layer)
+        with PROFILER.section("draw_boards"):
+            for player in self.game_logic.players:
+                self.board_renderer.draw_board(player, layer)
+        return layer
+
+    @property
+    def animator(self):
+        return self.tile_renderer.animator
+
+    def animate(self, dt):
+        """Advance tile animations by ``dt`` seconds."""
+        if self.animator.advance(dt):
+            self.moved = True
+
+    def needs_frames(self):
+        """Whether the next frames will draw something without any new input."""
+        return self.animator.active or self.moved or self.profile_overlay.visible
+
+    def invalidate(self):
+        """Repaint the whole window on the next draw (e.g. after it was exposed)."""
+        self.static_layer = None
     
     def draw_undo_button(self):
         self.button_renderer.draw_undo_button()
@@ -57,29 +116,87 @@ class Renderer:
             self.tile_renderer.draw_tile(tile, pos, rotate=False)
         
     def draw_factories(self):
-        self.factory_renderer.draw_factories(self.game_logic.factories)
-        self.factory_renderer.draw_middle(self.game_logic.middle)
+        with PROFILER.section("draw_factories"):
+            self.factory_renderer.draw_factories(self.game_logic.factories)
+        with PROFILER.section("draw_middle"):
+            middle = self.game_logic.middle
+            groups = self.game_logic.memo("middle_groups", lambda: self.factory_renderer.group_middle(middle))
+            self.factory_renderer.draw_middle(middle, groups)
 
-    def draw_boards(self):
-        board_rects = []
+    def draw_highlights(self):
+        if not self.game_logic.is_selection():
+            return
+        with PROFILER.section("logic.possible_moves"):
+            possible_moves = self.game_logic.possible_moves()
+        current = self.game_logic.players[self.game_logic.current_player].number
         for player in self.game_logic.players:
-            
-            if self.game_logic.is_selection():
-                rect = self.board_renderer.draw_board(player, self.game_logic.current_player, self.game_logic.possible_moves())
-            else:
-                rect = self.board_renderer.draw_board(player, self.game_logic.current_player, None)
-            
-            board_rects.append(rect)
-
-        return board_rects
-    
+            self.board_renderer.draw_highlights(player, current, possible_moves)
+
+    def rebuild_hit_index(self):
+        """Index every clickable region; in draw order, so later ones are on top."""
+        index = self.hit_index
+        index.clear()
+        for player in self.game_logic.players:
+            for rect, target in self.board_renderer.click_regions(player):
+                index.add(rect, target)
+        for rect, target in self.factory_renderer.click_regions(self.game_logic.factories,
+                                                                self.game_logic.middle):
+            index.add(rect, target)
+        undo_rect = self.button_renderer.get_button_rect('undo')
+        if undo_rect and self.game_logic.selected_tiles:
+            index.add(undo_rect, ("button", "undo", None))
+
+    def hit_test(self, pos):
+        """What is under ``pos``: ("factory", index, color), ("middle", None, color),
+        ("row", player number, row), ("button", name, None) or None."""
+        return self.hit_index.hit(pos)
+
     def draw(self):
-        self.draw_background()
-        self.draw_bag()
-        self.draw_selected_tiles()
-        
-        if self.game_logic.selected_tiles:
-            self.draw_undo_button()
+        """
+        Draw a frame and return the screen areas that changed, for
+        pygame.display.update(). Nothing is drawn while the game state is
+        unchanged and no tile is moving.
+        """
+        full = self.static_layer is None
+        if full:
+            with PROFILER.section("build_static_layer"):
+                self.static_layer = self.build_static_layer()
+                self.screen.blit(self.static_layer, (0, 0))
+            self.last_drawn = []
+
+        state = self.game_logic.version
+        busy = self.moved or self.profile_overlay.visible
+        if not full and state == self.last_state and not busy:
+            return []
+        changed = full or state != self.last_state
+        self.last_state = state
+
+        # Put the static layer back wherever the last frame drew on top of it
+        with PROFILER.section("restore_static"):
+            for rect, _ in self.last_drawn:
+                self.screen.blit(self.static_layer, rect, rect)
+
+        self.drawn.clear()
+        self.moved = False
+        with PROFILER.section("draw_selected_tiles"):
+            self.draw_selected_tiles()
+            if self.game_logic.selected_tiles:
+                self.draw_undo_button()
         
         self.draw_factories()
-        self.draw_boards()
\ No newline at end of file
+        with PROFILER.section("draw_highlights"):
+            self.draw_highlights()
+
+        if changed:
+            with PROFILER.section("rebuild_hit_index"):
+                self.rebuild_hit_index()
+        self.profile_overlay.draw()
+
+        drawn = list(self.drawn)
+        if full:
+            dirty = [self.screen.get_rect()]
+        else:
+            # Items drawn identically in both frames left their pixels as they were
+            dirty = [pygame.Rect(rect) for rect, _ in set(self.last_drawn) ^ set(drawn)]
+        self.last_drawn = drawn
+        return dirty
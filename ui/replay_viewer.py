@@ -0,0 +1,91 @@
+# ui/replay_viewer.py
+import pygame
+
+from core.replay import KEYFRAME_EVERY, Replay
+from ui.assets_manager import AssetManager
+from ui.renderer import Renderer
+
+SIZE = (2200, 900)
+FPS = 60
+AUTOPLAY_DELAY = 0.5  # seconds between moves while playing
+ASSET_CACHE_DIR = "ui/assets/.cache"
+
+# Key -> turns to move by (None = start / end)
+STEPS = {
+    pygame.K_RIGHT: 1,
+    pygame.K_LEFT: -1,
+    pygame.K_PAGEDOWN: KEYFRAME_EVERY,
+    pygame.K_PAGEUP: -KEYFRAME_EVERY,
+}
+
+
+class ReplayViewer:
+    """
+    Plays a recorded game back through the normal Renderer.
+
+    Left/Right step one move, PageUp/PageDown jump a keyframe's worth,
+    Home/End go to the start/end and Space plays or pauses.
+    """
+
+    def __init__(self, path, turn=0, size=SIZE, game=-1):
+        pygame.init()
+        self.screen = pygame.display.set_mode(size)
+        self.clock = pygame.time.Clock()
+        self.replay = Replay(path, game)
+        self.replay.seek(turn)
+        self.renderer = Renderer(self.screen, AssetManager(cache_dir=ASSET_CACHE_DIR), self.replay.game)
+        self.running = True
+        self.playing = False
+        self.until_next = AUTOPLAY_DELAY
+        self.update_caption()
+
+    def update_caption(self):
+        state = "playing" if self.playing else "paused"
+        pygame.display.set_caption(f"Azul replay: turn {self.replay.turn}/{len(self.replay)} ({state})")
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            self.renderer.invalidate()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif event.key == pygame.K_SPACE:
+                self.playing = not self.playing
+                self.until_next = AUTOPLAY_DELAY
+            elif event.key == pygame.K_HOME:
+                self.replay.seek(0)
+            elif event.key == pygame.K_END:
+                self.replay.seek(len(self.replay))
+            elif event.key in STEPS:
+                self.replay.step(STEPS[event.key])
+            self.update_caption()
+
+    def update(self, dt):
+        self.renderer.animate(dt)
+        if not self.playing:
+            return
+        self.until_next -= dt
+        if self.until_next <= 0:
+            self.until_next = AUTOPLAY_DELAY
+            self.replay.step(1)
+            if self.replay.turn == len(self.replay):
+                self.playing = False
+            self.update_caption()
+
+    def run(self):
+        while self.running:
+            dt = self.clock.tick(FPS) / 1000.0
+            for event in pygame.event.get():
+                self.handle_event(event)
+            self.update(dt)
+            dirty = self.renderer.draw()
+            if dirty:
+                pygame.display.update(dirty)
+            if self.running and not self.playing and not self.renderer.needs_frames():
+                event = pygame.event.wait(1000)
+                if event.type != pygame.NOEVENT:
+                    self.handle_event(event)
+                self.clock.tick()
+        pygame.quit()
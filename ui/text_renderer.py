@@ -0,0 +1,44 @@
+# ui/text_renderer.py
+import pygame
+
+from ui.tile_renderer import SpriteCache
+from ui.utils import render_text_with_outline
+
+TEXT_CACHE_SIZE = 256
+
+
+class TextRenderer:
+    """
+    Shared text service: font objects are created once per (name, size), and
+    finished text surfaces are kept in an LRU cache keyed by the text, the
+    font and the colours, so unchanged labels cost a single blit.
+    """
+
+    def __init__(self, cache_size=TEXT_CACHE_SIZE):
+        self.fonts = {}
+        self.surfaces = SpriteCache(cache_size)
+
+    def font(self, size, name=None):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, name=None):
+        key = ("plain", text, name, size, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font(size, name).render(text, True, color)
+            self.surfaces.put(key, surface)
+        return surface
+
+    def render_outlined(self, text, size, text_color=(255, 255, 255),
+                        outline_color=(0, 0, 0), name=None):
+        key = ("outlined", text, name, size, text_color, outline_color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = render_text_with_outline(text, self.font(size, name), text_color, outline_color)
+            self.surfaces.put(key, surface)
+        return surface
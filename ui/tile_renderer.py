@@ -1,4 +1,8 @@
 import pygame
+from collections import OrderedDict
+
+from core.profiler import PROFILER
+from ui.animation import AnimationScheduler
 from ui.assets_manager import AssetManager
 
 TILES_MAP = {
@@ -10,24 +14,82 @@ TILES_MAP = {
     5: 'tile_black.png'
 }
 
+ROTATION_STEP = 3  # degrees; coarser steps mean fewer cached sprites
+SPRITE_CACHE_SIZE = 512
+SHADOW_OFFSET = 4
+SHADOW_ALPHA = 120
+
+
+class SpriteCache:
+    """LRU cache of finished sprites; the least recently used goes first when full."""
+
+    def __init__(self, max_size=SPRITE_CACHE_SIZE):
+        self.max_size = max_size
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            return None
+        self.sprites.move_to_end(key)
+        self.hits += 1
+        return sprite
+
+    def put(self, key, sprite):
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+
+    def clear(self):
+        self.sprites.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+
 class TileRenderer:
-    def __init__(self, screen, asset_manager: AssetManager, tile_size=50):
+    """
+    Draws tiles from cached sprites with outline, rotation and shadow already
+    composited, keyed by (color, rotation, outline, shadow). Each entry is
+    (surface, tile_rect): tile_rect is where the tile itself sits inside the
+    surface, the rest being its shadow.
+    """
+
+    def __init__(self, screen, asset_manager: AssetManager, tile_size=50,
+                 rotation_step=ROTATION_STEP, cache_size=SPRITE_CACHE_SIZE, animator=None):
         self.screen = screen
         self.assets = asset_manager
         self.tile_size = tile_size
         self.tile_images = {}  # cache for scaled images
+        self.rotation_step = rotation_step
+        self.sprites = SpriteCache(cache_size)
+        # (rect, content) of every sprite drawn this frame
+        self.drawn = []
+        self.animator = animator or AnimationScheduler()
     
     def _get_tile_image(self, tile):
         """Get scaled image for tile color (cached)."""
-        if tile.color not in self.tile_images:
-            if tile.color not in TILES_MAP:
-                raise ValueError(f"No asset defined for tile color {tile.color}")
-            asset_name = TILES_MAP[tile.color]
-            img = self.assets.load_image(asset_name, scale=0.4)
-            self.tile_images[tile.color] = pygame.transform.smoothscale(
-                img, (self.tile_size, self.tile_size)
+        return self._get_tile_image_for(tile.color)
+
+    def _get_tile_image_for(self, color):
+        if color not in self.tile_images:
+            if color not in TILES_MAP:
+                raise ValueError(f"No asset defined for tile color {color}")
+            asset_name = TILES_MAP[color]
+            # Straight to display size: one resample, and an atlas hit when cached
+            self.tile_images[color] = self.assets.load_image(
+                asset_name, size=(self.tile_size, self.tile_size)
             )
-        return self.tile_images[tile.color]
+        return self.tile_images[color]
+
+    def preload(self):
+        """Load every tile image now rather than on the first frame that needs it."""
+        for color in TILES_MAP:
+            self._get_tile_image_for(color)
     
     
     def _make_tile_with_outline(self, img, outline_color=(0, 0, 0), thickness=2):
@@ -42,55 +104,72 @@ class TileRenderer:
         # blit the tile centered
         outlined.blit(img, (thickness, thickness))
         return outlined
+
+    def quantize_rotation(self, rotation):
+        """Snap an angle to the rotation step (a step of 0 keeps it exact)."""
+        if not self.rotation_step:
+            return rotation
+        return round(rotation / self.rotation_step) * self.rotation_step % 360
+
+    def _get_sprite(self, color, rotation, outline, shadow):
+        key = (color, rotation, outline, shadow)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            return key, sprite
+
+        img = self._get_tile_image_for(color)
+        if outline:
+            img = self._make_tile_with_outline(img, outline_color=(0, 0, 0))
+        if rotation:
+            img = pygame.transform.rotate(img, rotation)
+
+        w, h = img.get_size()
+        if shadow:
+            composite = pygame.Surface((w + SHADOW_OFFSET, h + SHADOW_OFFSET), pygame.SRCALPHA)
+            shadow_img = img.copy()
+            shadow_img.fill((0, 0, 0, SHADOW_ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+            composite.blit(shadow_img, (SHADOW_OFFSET, SHADOW_OFFSET))
+            composite.blit(img, (0, 0))
+        else:
+            composite = img
+
+        sprite = (composite, pygame.Rect(0, 0, w, h))
+        self.sprites.put(key, sprite)
+        return key, sprite
     
+    def tile_rect(self, tile, pos, rotate=True, outline=True):
+        """Screen rect the tile covers once it rests at ``pos`` (shadow excluded)."""
+        rotation = self.quantize_rotation(tile.rotation) if rotate else 0
+        _, (_, tile_rect) = self._get_sprite(tile.color, rotation, outline, True)
+        rect = tile_rect.copy()
+        rect.center = (pos[0] + self.tile_size // 2, pos[1] + self.tile_size // 2)
+        return rect
+
     def draw_tile(self, tile, pos, rotate=True, shadow=True, outline=True):
-        # Initialize animation properties
+        # First sighting: the tile simply appears where it is
         if not hasattr(tile, "screen_pos"):
             tile.screen_pos = pos
             tile.target_pos = pos
-            tile.start_pos = pos
-            tile.progress = 1
-            tile.animating = False
 
-        # If renderer suggests new target
+        # If renderer suggests new target, slide there; the scheduler moves
+        # screen_pos between frames
         if pos != tile.target_pos:
-            tile.start_pos = tile.screen_pos
             tile.target_pos = pos
-            tile.progress = 0
-            tile.animating = True
-
-        # Animate if needed
-        if tile.animating:
-            speed = 0.08
-            tile.progress += speed
-            if tile.progress >= 1:
-                tile.progress = 1
-                tile.animating = False
-
-            # Interpolate
-            x = tile.start_pos[0] + (tile.target_pos[0] - tile.start_pos[0]) * tile.progress
-            y = tile.start_pos[1] + (tile.target_pos[1] - tile.start_pos[1]) * tile.progress
-            tile.screen_pos = (x, y)
-        else:
-            tile.screen_pos = tile.target_pos
+            self.animator.move(tile, pos)
 
-        # --- Drawing at animated screen_pos ---
-        img = self._get_tile_image(tile)
-        outlined = self._make_tile_with_outline(img, outline_color=(0, 0, 0))
+        # --- Drawing at animated screen_pos: one blit of the cached sprite ---
+        with PROFILER.section("draw_tile"):
+            return self._blit_tile(tile, rotate, shadow, outline)
 
-        if rotate:
-            outlined = pygame.transform.rotate(outlined, tile.rotation)
-
-        rect = outlined.get_rect(center=(tile.screen_pos[0] + self.tile_size // 2,
-                                        tile.screen_pos[1] + self.tile_size // 2))
-
-        # shadow pass
-        if shadow:
-            shadow_img = outlined.copy()
-            shadow_img.fill((0, 0, 0, 120), special_flags=pygame.BLEND_RGBA_MULT)
-            self.screen.blit(shadow_img, (rect.x + 4, rect.y + 4))
+    def _blit_tile(self, tile, rotate, shadow, outline):
+        rotation = self.quantize_rotation(tile.rotation) if rotate else 0
+        key, (sprite, tile_rect) = self._get_sprite(tile.color, rotation, outline, shadow)
 
-        self.screen.blit(outlined, rect.topleft)
+        rect = tile_rect.copy()
+        rect.center = (tile.screen_pos[0] + self.tile_size // 2,
+                       tile.screen_pos[1] + self.tile_size // 2)
+        self.screen.blit(sprite, rect.topleft)
+        self.drawn.append(((rect.x, rect.y) + sprite.get_size(), key))
 
         return rect
 